@@ -0,0 +1,3 @@
+# benchmarks/__init__.py
+# Performance benchmarks; run individual modules with:
+# python -m benchmarks.<module_name>
@@ -0,0 +1,95 @@
+"""
+Threaded vs asyncio acquisition benchmark
+
+Runs N simulated sensors with each backend and reports the achieved
+reading rate per sensor, the CPU time used and the number of threads.
+
+Usage:
+    python -m benchmarks.bench_async_engine [--sensors 3 12 48] [--duration 3]
+"""
+import argparse
+import queue
+import threading
+import time
+
+from src.sensors.async_engine import AsyncSensorManager
+from src.sensors.strain_gauge import StrainGaugeSensor
+
+
+class _CountingSensor(StrainGaugeSensor):
+    """Simulated strain gauge that counts its readings"""
+
+    def __init__(self, update_rate):
+        super().__init__(update_rate=update_rate)
+        self.readings = 0
+
+    def _read_sensor(self):
+        self.readings += 1
+        return super()._read_sensor()
+
+
+def _measure(start_fn, stop_fn, count_fn, duration):
+    threads_before = threading.active_count()
+    start_fn()
+    time.sleep(0.6)
+    counts_start = count_fn()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    time.sleep(duration)
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    counts_end = count_fn()
+    threads = threading.active_count() - threads_before
+    stop_fn()
+    rates = [(end - begin) / wall for begin, end in zip(counts_start, counts_end)]
+    return {
+        'per_sensor_hz': sum(rates) / len(rates),
+        'cpu_percent': 100.0 * cpu / wall,
+        'threads': threads,
+    }
+
+
+def run_threaded(num_sensors, update_rate, duration):
+    sensors = [_CountingSensor(update_rate) for _ in range(num_sensors)]
+    return _measure(
+        lambda: [s.start() for s in sensors],
+        lambda: [s.stop() for s in sensors],
+        lambda: [s.readings for s in sensors],
+        duration,
+    )
+
+
+def run_asyncio(num_sensors, update_rate, duration):
+    manager = AsyncSensorManager(queue.Queue(maxsize=10), default_sensors=False)
+    sensors = [_CountingSensor(update_rate) for _ in range(num_sensors)]
+    for index, sensor in enumerate(sensors):
+        manager.add_sensor(f"ch{index}", sensor)
+    return _measure(
+        manager.start,
+        manager.stop,
+        lambda: [s.readings for s in sensors],
+        duration,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Threaded vs asyncio acquisition benchmark")
+    parser.add_argument("--sensors", type=int, nargs="+", default=[3, 12, 48])
+    parser.add_argument("--duration", type=float, default=3.0)
+    parser.add_argument("--update-rate", type=float, default=0.005,
+                        help="Seconds between readings per sensor")
+    args = parser.parse_args()
+
+    rows = []
+    for num_sensors in args.sensors:
+        for backend, runner in (("threaded", run_threaded), ("asyncio", run_asyncio)):
+            result = runner(num_sensors, args.update_rate, args.duration)
+            rows.append((num_sensors, backend, result))
+
+    print(f"\ntarget rate per sensor: {1.0 / args.update_rate:.0f} Hz")
+    print(f"{'sensors':>8} {'backend':>9} {'Hz/sensor':>10} {'CPU %':>7} {'threads':>8}")
+    for num_sensors, backend, r in rows:
+        print(f"{num_sensors:>8} {backend:>9} {r['per_sensor_hz']:>10.1f} "
+              f"{r['cpu_percent']:>7.1f} {r['threads']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Channel scaling benchmark
+
+Generates frames of a schema with 3, 32 and 64 channels at a nominal
+1 kHz and pushes them through the column-wise paths a frame takes after
+acquisition: packing into records, running statistics, the wire encoding
+sent to GUI clients and the compressed log encoding. Reports the
+throughput of each stage in frames per second, so it can be checked that
+a 64-channel rig still keeps up with 1 kHz on the target hardware.
+
+Usage:
+    python -m benchmarks.bench_channel_scaling [--seconds 10] [--batch 250]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.data.data_logger import encode_chunk, schema_codecs
+from src.remote.protocol import HEADER, decode_frames, encode_frames, records_from_frames
+from src.sensors.channels import STANDARD_CHANNELS, Channel, ChannelSchema, ChannelStats
+
+
+def wide_schema(count, rate=1000.0):
+    """The standard channels followed by strain gauges up to count channels"""
+    extra = [Channel(f"strain_{index}", "ue", "f4", rate, f"Strain {index}")
+             for index in range(count - len(STANDARD_CHANNELS))]
+    return ChannelSchema([c._replace(rate=rate) for c in STANDARD_CHANNELS] + extra)
+
+
+def simulated_frames(schema, seconds, rate=1000.0, seed=0):
+    """Frame dictionaries with phase-shifted sine channels and 1% NaN dropouts"""
+    rng = np.random.default_rng(seed)
+    count = int(seconds * rate)
+    angle = (np.arange(count) * 0.36) % 360
+    values = 50 + 30 * np.sin(np.radians(angle[:, None] + 15 * np.arange(len(schema))))
+    values += rng.uniform(-1, 1, values.shape)
+    values[:, 0] = angle
+    values[rng.random(values.shape) < 0.01] = np.nan
+    timestamps = np.arange(count) / rate
+    names = schema.names
+    return [
+        dict(zip(names, row), rig_id=0, timestamp=timestamp)
+        for timestamp, row in zip(timestamps.tolist(), values.tolist())
+    ]
+
+
+def run_stages(schema, frames, batch):
+    """
+    Returns:
+        Dictionary mapping stage name to frames per second
+    """
+    batches = [frames[start:start + batch] for start in range(0, len(frames), batch)]
+    timings = {}
+
+    start = time.perf_counter()
+    packed = [schema.pack(chunk) for chunk in batches]
+    timings['pack'] = time.perf_counter() - start
+
+    stats = ChannelStats(schema)
+    start = time.perf_counter()
+    for records in packed:
+        stats.update(records)
+    timings['stats'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    messages = [encode_frames(records_from_frames(chunk, schema)) for chunk in batches]
+    timings['wire encode'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for message in messages:
+        decode_frames(message[HEADER.size:], schema)
+    timings['wire decode'] = time.perf_counter() - start
+
+    codecs = schema_codecs(schema)
+    start = time.perf_counter()
+    for records in packed:
+        encode_chunk(schema.columns(records), codecs)
+    timings['log encode'] = time.perf_counter() - start
+
+    return {stage: len(frames) / elapsed for stage, elapsed in timings.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Channel scaling benchmark")
+    parser.add_argument("--seconds", type=float, default=10.0, help="Simulated data length at 1 kHz")
+    parser.add_argument("--batch", type=int, default=250, help="Frames per batch")
+    parser.add_argument("--channels", type=int, nargs="+", default=[3, 32, 64])
+    args = parser.parse_args()
+
+    for count in args.channels:
+        schema = wide_schema(count)
+        frames = simulated_frames(schema, args.seconds)
+        rates = run_stages(schema, frames, args.batch)
+        print(f"{count} channels, {len(frames)} frames in batches of {args.batch}")
+        for stage, rate in rates.items():
+            print(f"  {stage:12s} {rate:12,.0f} frames/s  ({rate / 1000.0:6.1f}x real time)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Log codec benchmark
+
+Encodes simulated 1 kHz data and frames replayed through SensorManager
+with several channel codecs and compressors, and reports the compression
+ratio against raw float64 storage and the encode/decode throughput
+(in MB/s of raw float64 data).
+
+Usage:
+    python -m benchmarks.bench_log_codec [--seconds 600] [--chunk 4096]
+"""
+import argparse
+import queue
+import time
+
+import numpy as np
+
+from benchmarks.bench_sync_replay import synthetic_recording
+from src.data.data_logger import DEFAULT_CODECS, ChannelCodec, decode_chunk, encode_chunk
+from src.sensors.replay import ReplayDriver
+from src.sensors.sensor_manager import SensorManager
+
+CONFIGS = [
+    ("lossless", {}, "zlib"),
+    ("lossless", {}, "lzma"),
+    ("default", DEFAULT_CODECS, "zlib"),
+    ("default", DEFAULT_CODECS, "lzma"),
+    ("fixed-point", {
+        'timestamp': ChannelCodec("fixed", 1e-6, order=2),
+        'angle': ChannelCodec("fixed", 0.01),
+        'torque': ChannelCodec("fixed", 0.01),
+        'preload': ChannelCodec("fixed", 0.1),
+    }, "zlib"),
+]
+
+
+def simulated_columns(seconds, rate=1000.0, seed=0):
+    """Emulator-like signals: float32 values, microsecond device clock with jitter"""
+    rng = np.random.default_rng(seed)
+    count = int(seconds * rate)
+    angle = (np.arange(count) * 0.36) % 360
+    return {
+        'timestamp': np.round(np.arange(count) / rate + rng.normal(0, 5e-6, count), 6),
+        'angle': angle.astype(np.float32).astype(np.float64),
+        'torque': (50 + 30 * np.sin(np.radians(angle)) + rng.uniform(-1, 1, count))
+        .astype(np.float32).astype(np.float64),
+        'preload': (200 + 0.5 * angle + 50 * np.sin(np.radians(angle * 2))
+                    + rng.uniform(-1, 1, count)).astype(np.float32).astype(np.float64),
+    }
+
+
+def replayed_columns(seconds):
+    """Synchronized frames from a synthetic recording replayed through SensorManager"""
+    recording = synthetic_recording(hours=seconds / 3600.0)
+    frames = ReplayDriver(SensorManager(queue.Queue()), recording).run()
+    return {name: np.array([frame[name] for frame in frames], dtype=np.float64)
+            for name in ('timestamp', 'angle', 'torque', 'preload')}
+
+
+def run_codec(columns, codecs, compressor, chunk_size):
+    """
+    Returns:
+        (ratio, encode MB/s, decode MB/s, max abs error per channel)
+    """
+    rows = len(columns['timestamp'])
+    raw_bytes = rows * len(columns) * 8
+    starts = range(0, rows, chunk_size)
+
+    start = time.perf_counter()
+    chunks = [encode_chunk({name: values[s:s + chunk_size] for name, values in columns.items()},
+                           codecs, compressor) for s in starts]
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decoded = [decode_chunk(chunk) for chunk in chunks]
+    decode_time = time.perf_counter() - start
+
+    errors = {name: np.abs(np.concatenate([d[name] for d in decoded]) - values).max()
+              for name, values in columns.items()}
+    encoded_bytes = sum(len(chunk) for chunk in chunks)
+    return (raw_bytes / encoded_bytes, raw_bytes / encode_time / 1e6,
+            raw_bytes / decode_time / 1e6, errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Log codec benchmark")
+    parser.add_argument("--seconds", type=float, default=600.0, help="Simulated data length")
+    parser.add_argument("--replay-seconds", type=float, default=3600.0,
+                        help="Length of the replayed 10 Hz recording")
+    parser.add_argument("--chunk", type=int, default=4096, help="Rows per chunk")
+    args = parser.parse_args()
+
+    datasets = [
+        (f"simulated 1 kHz, {args.seconds:g} s", simulated_columns(args.seconds)),
+        (f"replayed, {args.replay_seconds:g} s", replayed_columns(args.replay_seconds)),
+    ]
+    for title, columns in datasets:
+        print(f"{title}: {len(columns['timestamp'])} rows")
+        for name, codecs, compressor in CONFIGS:
+            ratio, encode_rate, decode_rate, errors = run_codec(
+                columns, codecs, compressor, args.chunk
+            )
+            worst = max(errors.values())
+            print(f"  {name:12s} {compressor:5s} ratio {ratio:5.2f}x  "
+                  f"encode {encode_rate:7.1f} MB/s  decode {decode_rate:7.1f} MB/s  "
+                  f"max error {worst:.2g}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Rig scaling benchmark
+
+Runs RigRegistry with an increasing number of simulated rigs and reports
+the synchronized frame rate achieved per rig.
+
+Usage:
+    python -m benchmarks.bench_rig_scaling [--rigs 1 2 4 8 16] [--duration 3]
+"""
+import argparse
+import os
+import queue
+import threading
+import time
+
+from src.sensors.rig_registry import RigRegistry
+
+
+def _drain(data_queue, stop_event):
+    """Consume frames so the queue never fills up"""
+    while not stop_event.is_set():
+        try:
+            data_queue.get(timeout=0.05)
+        except queue.Empty:
+            continue
+
+
+def run_scaling(rig_counts, duration=3.0, update_rate=0.005, sync_interval=0.005):
+    """
+    Measure per-rig throughput for each rig count
+    
+    Args:
+        rig_counts: Iterable of rig counts to test
+        duration: Seconds to measure each configuration
+        update_rate: Sensor update period in seconds
+        sync_interval: Registry worker polling period in seconds
+        
+    Returns:
+        List of result dictionaries, one per rig count
+    """
+    results = []
+    for num_rigs in rig_counts:
+        data_queue = queue.Queue(maxsize=1000 * num_rigs)
+        registry = RigRegistry(data_queue, sync_interval=sync_interval)
+        for rig_id in range(num_rigs):
+            registry.add_rig(rig_id, update_rate=update_rate)
+        
+        stop_event = threading.Event()
+        consumer = threading.Thread(target=_drain, args=(data_queue, stop_event), daemon=True)
+        consumer.start()
+        
+        registry.start()
+        # Skip the registry warm-up delay before counting
+        time.sleep(0.6)
+        start_counts = registry.get_stats()
+        start = time.perf_counter()
+        time.sleep(duration)
+        elapsed = time.perf_counter() - start
+        end_counts = registry.get_stats()
+        registry.stop()
+        
+        stop_event.set()
+        consumer.join(timeout=1.0)
+        
+        rates = [
+            (end_counts[rig_id] - start_counts[rig_id]) / elapsed
+            for rig_id in registry.rig_ids
+        ]
+        results.append({
+            'rigs': num_rigs,
+            'workers': min(registry.num_workers, num_rigs),
+            'total_fps': sum(rates),
+            'per_rig_fps': sum(rates) / len(rates),
+            'min_rig_fps': min(rates),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rig scaling benchmark")
+    parser.add_argument("--rigs", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--duration", type=float, default=3.0)
+    args = parser.parse_args()
+    
+    results = run_scaling(args.rigs, duration=args.duration)
+    
+    print(f"\nCPU cores: {os.cpu_count()}")
+    print(f"{'rigs':>6} {'workers':>8} {'total fps':>10} {'per rig':>9} {'min rig':>9}")
+    for row in results:
+        print(f"{row['rigs']:>6} {row['workers']:>8} {row['total_fps']:>10.1f} "
+              f"{row['per_rig_fps']:>9.1f} {row['min_rig_fps']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Sample memory benchmark
+
+Stores one session's worth of synchronized frames and raw sensor readings
+in each representation and reports the bytes held per sample, measured
+with tracemalloc (the storage containers are included).
+
+Usage:
+    python -m benchmarks.bench_sample_memory [--hours 1] [--rate 100]
+"""
+import argparse
+import math
+import tracemalloc
+
+from src.sensors.sample import READING_DTYPE, SAMPLE_DTYPE, Reading, RecordLog, Sample
+
+
+def _frame_values(index):
+    angle = float(index % 360)
+    return (
+        index * 0.01,
+        angle,
+        50 + 30 * math.sin(math.radians(angle)),
+        200 + 0.5 * angle,
+    )
+
+
+def _dict_frames(count):
+    frames = []
+    for index in range(count):
+        timestamp, angle, torque, preload = _frame_values(index)
+        frames.append({'rig_id': None, 'timestamp': timestamp, 'angle': angle,
+                       'torque': torque, 'preload': preload})
+    return frames
+
+
+def _sample_frames(count):
+    return [Sample(None, *_frame_values(index)) for index in range(count)]
+
+
+def _record_frames(count):
+    log = RecordLog(SAMPLE_DTYPE)
+    for index in range(count):
+        log.append(_frame_values(index))
+    return log
+
+
+def _dict_readings(count):
+    return [{'value': float(index % 360), 'timestamp': index * 0.01} for index in range(count)]
+
+
+def _tuple_readings(count):
+    return [Reading(float(index % 360), index * 0.01) for index in range(count)]
+
+
+def _record_readings(count):
+    log = RecordLog(READING_DTYPE)
+    for index in range(count):
+        log.append((index * 0.01, float(index % 360)))
+    return log
+
+
+def measure(build, count):
+    """Bytes still allocated after build(count), per sample"""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        store = build(count)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    del store
+    return (after - before) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes per stored sample")
+    parser.add_argument("--hours", type=float, default=1.0, help="Session length")
+    parser.add_argument("--rate", type=float, default=100.0,
+                        help="Samples per second (the manager publishes at most 100 Hz)")
+    args = parser.parse_args()
+
+    count = int(args.hours * 3600 * args.rate)
+    print(f"{count} samples ({args.hours:g} h at {args.rate:g} Hz)")
+    cases = [
+        ("frame", "dict (before)", _dict_frames),
+        ("frame", "Sample __slots__", _sample_frames),
+        ("frame", "RecordLog SAMPLE_DTYPE", _record_frames),
+        ("reading", "dict (before)", _dict_readings),
+        ("reading", "Reading tuple", _tuple_readings),
+        ("reading", "RecordLog READING_DTYPE", _record_readings),
+    ]
+    for kind, name, build in cases:
+        per_sample = measure(build, count)
+        print(f"{kind:8s} {name:26s} {per_sample:7.1f} B/sample "
+              f"{per_sample * count / 2 ** 20:8.1f} MiB/session")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Synchronization replay benchmark
+
+Replays a raw sensor recording through SensorManager._get_synchronized_data
+under a virtual clock and reports replay speed plus a digest of the frames,
+which must be identical on every run.
+
+Usage:
+    python -m benchmarks.bench_sync_replay [--hours 1] [--recording file.npz]
+    python -m benchmarks.bench_sync_replay --capture 10 --save capture.npz
+"""
+import argparse
+import hashlib
+import queue
+import time
+
+import numpy as np
+
+from src.sensors.replay import ReplayDriver, SensorRecorder, SensorRecording
+from src.sensors.sensor_manager import SensorManager
+
+
+def synthetic_recording(hours=1.0, rate=10.0, jitter=0.01, seed=0):
+    """Three free-running 10 Hz sensors with jittered, drifting sample times"""
+    rng = np.random.default_rng(seed)
+    count = int(hours * 3600 * rate)
+    names, timestamps, values = [], [], []
+    for index, name in enumerate(("Encoder", "Strain Gauge", "Load Cell")):
+        period = (1.0 + 50e-6 * (index - 1)) / rate
+        t = np.arange(count) * period + rng.uniform(0, 1 / rate) + rng.normal(0, jitter, count)
+        angle = np.arange(count) % 360
+        if index == 0:
+            v = angle.astype(np.float64)
+        elif index == 1:
+            v = 50 + 30 * np.sin(np.radians(angle)) + rng.uniform(-1, 1, count)
+        else:
+            v = 200 + 0.5 * angle + 50 * np.sin(np.radians(angle * 2)) + rng.uniform(-1, 1, count)
+        names.append(name)
+        timestamps.append(np.sort(t))
+        values.append(v)
+    return SensorRecording(names, timestamps, values)
+
+
+def capture_recording(seconds, update_rate=0.05):
+    """Record raw readings from live simulated sensors"""
+    manager = SensorManager(queue.Queue(maxsize=10000), update_rate=update_rate)
+    recorder = SensorRecorder(manager)
+    recorder.start()
+    manager.start()
+    time.sleep(seconds)
+    manager.stop()
+    return recorder.stop()
+
+
+def frames_digest(frames):
+    """Hash of all frame values, to compare runs bit for bit"""
+    digest = hashlib.sha256()
+    for frame in frames:
+        digest.update(np.array(
+            [frame['timestamp'], frame['angle'], frame['torque'], frame['preload']]
+        ).tobytes())
+    return digest.hexdigest()[:16]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synchronization replay benchmark")
+    parser.add_argument("--hours", type=float, default=1.0, help="Synthetic recording length")
+    parser.add_argument("--recording", help="Replay this .npz recording instead")
+    parser.add_argument("--capture", type=float, help="Record this many seconds live first")
+    parser.add_argument("--save", help="Save the recording used to this path")
+    parser.add_argument("--runs", type=int, default=2)
+    args = parser.parse_args()
+
+    if args.recording:
+        recording = SensorRecording.load(args.recording)
+    elif args.capture:
+        recording = capture_recording(args.capture)
+    else:
+        recording = synthetic_recording(args.hours)
+    if args.save:
+        recording.save(args.save)
+
+    readings = sum(t.size for t in recording.timestamps)
+    print(f"Recording: {recording.duration:.1f} s, {readings} readings")
+    for run in range(args.runs):
+        manager = SensorManager(queue.Queue())
+        driver = ReplayDriver(manager, recording)
+        start = time.perf_counter()
+        frames = driver.run()
+        elapsed = time.perf_counter() - start
+        print(f"run {run}: {len(frames)} frames in {elapsed:.2f} s "
+              f"({recording.duration / elapsed:.0f}x real time), digest {frames_digest(frames)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,487 @@
+"""
+Hot-path micro-benchmarks with regression gating
+
+Times the per-frame hot paths in isolation: frame synchronization, raw
+calibration, trigger evaluation, derived channels, SPC scoring, the GUI
+ingest loop, plot updates drawn with Agg, PNG export and the acquisition
+queue under contention. Each benchmark times only its hot loop and
+reports the best of several repeats in seconds per operation.
+
+Results are written as JSON. `check` compares a fresh run (or a saved
+results file) against a baseline and exits with status 1 when any
+benchmark is slower than the baseline by more than the tolerance, or when
+a selected baseline benchmark was skipped or not run (unless
+--allow-skipped is given).
+
+Usage:
+    python -m benchmarks.microbench run [--only 'gui.*'] [--save benchmarks/baseline.json]
+    python -m benchmarks.microbench check [--baseline benchmarks/baseline.json]
+                                          [--tolerance 0.25] [--results results.json]
+                                          [--allow-skipped]
+
+The GUI ingest and plot benchmarks need the src.gui import chain (Tk for
+the alert popups) and are reported as skipped where it cannot be
+imported; gui.plot_to_image only needs src.gui.plots. The alert buzzer
+falls back to simulation without RPi.GPIO, so they run off the Pi too.
+Baselines are only comparable on the machine that recorded them.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import platform
+import queue
+import statistics
+import sys
+import threading
+import time
+from functools import partial
+
+import numpy as np
+
+from src.data.calibration import CalibrationStage
+from src.data.derived import DerivedEngine
+from src.data.spc import SPCMonitor
+from src.data.triggers import EdgeTrigger, TriggerEngine, WindowTrigger
+from src.sensors.channels import DEFAULT_SCHEMA, ChannelStats
+from src.sensors.replay import VirtualClock
+from src.sensors.sample import Reading, Sample
+from src.sensors.sensor_manager import SensorManager
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# name -> function(loops) returning the seconds taken by `loops` operations
+BENCHMARKS = {}
+
+
+class BenchmarkSkipped(Exception):
+    """Raised by a benchmark that cannot run in this environment"""
+
+
+def benchmark(name):
+    """Register a benchmark function under name"""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+
+def _frames(count, seed=0):
+    rng = np.random.default_rng(seed)
+    angles = (np.arange(count) * 0.36) % 360
+    torques = 50 + 30 * np.sin(np.radians(angles)) + rng.uniform(-1, 1, count)
+    preloads = 200 + 0.5 * angles + rng.uniform(-1, 1, count)
+    return [Sample(None, index * 0.001, float(a), float(t), float(p))
+            for index, (a, t, p) in enumerate(zip(angles, torques, preloads))]
+
+
+@benchmark("sensors.get_synchronized_data")
+def bench_synchronize(loops):
+    clock = VirtualClock()
+    manager = SensorManager(queue.Queue(), clock=clock)
+    sensors = list(enumerate(manager.sensors))
+    synchronize = manager._get_synchronized_data
+    now = 0.0
+    built = 0
+
+    start = time.perf_counter()
+    for _ in range(loops):
+        # Past the 10 ms rate limit, with fresh readings, so every call builds a frame
+        now += 0.02
+        clock.advance_to(now)
+        for value, sensor in sensors:
+            sensor.latest = Reading(float(value), now)
+        built += synchronize() is not None
+    elapsed = time.perf_counter() - start
+    if built != loops:
+        raise RuntimeError(f"only {built} of {loops} calls built a frame")
+    return elapsed
+
+
+def _calibration_stage():
+    return CalibrationStage.from_config({
+        'torque': {'type': 'polynomial', 'coefficients': [2.1e-19, 1.2e-5, -0.35],
+                   'raw_range': [-8388608, 8388607]},
+        'preload': {'type': 'piecewise', 'points': [[0, 0.0], [1200000, 98.1], [2410000, 196.2],
+                                                    [3630000, 294.3], [4860000, 392.4]]},
+    })
+
+
+@benchmark("data.calibration_batch[1000]")
+def bench_calibration_batch(loops):
+    stage = _calibration_stage()
+    rng = np.random.default_rng(0)
+    columns = {'torque': rng.uniform(-8e6, 8e6, 1000), 'preload': rng.uniform(0, 5e6, 1000)}
+
+    start = time.perf_counter()
+    for _ in range(loops):
+        stage.process_batch(columns)
+    return time.perf_counter() - start
+
+
+@benchmark("data.calibration_frame")
+def bench_calibration_frame(loops):
+    stage = _calibration_stage()
+    frame = Sample(None, 0.0, 90.0, 4e6, 2e6)
+
+    start = time.perf_counter()
+    for _ in range(loops):
+        stage.process_frame(frame)
+    return time.perf_counter() - start
+
+
+@benchmark("data.derived_batch[1000]")
+def bench_derived_batch(loops):
+    engine = DerivedEngine()
+    for name in ('power', 'angular_acceleration', 'torque_preload_ratio'):
+        engine.subscribe(name)
+    rng = np.random.default_rng(0)
+    timestamps = np.arange(1000) / 1000.0
+    columns = {'timestamp': timestamps, 'angle': np.mod(timestamps * 360.0, 360.0),
+               'torque': rng.uniform(0, 100, 1000), 'preload': rng.uniform(100, 500, 1000)}
+
+    start = time.perf_counter()
+    for _ in range(loops):
+        batch = engine.process(columns)
+        for name in ('power', 'torque_preload_ratio'):
+            batch[name]
+    return time.perf_counter() - start
+
+
+@benchmark("data.spc_batch[1000]")
+def bench_spc_batch(loops):
+    monitor = SPCMonitor(baseline_revolutions=5)
+    rng = np.random.default_rng(0)
+    timestamps = np.arange(1000) / 1000.0
+    angles = np.mod(timestamps * 720.0, 360.0)
+    columns = {'timestamp': timestamps, 'angle': angles,
+               'torque': 50 + 30 * np.sin(np.radians(angles)) + rng.normal(0, 0.5, 1000)}
+    # Learn the baseline first so the timed batches are scored
+    for _ in range(4):
+        monitor.process_batch(columns)
+
+    start = time.perf_counter()
+    for _ in range(loops):
+        monitor.process_batch(columns)
+    return time.perf_counter() - start
+
+
+@benchmark("data.trigger_batch[64]")
+def bench_trigger_batch(loops):
+    engine = TriggerEngine([EdgeTrigger('torque', 79.0), WindowTrigger('preload', 150.0, 400.0)],
+                           pre_ms=100, post_ms=100, sample_rate=1000.0)
+    frames = _frames(64 * 64)
+    records = DEFAULT_SCHEMA.pack(frames)
+    batches = [DEFAULT_SCHEMA.columns(records[start:start + 64])
+               for start in range(0, len(records), 64)]
+
+    start = time.perf_counter()
+    for loop in range(loops):
+        engine.process_batch(batches[loop % len(batches)])
+    return time.perf_counter() - start
+
+
+def _import_gui():
+    """The src.gui modules, or BenchmarkSkipped where they cannot be imported"""
+    try:
+        from src.gui import plots, sensor_gui
+    except ImportError as e:
+        raise BenchmarkSkipped(f"src.gui not importable ({e})")
+    return plots, sensor_gui
+
+
+def _gui_harness(points):
+    """
+    SensorGUI instance without Tk: the attributes the ingest and plot paths
+    use, with the same figure layout drawn by a plain Agg canvas
+    """
+    plots, sensor_gui = _import_gui()
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from src.data.snapshot_buffer import SnapshotBuffer
+
+    class _Var:
+        def set(self, value):
+            self.value = value
+
+    gui = sensor_gui.SensorGUI.__new__(sensor_gui.SensorGUI)
+    gui.schema = DEFAULT_SCHEMA
+    gui.display_schema = DEFAULT_SCHEMA
+    gui.derived = DerivedEngine()
+    gui.x_channel = 'angle'
+    gui.plot_channels = ('torque', 'preload')
+    gui.channels = ('timestamp',) + DEFAULT_SCHEMA.names
+    gui.buffer = SnapshotBuffer(gui.channels, capacity=points)
+    gui.display_points = points
+    gui.drawn_version = 0
+    gui.torque_threshold = None
+    gui.preload_threshold = None
+    gui.channel_stats = ChannelStats(DEFAULT_SCHEMA)
+    gui.update_count = 0
+    gui.spectrum_panel = None
+    gui.polar_panel = None
+    gui.renderer = None
+    gui.max_vars = {'torque': _Var(), 'preload': _Var()}
+    gui.current_angle_var = _Var()
+
+    gui.fig, gui.axes = plots.create_channel_figure(DEFAULT_SCHEMA)
+    gui.channel_lines = {
+        'torque': gui.axes['torque'].plot([], [], 'b-', label="Torque")[0],
+        'preload': gui.axes['preload'].plot([], [], 'r-', label="Preload")[0],
+    }
+    gui.canvas = FigureCanvasAgg(gui.fig)
+    return gui
+
+
+class _DrainedEvent:
+    """Stop event that is set once the queue is empty"""
+
+    def __init__(self, data_queue):
+        self.data_queue = data_queue
+
+    def is_set(self):
+        return self.data_queue.empty()
+
+
+@benchmark("gui.animation_loop_ingest")
+def bench_ingest(loops):
+    gui = _gui_harness(500)
+    frames = _frames(2000)
+    elapsed = 0.0
+    done = 0
+    while done < loops:
+        count = min(len(frames), loops - done)
+        gui.data_queue = queue.Queue()
+        for frame in frames[:count]:
+            gui.data_queue.put(frame)
+        gui.stop_event = _DrainedEvent(gui.data_queue)
+
+        start = time.perf_counter()
+        gui._animation_loop()
+        elapsed += time.perf_counter() - start
+        done += count
+    return elapsed
+
+
+def bench_update_plots(points, loops):
+    gui = _gui_harness(points)
+    gui.buffer.extend([(f['timestamp'], f['angle'], f['torque'], f['preload'])
+                       for f in _frames(points)])
+    # The first draw also lays out text and caches glyphs
+    gui.canvas.draw()
+
+    start = time.perf_counter()
+    for _ in range(loops):
+        gui.buffer.publish()
+        gui._update_plots()
+    return time.perf_counter() - start
+
+
+for _points in (100, 500, 2000):
+    BENCHMARKS[f"gui.update_plots[{_points}]"] = partial(bench_update_plots, _points)
+
+
+@benchmark("gui.plot_to_image")
+def bench_plot_to_image(loops):
+    try:
+        from src.gui import plots
+    except ImportError as e:
+        raise BenchmarkSkipped(f"src.gui.plots not importable ({e})")
+    fig, ax1, ax2 = plots.create_sensor_figure()
+    frames = _frames(500)
+    angles = [f['angle'] for f in frames]
+    ax1.plot(angles, [f['torque'] for f in frames], 'b-')
+    ax2.plot(angles, [f['preload'] for f in frames], 'r-')
+    plots.plot_to_image(fig)
+
+    start = time.perf_counter()
+    for _ in range(loops):
+        plots.plot_to_image(fig)
+    return time.perf_counter() - start
+
+
+def bench_queue_contention(producers, loops):
+    """Frames through a bounded queue from several producers to one consumer"""
+    data_queue = queue.Queue(maxsize=100)
+    frame = _frames(1)[0]
+    per_producer = max(1, loops // producers)
+    total = per_producer * producers
+    ready = threading.Barrier(producers + 1)
+
+    def produce():
+        ready.wait()
+        for _ in range(per_producer):
+            data_queue.put(frame)
+
+    threads = [threading.Thread(target=produce, daemon=True) for _ in range(producers)]
+    for thread in threads:
+        thread.start()
+    ready.wait()
+    start = time.perf_counter()
+    for _ in range(total):
+        data_queue.get()
+    elapsed = time.perf_counter() - start
+    for thread in threads:
+        thread.join()
+    return elapsed * loops / total
+
+
+for _producers in (1, 4):
+    BENCHMARKS[f"queue.put_get[{_producers} producers]"] = partial(
+        bench_queue_contention, _producers
+    )
+
+
+def measure(func, repeat=5, min_time=0.1):
+    """
+    Time a benchmark
+
+    The loop count is doubled until one run takes at least min_time, then
+    the benchmark is repeated with that count.
+
+    Returns:
+        Dictionary with best and median seconds per operation and the loop count
+    """
+    loops = 1
+    while True:
+        elapsed = func(loops)
+        if elapsed >= min_time or loops >= 2 ** 24:
+            break
+        loops *= 2
+    timings = [elapsed] + [func(loops) for _ in range(repeat - 1)]
+    per_op = [t / loops for t in timings]
+    return {'seconds': min(per_op), 'median': statistics.median(per_op), 'loops': loops}
+
+
+def run_suite(patterns=None, repeat=5, min_time=0.1):
+    """
+    Run the selected benchmarks
+
+    Args:
+        patterns: Benchmark names or fnmatch patterns (default: all)
+
+    Returns:
+        Results document (JSON-serializable)
+    """
+    results = {}
+    skipped = {}
+    for name, func in BENCHMARKS.items():
+        if patterns and name not in patterns and not any(
+                fnmatch.fnmatch(name, p) for p in patterns):
+            continue
+        try:
+            results[name] = measure(func, repeat, min_time)
+        except BenchmarkSkipped as e:
+            skipped[name] = str(e)
+            print(f"  {name:36s} skipped: {e}")
+            continue
+        print(f"  {name:36s} {_format_time(results[name]['seconds'])}/op "
+              f"(median {_format_time(results[name]['median'])}, {results[name]['loops']} loops)")
+    return {
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'results': results,
+        'skipped': skipped,
+    }
+
+
+def compare(baseline, current, tolerance=0.25):
+    """
+    Compare two results documents
+
+    Args:
+        tolerance: Allowed slowdown as a fraction (0.25 = 25 % slower);
+            a baseline entry may carry its own 'tolerance'
+
+    Returns:
+        List of (name, baseline seconds, current seconds, ratio, regressed)
+        for the benchmarks present in both
+    """
+    rows = []
+    for name, base in baseline['results'].items():
+        if name not in current['results']:
+            continue
+        now = current['results'][name]['seconds']
+        ratio = now / base['seconds']
+        allowed = base.get('tolerance', tolerance)
+        rows.append((name, base['seconds'], now, ratio, ratio > 1.0 + allowed))
+    return rows
+
+
+def _format_time(seconds):
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:7.2f} {unit}"
+    return f"{seconds / 1e-9:7.1f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks")
+    run_parser.add_argument("--save", help="Write the results to this JSON file")
+
+    check_parser = commands.add_parser("check", help="Fail on regressions against a baseline")
+    check_parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    check_parser.add_argument("--results", help="Check this results file instead of running")
+    check_parser.add_argument("--tolerance", type=float, default=0.25,
+                              help="Allowed slowdown as a fraction of the baseline")
+    check_parser.add_argument("--allow-skipped", action="store_true",
+                              help="Do not fail on baseline benchmarks that were skipped or not run")
+
+    for sub in (run_parser, check_parser):
+        sub.add_argument("--only", nargs="+", help="fnmatch patterns of benchmarks to run")
+        sub.add_argument("--repeat", type=int, default=5)
+        sub.add_argument("--min-time", type=float, default=0.1,
+                         help="Minimum seconds per timed run")
+    args = parser.parse_args()
+
+    if args.command == "run":
+        document = run_suite(args.only, args.repeat, args.min_time)
+        if args.save:
+            with open(args.save, "w") as f:
+                json.dump(document, f, indent=2, sort_keys=True)
+            print(f"Saved {len(document['results'])} results to {args.save}")
+        return
+
+    if not os.path.exists(args.baseline):
+        sys.exit(f"No baseline at {args.baseline}; record one on this machine first with "
+                 f"'python -m benchmarks.microbench run --save {args.baseline}'")
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if args.results:
+        with open(args.results) as f:
+            current = json.load(f)
+    else:
+        patterns = args.only or list(baseline['results'])
+        current = run_suite(patterns, args.repeat, args.min_time)
+
+    rows = compare(baseline, current, args.tolerance)
+    regressions = [row for row in rows if row[4]]
+    print(f"Against {args.baseline} ({baseline.get('machine')}, {baseline.get('created')}):")
+    for name, base, now, ratio, regressed in rows:
+        print(f"  {name:36s} {_format_time(base)} -> {_format_time(now)}  "
+              f"{ratio:5.2f}x{'  REGRESSION' if regressed else ''}")
+    selected = [name for name in baseline['results']
+                if not args.only or any(fnmatch.fnmatch(name, p) for p in args.only)]
+    missing = sorted(set(selected) - set(current['results']))
+    skipped = current.get('skipped', {})
+    for name in missing:
+        print(f"  {name:36s} {'skipped: ' + skipped[name] if name in skipped else 'not run'}")
+    failed = False
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than "
+              f"{args.tolerance:.0%}")
+        failed = True
+    if missing and not args.allow_skipped:
+        print(f"{len(missing)} baseline benchmark(s) were not checked")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("No regressions")
+
+
+if __name__ == "__main__":
+    main()
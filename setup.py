@@ -8,5 +8,5 @@ setup(
         "matplotlib>=3.5.0",
         "numpy>=1.20.0",
     ],
-    python_requires=">=3.6",
+    python_requires=">=3.7",
 )
\ No newline at end of file
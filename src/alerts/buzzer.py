@@ -1,15 +1,19 @@
 # src/alerts/buzzer.py
-import RPi.GPIO as GPIO
 import time
 import threading
 import platform
 
+try:
+    import RPi.GPIO as GPIO  # Only available on the Raspberry Pi
+except ImportError:
+    GPIO = None
+
 class Buzzer:
     """Controls a GPIO buzzer for audio alerts"""
     
     def __init__(self, pin=17):
         self.pin = pin
-        self.is_simulation = platform.system() != "Linux"
+        self.is_simulation = platform.system() != "Linux" or GPIO is None
         
         if not self.is_simulation:
             # Only setup GPIO on Raspberry Pi
@@ -0,0 +1,406 @@
+"""
+Offline analysis of many recorded sessions
+
+Computes per-session and per-revolution metrics (peaks, work per
+revolution, threshold exceedances) of every session in a set of
+directories and collects them in two columnar tables, one row per session
+and one row per cycle, ready for filtering with numpy masks:
+
+    summary = analyze_sessions(["recordings/"], torque_limit=80.0)
+    heavy = summary.sessions[summary.sessions['peak_torque'] > 90.0]
+
+Sessions are analyzed on a process pool. Each worker decodes its session
+once into an uncompressed column file in the cache directory, one log
+chunk at a time, and then reads it memory-mapped in chunks, so a worker
+never holds a whole DataLogger session in memory (raw .npz recordings are
+replayed whole) and later runs with other limits skip the decoding. Results are
+memoized in the same directory under the SHA-256 of the session file and
+the analysis parameters; the least recently used files are evicted when
+the cache grows beyond its size limit.
+
+    python -m src.analysis recordings/ --torque-limit 80 --out summary.npz --csv summary.csv
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from src.data.cycles import CYCLE_DTYPE, CycleDetector
+from src.data.data_logger import count_rows, iter_chunks
+from src.report import find_sessions, load_session
+
+DEFAULT_CACHE_DIR = ".analysis_cache"
+DEFAULT_CACHE_BYTES = 1 << 30
+# Bump when the metrics change so memoized results are computed again
+ANALYSIS_VERSION = 2
+# Rows read from a memory-mapped session at a time
+CHUNK_ROWS = 1 << 16
+# Rows of the decoded column files
+COLUMNS = ('timestamp', 'angle', 'torque', 'preload')
+
+METRICS_DTYPE = np.dtype([
+    ('frames', np.int64),
+    ('duration', np.float64),
+    ('cycles', np.int64),
+    ('peak_torque', np.float64),
+    ('mean_torque', np.float64),
+    ('peak_preload', np.float64),
+    ('total_work', np.float64),        # J over the completed revolutions
+    ('mean_work', np.float64),         # J per revolution
+    ('torque_exceed_samples', np.int64),
+    ('torque_exceed_events', np.int64),
+    ('preload_exceed_samples', np.int64),
+    ('preload_exceed_events', np.int64),
+])
+
+CYCLE_SUMMARY_DTYPE = np.dtype(
+    [('session', np.int32)] + CYCLE_DTYPE.descr
+    + [('torque_exceed', np.int32), ('preload_exceed', np.int32)]
+)
+
+# sessions: one row per session ('session' is its path); cycles: one row
+# per revolution ('session' indexes sessions); errors: path -> message
+Summary = namedtuple('Summary', ['sessions', 'cycles', 'errors'])
+
+
+def content_hash(path, block_size=1 << 20):
+    """SHA-256 of a file's content"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """Directory of decoded sessions and memoized results with LRU eviction"""
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_CACHE_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def get(self, name):
+        """Path of a cached file, marked as just used, or None"""
+        path = self.path(name)
+        try:
+            # The modification time doubles as the last-use stamp
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, name, write):
+        """
+        Store a file atomically
+
+        Args:
+            write: Callable writing the content to a binary file object
+        """
+        path = self.path(name)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            write(f)
+        os.replace(temporary, path)
+        return path
+
+    def evict(self):
+        """Delete the least recently used files until the cache fits max_bytes"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed += 1
+        return removed
+
+
+def result_key(digest, params):
+    """Memo key of a session content hash and the analysis parameters"""
+    text = json.dumps(dict(params, version=ANALYSIS_VERSION), sort_keys=True)
+    return hashlib.sha256(f"{digest}:{text}".encode()).hexdigest()
+
+
+def _session_columns(cache, path, digest):
+    """
+    The session's columns, decoded into the cache once and memory-mapped
+
+    The file is a Fortran-ordered (COLUMNS, rows) .npy array, i.e. one row
+    of the four values per sample, so DataLogger chunks are appended as
+    they are decoded and a chunk of samples is one contiguous block.
+    """
+    name = f"columns-{digest}.npy"
+    stored = cache.get(name)
+    if stored is None:
+        if path.endswith(".npz"):
+            columns = load_session(path)
+            rows = len(columns.get('angle', ()))
+            chunks = [columns]
+        else:
+            rows = count_rows(path)
+            chunks = iter_chunks(path)
+        if rows == 0:
+            raise ValueError("Session has no frames")
+
+        def write(f):
+            np.lib.format.write_array_header_1_0(f, {
+                'descr': np.lib.format.dtype_to_descr(np.dtype(np.float64)),
+                'fortran_order': True,
+                'shape': (len(COLUMNS), rows),
+            })
+            written = 0
+            for chunk in chunks:
+                block = np.stack([np.asarray(chunk[name], dtype=np.float64) for name in COLUMNS],
+                                 axis=1)
+                f.write(block.tobytes())
+                written += len(block)
+            if written != rows:
+                raise ValueError(f"Session changed while decoding ({written} of {rows} rows)")
+
+        stored = cache.put(name, write)
+    return np.load(stored, mmap_mode='r')
+
+
+class _Exceedance:
+    """Samples above a limit and rising crossings of it, across chunks"""
+
+    def __init__(self, limit):
+        self.limit = np.inf if limit is None else float(limit)
+        self.above = False
+        self.samples = 0
+        self.events = 0
+
+    def update(self, values):
+        above = values > self.limit
+        if above.size:
+            self.samples += int(above.sum())
+            self.events += int(np.count_nonzero(above[1:] & ~above[:-1]))
+            self.events += int(above[0] and not self.above)
+            self.above = bool(above[-1])
+
+
+def compute_metrics(data, torque_limit=None, preload_limit=None, chunk_rows=CHUNK_ROWS):
+    """
+    Metrics of one session
+
+    Args:
+        data: 2-D array (or memory map) with the COLUMNS as rows
+        torque_limit: Torque threshold (Nm); None counts no exceedances
+        preload_limit: Preload threshold (N); None counts no exceedances
+        chunk_rows: Samples processed at a time
+
+    Returns:
+        (metrics, cycles): one METRICS_DTYPE row and the completed cycles
+        as CYCLE_SUMMARY_DTYPE rows (session index 0)
+    """
+    rows = data.shape[1]
+    detector = CycleDetector()
+    torque_exceed = _Exceedance(torque_limit)
+    preload_exceed = _Exceedance(preload_limit)
+    peak_torque = peak_preload = -np.inf
+    torque_total = 0.0
+    torque_count = 0
+    for start in range(0, rows, chunk_rows):
+        timestamps, angles, torques, preloads = np.asarray(data[:, start:start + chunk_rows])
+        detector.process(timestamps, angles, torques, preloads)
+        torque_exceed.update(torques)
+        preload_exceed.update(preloads)
+        known = np.isfinite(torques)
+        if known.any():
+            peak_torque = max(peak_torque, torques[known].max())
+            torque_total += torques[known].sum()
+            torque_count += int(known.sum())
+        if np.isfinite(preloads).any():
+            peak_preload = max(peak_preload, np.nanmax(preloads))
+
+    found = detector.table.view()
+    cycles = np.zeros(len(found), dtype=CYCLE_SUMMARY_DTYPE)
+    for name in CYCLE_DTYPE.names:
+        cycles[name] = found[name]
+    if len(cycles):
+        # Second pass: attribute each sample to the cycle its time falls in
+        starts = cycles['start_time']
+        ends = cycles['end_time']
+        for start in range(0, rows, chunk_rows):
+            timestamps, angles, torques, preloads = np.asarray(data[:, start:start + chunk_rows])
+            index = np.searchsorted(starts, timestamps, side='right') - 1
+            inside = (index >= 0) & np.isfinite(angles)
+            inside[inside] &= timestamps[inside] <= ends[index[inside]]
+            for name, values, limit in (('torque_exceed', torques, torque_limit),
+                                        ('preload_exceed', preloads, preload_limit)):
+                if limit is not None:
+                    hits = index[inside & (values > limit)]
+                    cycles[name] += np.bincount(hits, minlength=len(cycles)).astype(np.int32)
+
+    metrics = np.zeros(1, dtype=METRICS_DTYPE)[0]
+    metrics['frames'] = rows
+    metrics['duration'] = data[0, rows - 1] - data[0, 0] if rows else 0.0
+    metrics['cycles'] = len(cycles)
+    metrics['peak_torque'] = peak_torque if torque_count else np.nan
+    metrics['mean_torque'] = torque_total / torque_count if torque_count else np.nan
+    metrics['peak_preload'] = peak_preload if np.isfinite(peak_preload) else np.nan
+    metrics['total_work'] = cycles['work'].sum()
+    metrics['mean_work'] = cycles['work'].mean() if len(cycles) else np.nan
+    metrics['torque_exceed_samples'] = torque_exceed.samples
+    metrics['torque_exceed_events'] = torque_exceed.events
+    metrics['preload_exceed_samples'] = preload_exceed.samples
+    metrics['preload_exceed_events'] = preload_exceed.events
+    return metrics, cycles
+
+
+def analyze_session(path, cache_dir, params, force=False):
+    """
+    Metrics of one session, memoized (runs in a worker process)
+
+    Returns:
+        (metrics, cycles, cached)
+    """
+    cache = AnalysisCache(cache_dir)
+    digest = content_hash(path)
+    name = f"result-{result_key(digest, params)}.npz"
+    stored = None if force else cache.get(name)
+    if stored is not None:
+        with np.load(stored) as result:
+            return result['metrics'][0], result['cycles'], True
+
+    metrics, cycles = compute_metrics(_session_columns(cache, path, digest), **params)
+    cache.put(name, lambda f: np.savez(f, metrics=np.array([metrics], dtype=METRICS_DTYPE),
+                                      cycles=cycles))
+    return metrics, cycles, False
+
+
+def analyze_sessions(paths, torque_limit=None, preload_limit=None, cache_dir=DEFAULT_CACHE_DIR,
+                     max_cache_bytes=DEFAULT_CACHE_BYTES, workers=None, force=False):
+    """
+    Analyze every session and collect the results
+
+    Args:
+        paths: Session files (.svlog, .npz) or directories of session files
+        torque_limit: Torque threshold (Nm) for the exceedance counts
+        preload_limit: Preload threshold (N) for the exceedance counts
+        cache_dir: Directory of decoded sessions and memoized results
+        max_cache_bytes: Cache size above which the least recently used
+            files are evicted (after the run)
+        workers: Worker processes (default: one per core); 1 runs inline
+        force: Recompute every session even if memoized
+
+    Returns:
+        Summary of the analyzed sessions, sorted by path; a 'cached' column
+        of the sessions table tells which results were memoized
+    """
+    params = {'torque_limit': torque_limit, 'preload_limit': preload_limit}
+    cache = AnalysisCache(cache_dir, max_cache_bytes)
+    sessions = find_sessions(paths)
+    results = {}
+    errors = {}
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(sessions) <= 1:
+        for path in sessions:
+            try:
+                results[path] = analyze_session(path, cache_dir, params, force)
+            except Exception as e:
+                errors[path] = str(e)
+    elif sessions:
+        with ProcessPoolExecutor(max_workers=min(workers, len(sessions))) as pool:
+            futures = {pool.submit(analyze_session, path, cache_dir, params, force): path
+                       for path in sessions}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    results[path] = future.result()
+                except Exception as e:
+                    errors[path] = str(e)
+    cache.evict()
+
+    analyzed = sorted(results)
+    width = max([len(path) for path in analyzed] + [1])
+    table = np.zeros(len(analyzed), dtype=[('session', f'U{width}'), ('cached', np.bool_)]
+                     + METRICS_DTYPE.descr)
+    cycles = []
+    for index, path in enumerate(analyzed):
+        metrics, session_cycles, cached = results[path]
+        table['session'][index] = path
+        table['cached'][index] = cached
+        for name in METRICS_DTYPE.names:
+            table[name][index] = metrics[name]
+        session_cycles = np.array(session_cycles, dtype=CYCLE_SUMMARY_DTYPE)
+        session_cycles['session'] = index
+        cycles.append(session_cycles)
+    cycles = np.concatenate(cycles) if cycles else np.zeros(0, dtype=CYCLE_SUMMARY_DTYPE)
+    return Summary(table, cycles, errors)
+
+
+def save_summary(summary, path):
+    """Write the session and cycle tables to an .npz file (no pickles)"""
+    np.savez(path, sessions=summary.sessions, cycles=summary.cycles)
+
+
+def load_summary(path):
+    """Read tables written by save_summary (errors are not stored)"""
+    with np.load(path) as data:
+        return Summary(data['sessions'], data['cycles'], {})
+
+
+def write_csv(table, path):
+    """Write a structured table as CSV with a header row"""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(table.dtype.names)
+        writer.writerows(table.tolist())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze recorded sessions")
+    parser.add_argument("sessions", nargs="+", help="Session files (.svlog, .npz) or directories")
+    parser.add_argument("--torque-limit", type=float, help="Torque threshold (Nm) for exceedances")
+    parser.add_argument("--preload-limit", type=float, help="Preload threshold (N) for exceedances")
+    parser.add_argument("--out", help="Write the session and cycle tables to this .npz file")
+    parser.add_argument("--csv", help="Write the session table to this CSV file")
+    parser.add_argument("--cycles-csv", help="Write the cycle table to this CSV file")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Cache directory")
+    parser.add_argument("--cache-size", type=float, default=DEFAULT_CACHE_BYTES / 2**20,
+                        help="Cache size limit (MiB)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per core)")
+    parser.add_argument("--force", action="store_true", help="Ignore memoized results")
+    args = parser.parse_args()
+
+    summary = analyze_sessions(args.sessions, args.torque_limit, args.preload_limit,
+                               args.cache_dir, int(args.cache_size * 2**20), args.workers, args.force)
+    for row in summary.sessions:
+        print(f"{row['session']}: {row['frames']} frames, {row['cycles']} cycles, "
+              f"peak torque {row['peak_torque']:.1f} Nm, work {row['mean_work']:.2f} J/rev, "
+              f"{row['torque_exceed_events']} torque exceedances"
+              + (" (cached)" if row['cached'] else ""))
+    for path, message in sorted(summary.errors.items()):
+        print(f"FAILED  {path}: {message}")
+    if args.out:
+        save_summary(summary, args.out)
+    if args.csv:
+        write_csv(summary.sessions, args.csv)
+    if args.cycles_csv:
+        write_csv(summary.cycles, args.cycles_csv)
+    print(f"Analyzed {len(summary.sessions)} sessions ({int(summary.sessions['cached'].sum())} "
+          f"cached, {len(summary.errors)} failed), {len(summary.cycles)} cycles")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Headless acquisition daemon
+
+Runs acquisition, recording and threshold alerts without any GUI, and
+serves the frames to remote GUI clients (python -m src.main --connect).
+Closing a GUI no longer stops acquisition.
+
+    python -m src.daemon --mode simulation --listen 127.0.0.1:5760 \
+        --record session.svlog --torque-limit 80 --spc torque
+"""
+import argparse
+import os
+import queue
+import signal
+import threading
+
+from src.data.calibration import CalibrationStage
+from src.data.data_logger import DataLogger
+from src.data.data_source import DataSource
+from src.data.spc import AngleBinModel, SPCMonitor
+from src.remote.protocol import DEFAULT_ADDRESS, parse_address
+from src.remote.server import FrameServer
+from src.sensors.channels import DEFAULT_SCHEMA, ChannelSchema
+
+
+def rig_record_path(record_path, rig_id):
+    """Log file of one rig when several are recorded: run.svlog -> run.rig0.svlog"""
+    root, extension = os.path.splitext(record_path)
+    return f"{root}.rig{rig_id}{extension}"
+
+
+class AcquisitionDaemon:
+    """Drains a DataSource into the frame server, a recording and alerts"""
+
+    def __init__(self, data_source, data_queue, server, record_path=None,
+                 torque_limit=None, preload_limit=None, schema=DEFAULT_SCHEMA, spc=None,
+                 num_rigs=1):
+        """
+        Args:
+            data_source: DataSource filling data_queue at full rate
+            data_queue: Queue the data source publishes to
+            server: FrameServer for remote clients
+            record_path: Compressed log file receiving every frame (optional);
+                with several rigs each rig is recorded to its own file, see
+                rig_record_path()
+            torque_limit: Torque (Nm) above which an alert is raised (optional)
+            preload_limit: Preload (N) above which an alert is raised (optional)
+            schema: ChannelSchema of the frames, used for the recording
+            spc: SPCMonitor fed with the full-rate frames; alerts through the
+                daemon's AlertManager unless it has its own (optional)
+            num_rigs: Number of rigs whose frames (tagged with rig_id) arrive
+        """
+        self.data_source = data_source
+        self.data_queue = data_queue
+        self.server = server
+        # Loggers by rig id; a single rig's frames all go to record_path
+        self.loggers = {}
+        if record_path and num_rigs > 1:
+            self.loggers = {rig_id: DataLogger(rig_record_path(record_path, rig_id), schema=schema)
+                            for rig_id in range(num_rigs)}
+        elif record_path:
+            self.loggers = {None: DataLogger(record_path, schema=schema)}
+        self.torque_limit = torque_limit
+        self.preload_limit = preload_limit
+        self.stop_event = threading.Event()
+        self.frames_processed = 0
+
+        self.alert_manager = None
+        if torque_limit is not None or preload_limit is not None or spc is not None:
+            # Imported lazily: the alert manager needs Tk
+            from src.alerts.alert_manager import AlertManager
+            self.alert_manager = AlertManager()
+
+        self.spc = spc
+        if spc is not None:
+            if spc.alert_manager is None:
+                spc.alert_manager = self.alert_manager
+            data_source.add_frame_listener(spc.feed)
+
+    def run(self):
+        """Acquire until stop() is called (blocks)"""
+        self.server.start()
+        self.data_source.start()
+        try:
+            while not self.stop_event.is_set():
+                try:
+                    frame = self.data_queue.get(timeout=0.2)
+                except queue.Empty:
+                    continue
+                self._handle(frame)
+        finally:
+            self.data_source.stop()
+            self.server.stop()
+            for logger in self.loggers.values():
+                logger.close()
+                print(f"Recorded {logger.rows_written} frames "
+                      f"({logger.bytes_written} bytes) to {logger.path}")
+            if self.spc is not None:
+                print(f"SPC: {self.spc.cycles_out_of_control} of {self.spc.cycles_scored} "
+                      f"revolutions out of control")
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _handle(self, frame):
+        self.frames_processed += 1
+        self.server.publish(frame)
+        logger = self.loggers.get(None if None in self.loggers else frame.get('rig_id'))
+        if logger is not None:
+            logger.log_frame(frame)
+        if self.alert_manager is not None:
+            self._check_limits(frame)
+
+    def _check_limits(self, frame):
+        torque = frame.get('torque', 0.0)
+        if self.torque_limit is not None and torque > self.torque_limit:
+            self.alert_manager.alert(
+                "torque", f"Torque of {torque:.1f} Nm exceeds limit of {self.torque_limit:.1f} Nm",
+                popup=False
+            )
+        preload = frame.get('preload', 0.0)
+        if self.preload_limit is not None and preload > self.preload_limit:
+            self.alert_manager.alert(
+                "preload", f"Preload of {preload:.1f} N exceeds limit of {self.preload_limit:.1f} N",
+                popup=False
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SensorViz acquisition daemon")
+    parser.add_argument("--mode", default="hardware", choices=("hardware", "simulation"))
+    parser.add_argument("--rigs", type=int, default=1, help="Number of rigs to acquire")
+    parser.add_argument("--backend", default="threaded", choices=("threaded", "asyncio"))
+    parser.add_argument("--listen", default="%s:%d" % DEFAULT_ADDRESS,
+                        help="host:port or Unix socket path for GUI clients")
+    parser.add_argument("--record", help="Log every frame to this compressed log file "
+                                         "(one file per rig, e.g. run.rig0.svlog, with --rigs)")
+    parser.add_argument("--torque-limit", type=float, help="Torque alert threshold (Nm)")
+    parser.add_argument("--preload-limit", type=float, help="Preload alert threshold (N)")
+    parser.add_argument("--channels", help="Channel schema JSON file (simulation mode)")
+    parser.add_argument("--calibration",
+                        help="Calibration JSON file (bare names are looked up in config/)")
+    parser.add_argument("--tare", type=int, default=0, metavar="FRAMES",
+                        help="Zero the calibrated channels on the mean of the first FRAMES frames")
+    parser.add_argument("--spc", metavar="CHANNEL",
+                        help="Alert on revolutions where CHANNEL leaves its per-angle control limits")
+    parser.add_argument("--spc-baseline", type=int, default=20, metavar="REVOLUTIONS",
+                        help="Revolutions learned as the SPC baseline")
+    parser.add_argument("--spc-sigma", type=float, default=3.0, help="SPC control limits (sigma)")
+    parser.add_argument("--spc-model", metavar="FILE",
+                        help="Baseline model: loaded if FILE exists, else learned and saved to it")
+    args = parser.parse_args()
+    if args.channels and args.mode != "simulation":
+        # The hardware sensors always publish the standard angle/torque/preload frames
+        parser.error("--channels requires --mode simulation")
+    schema = ChannelSchema.load(args.channels) if args.channels else DEFAULT_SCHEMA
+    calibration = CalibrationStage.load(args.calibration) if args.calibration else None
+    if args.tare:
+        calibration = calibration or CalibrationStage()
+        # Without calibrations every channel except the encoder is zeroed
+        calibration.capture_tare(args.tare, list(calibration.channel_calibrations)
+                                 or [name for name in schema.names if name != 'angle'])
+
+    if args.spc and args.rigs > 1:
+        parser.error("--spc monitors a single rig")
+    spc = None
+    if args.spc:
+        model = None
+        if args.spc_model and os.path.exists(args.spc_model):
+            model = AngleBinModel.load(args.spc_model)
+        spc = SPCMonitor(args.spc, model, baseline_revolutions=0 if model else args.spc_baseline,
+                         sigma=args.spc_sigma, schema=schema)
+
+    data_queue = queue.Queue(maxsize=1000 * args.rigs)
+    data_source = DataSource(data_queue, mode=args.mode, num_rigs=args.rigs, backend=args.backend,
+                             schema=schema, calibration=calibration)
+    daemon = AcquisitionDaemon(
+        data_source, data_queue, FrameServer(parse_address(args.listen), schema=schema),
+        record_path=args.record, torque_limit=args.torque_limit,
+        preload_limit=args.preload_limit, schema=schema, spc=spc, num_rigs=args.rigs,
+    )
+
+    # Stop cleanly on Ctrl+C and on service manager shutdown
+    signal.signal(signal.SIGINT, lambda *_: daemon.stop())
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop())
+    daemon.run()
+    if spc is not None and args.spc_model and spc.baseline_revolutions and not spc.learning:
+        spc.model.save(args.spc_model)
+        print(f"SPC baseline saved to {args.spc_model}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 # src/data/__init__.py
 #from .data_source import DataSource
-#from .data_logger import DataLogger  # If implemented
+from .data_logger import DataLogger
 
 # This allows you to import directly from the data package:
 # from src.data import DataSource
\ No newline at end of file
@@ -0,0 +1,338 @@
+# src/data/calibration.py
+"""
+Calibration of raw sensor readings into physical units
+
+Strain gauges and load cells deliver ADC counts. Each channel's counts are
+mapped through a calibration curve (offset, gain and non-linearity in one
+polynomial or a table of measured points), optionally compensated for
+temperature drift, and finally zeroed by a tare offset:
+
+    value = curve(raw)
+    value = (value - offset_drift * dT) / (1 + gain_drift * dT)    dT = T - reference
+    value = value - tare
+
+Polynomials are evaluated once into a uniformly spaced lookup table, so a
+batch costs one multiply, one gather and one linear interpolation per
+sample regardless of the polynomial order. Raw values outside the
+calibrated range are clamped to its ends, as an ADC saturates.
+
+Calibration files are JSON, looked up under config/ when given a bare name:
+
+    {"channels": {
+        "torque": {"type": "polynomial", "coefficients": [1e-12, 2.4e-5, -0.3],
+                   "raw_range": [-8388608, 8388607],
+                   "temperature": {"channel": "temperature", "reference": 20.0,
+                                   "gain": 0.0002, "offset": 0.01}},
+        "preload": {"type": "piecewise", "points": [[0, 0.0], [400000, 98.1], ...]}
+    }}
+"""
+import abc
+import copy
+import json
+import os
+
+import numpy as np
+
+CONFIG_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "config"))
+
+
+class Calibration(abc.ABC):
+    """Base class mapping raw readings of one channel to physical units"""
+
+    def __init__(self, temperature=None):
+        """
+        Args:
+            temperature: Optional drift compensation, a dictionary with the
+                'channel' holding the sensor temperature, the 'reference'
+                temperature of the calibration, the relative 'gain' drift and
+                the 'offset' drift (in output units) per degree
+        """
+        temperature = temperature or {}
+        self.temperature_channel = temperature.get('channel')
+        self.reference_temperature = float(temperature.get('reference', 20.0))
+        self.gain_drift = float(temperature.get('gain', 0.0))
+        self.offset_drift = float(temperature.get('offset', 0.0))
+
+    @abc.abstractmethod
+    def convert(self, raw):
+        """
+        Map raw readings through the calibration curve
+
+        Args:
+            raw: 1-D float64 array of raw readings (NaN = missing)
+
+        Returns:
+            numpy array of values in physical units, NaN where raw is NaN
+        """
+
+    def apply(self, raw, temperature=None):
+        """
+        Calibrate a batch of raw readings
+
+        Args:
+            raw: 1-D array-like of raw readings
+            temperature: Sensor temperature per reading (array or scalar);
+                without it no drift compensation is applied
+
+        Returns:
+            numpy array of calibrated values
+        """
+        values = self.convert(np.asarray(raw, dtype=np.float64))
+        if temperature is None or not (self.gain_drift or self.offset_drift):
+            return values
+        delta = np.asarray(temperature, dtype=np.float64) - self.reference_temperature
+        return (values - self.offset_drift * delta) / (1.0 + self.gain_drift * delta)
+
+
+class PolynomialCalibration(Calibration):
+    """Polynomial curve evaluated through a precomputed lookup table"""
+
+    def __init__(self, coefficients, raw_range, table_size=4096, temperature=None):
+        """
+        Args:
+            coefficients: Polynomial coefficients, highest power first (as
+                numpy.polyval); [gain, offset] is a plain linear calibration
+            raw_range: (low, high) raw values covered by the table
+            table_size: Number of table entries across raw_range
+        """
+        super().__init__(temperature)
+        low, high = (float(value) for value in raw_range)
+        if high <= low:
+            raise ValueError("raw_range must be increasing")
+        if table_size < 2:
+            raise ValueError("table_size must be at least 2")
+        self.coefficients = tuple(float(c) for c in coefficients)
+        self.raw_range = (low, high)
+        self._last = float(table_size - 1)
+        self._scale = self._last / (high - low)
+        self._table = np.polyval(self.coefficients, np.linspace(low, high, table_size))
+        # Slope of each table segment; the last entry is only hit exactly
+        self._slope = np.append(np.diff(self._table), 0.0)
+
+    def convert(self, raw):
+        position = np.clip((raw - self.raw_range[0]) * self._scale, 0.0, self._last)
+        missing = np.isnan(position)
+        has_missing = missing.any()
+        if has_missing:
+            position[missing] = 0.0
+        index = position.astype(np.intp)
+        values = self._table[index] + (position - index) * self._slope[index]
+        if has_missing:
+            values[missing] = np.nan
+        return values
+
+
+class PiecewiseCalibration(Calibration):
+    """Linear interpolation between measured (raw, value) points"""
+
+    def __init__(self, points, temperature=None):
+        """
+        Args:
+            points: Sequence of (raw, value) pairs, e.g. from a dead-weight
+                calibration; at least two, with distinct raw values
+        """
+        super().__init__(temperature)
+        points = sorted((float(raw), float(value)) for raw, value in points)
+        raw = np.array([p[0] for p in points])
+        if len(points) < 2 or np.any(np.diff(raw) <= 0):
+            raise ValueError("At least two points with distinct raw values are needed")
+        self.raw_points = raw
+        self.values = np.array([p[1] for p in points])
+
+    def convert(self, raw):
+        return np.interp(raw, self.raw_points, self.values)
+
+
+def create_calibration(spec):
+    """
+    Build a channel calibration from a configuration dictionary
+
+    Args:
+        spec: Dictionary with a 'type' key (polynomial, linear, piecewise),
+            the parameters for that type and an optional 'temperature'
+            dictionary (see Calibration)
+
+    Returns:
+        Calibration instance
+    """
+    kind = spec['type']
+    temperature = spec.get('temperature')
+    if kind == "polynomial":
+        return PolynomialCalibration(spec['coefficients'], spec['raw_range'],
+                                     spec.get('table_size', 4096), temperature)
+    if kind == "linear":
+        # A degree-1 polynomial is exact with a two-entry table
+        return PolynomialCalibration((spec['gain'], spec.get('offset', 0.0)),
+                                     spec.get('raw_range', (-2.0 ** 31, 2.0 ** 31)), 2, temperature)
+    if kind == "piecewise":
+        return PiecewiseCalibration(spec['points'], temperature)
+    raise ValueError(f"Unknown calibration type: {kind}")
+
+
+class CalibrationStage:
+    """
+    Per-channel calibration and tare between the sensors and the filters
+
+    Channels without a calibration pass through unchanged, but can still be
+    tared. A tare is captured on the processing thread: capture_tare() only
+    arms it, and the following frames are averaged into the new zero.
+    """
+
+    def __init__(self, channel_calibrations=None):
+        """
+        Args:
+            channel_calibrations: Dictionary mapping channel name to a Calibration
+        """
+        self.channel_calibrations = dict(channel_calibrations or {})
+        self.tare_offsets = {}
+        self._tare_capture = None
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Build a stage from {'channels': {name: spec}} or a plain {name: spec}
+        dictionary (see create_calibration)
+        """
+        if 'channels' in config:
+            config = config['channels']
+        return cls({channel: create_calibration(spec) for channel, spec in config.items()})
+
+    @classmethod
+    def load(cls, path):
+        """Load a calibration file; bare file names are looked up in config/"""
+        if not os.path.dirname(path) and not os.path.exists(path):
+            path = os.path.join(CONFIG_DIR, path)
+        with open(path) as f:
+            return cls.from_config(json.load(f))
+
+    def copy(self):
+        """
+        Stage with the same calibrations but tare state of its own (e.g. one
+        per rig, so each rig is zeroed on its own frames)
+        """
+        stage = CalibrationStage(self.channel_calibrations)
+        stage.tare_offsets = dict(self.tare_offsets)
+        stage._tare_capture = copy.deepcopy(self._tare_capture)
+        return stage
+
+    def set_calibration(self, channel, calibration):
+        """Attach a calibration to a channel"""
+        self.channel_calibrations[channel] = calibration
+
+    def capture_tare(self, samples=50, channels=None):
+        """
+        Zero channels on the mean of their next calibrated values
+
+        Args:
+            samples: Number of frames averaged into the tare
+            channels: Channels to zero (default: every calibrated channel)
+        """
+        if samples < 1:
+            raise ValueError("samples must be at least 1")
+        channels = list(self.channel_calibrations) if channels is None else list(channels)
+        # Replaced as a whole, so the processing thread sees either capture
+        self._tare_capture = _TareCapture(channels, samples)
+
+    @property
+    def tare_pending(self):
+        return self._tare_capture is not None
+
+    def clear_tare(self):
+        """Remove the tare offsets of all channels"""
+        self._tare_capture = None
+        self.tare_offsets = {}
+
+    def process_batch(self, columns):
+        """
+        Calibrate a batch of frames stored column-wise
+
+        Args:
+            columns: Dictionary mapping channel name to a 1-D array
+
+        Returns:
+            New dictionary with calibrated channels replaced
+        """
+        out = dict(columns)
+        compensated = []
+        for channel, calibration in self.channel_calibrations.items():
+            if channel not in out:
+                continue
+            if calibration.temperature_channel is None:
+                out[channel] = calibration.apply(out[channel])
+            else:
+                compensated.append((channel, calibration))
+        # Drift compensation uses the (calibrated) sensor temperatures
+        for channel, calibration in compensated:
+            out[channel] = calibration.apply(out[channel], out.get(calibration.temperature_channel))
+
+        capture = self._tare_capture
+        if capture is not None:
+            capture.add({channel: out[channel] for channel in capture.channels
+                         if channel in out})
+            if capture.complete:
+                self._finish_tare(capture)
+
+        for channel, offset in self.tare_offsets.items():
+            if channel in out:
+                out[channel] = np.asarray(out[channel], dtype=np.float64) - offset
+        return out
+
+    def process_frame(self, frame):
+        """
+        Calibrate a single frame (a dictionary or a Sample from SensorManager)
+
+        Returns:
+            New frame of the same type with calibrated channel values
+        """
+        names = set(self.channel_calibrations) | set(self.tare_offsets)
+        names.update(calibration.temperature_channel
+                     for calibration in self.channel_calibrations.values())
+        capture = self._tare_capture
+        if capture is not None:
+            names.update(capture.channels)
+        columns = {name: np.array([frame[name]], dtype=np.float64)
+                   for name in names if name is not None and name in frame}
+
+        out = frame.copy()
+        for name, values in self.process_batch(columns).items():
+            out[name] = float(values[0])
+        return out
+
+    def _finish_tare(self, capture):
+        means = capture.means()
+        offsets = dict(self.tare_offsets)
+        offsets.update(means)
+        self.tare_offsets = offsets
+        if self._tare_capture is capture:
+            self._tare_capture = None
+        print("Tare captured: " + ", ".join(f"{channel}={offset:.4g}"
+                                              for channel, offset in means.items()))
+
+
+class _TareCapture:
+    """Running mean of the calibrated values of a tare window (NaN ignored)"""
+
+    def __init__(self, channels, samples):
+        self.channels = channels
+        self.samples = samples
+        self.frames = 0
+        self.totals = dict.fromkeys(channels, 0.0)
+        self.counts = dict.fromkeys(channels, 0)
+
+    def add(self, columns):
+        rows = 0
+        for channel, values in columns.items():
+            values = np.asarray(values, dtype=np.float64)[:self.samples - self.frames]
+            finite = values[np.isfinite(values)]
+            self.totals[channel] += float(finite.sum())
+            self.counts[channel] += finite.size
+            rows = max(rows, values.size)
+        self.frames += rows
+
+    @property
+    def complete(self):
+        return self.frames >= self.samples
+
+    def means(self):
+        return {channel: self.totals[channel] / self.counts[channel]
+                for channel in self.channels if self.counts[channel]}
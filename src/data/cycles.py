@@ -0,0 +1,227 @@
+# src/data/cycles.py
+"""
+Revolution segmentation and per-cycle summary metrics
+
+CycleDetector unwraps the encoder angle, splits the stream at every full
+turn and summarizes each completed revolution in one row of a CycleTable,
+so trends over thousands of revolutions need one row per cycle instead of
+every raw sample.
+"""
+import numpy as np
+
+from ..sensors.channels import DEFAULT_SCHEMA
+from ..sensors.sample import RecordLog
+
+CYCLE_DTYPE = np.dtype([
+    ('cycle', np.int64),          # revolution number (unwrapped angle // 360)
+    ('start_time', np.float64),
+    ('end_time', np.float64),
+    ('samples', np.int32),
+    ('peak_torque', np.float64),
+    ('mean_torque', np.float64),
+    ('peak_preload', np.float64),
+    ('angle_at_peak', np.float64),  # degrees within the revolution
+    ('work', np.float64),           # ∫ torque dθ with θ in radians (J for Nm)
+])
+
+
+class CycleTable(RecordLog):
+    """Growable columnar table of cycle summaries"""
+
+    def __init__(self, initial_capacity=1024):
+        super().__init__(CYCLE_DTYPE, initial_capacity)
+
+    def append(self, rows):
+        """Append a structured array of CYCLE_DTYPE rows (single writer)"""
+        self.extend(rows)
+
+
+class CycleDetector:
+    """Incremental revolution detector over batches of synchronized samples"""
+
+    def __init__(self, table=None, max_pending=1_000_000, schema=DEFAULT_SCHEMA,
+                 batch_size=64, max_delay=0.05):
+        """
+        Args:
+            table: CycleTable receiving completed cycles (created if None)
+            max_pending: Samples kept for the revolution in progress; a
+                revolution that grows longer (e.g. while the rig stands
+                still) is dropped and detection resumes with the next one
+            schema: ChannelSchema of the frames passed to feed()
+            batch_size: Frames fed one at a time are processed once there
+                are this many...
+            max_delay: ...or once the oldest is this many seconds older
+                than the newest
+        """
+        self.table = table if table is not None else CycleTable()
+        self.max_pending = max_pending
+        self.schema = schema
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.cycles_dropped = 0
+        self._pending_frames = []
+        self._reset_requested = False
+        self.reset()
+
+    def reset(self):
+        """Forget the unwrap state and any partially collected revolution"""
+        self.last_raw_angle = None
+        self.last_unwrapped = 0.0
+        self.first_cycle = None
+        # Samples of the revolution in progress, carried between batches
+        self.pending = None
+        # Work of the revolution in progress from the interval it started in
+        self.entry_work = 0.0
+
+    def request_reset(self):
+        """Reset and clear the table before the next batch fed (any thread)"""
+        self._reset_requested = True
+
+    def feed(self, frame):
+        """Frame listener: buffer one frame and process full batches"""
+        pending = self._pending_frames
+        pending.append(frame)
+        if (len(pending) >= self.batch_size
+                or frame['timestamp'] - pending[0]['timestamp'] >= self.max_delay):
+            self.flush()
+
+    def flush(self):
+        """Process the frames buffered by feed()"""
+        frames, self._pending_frames = self._pending_frames, []
+        if self._reset_requested:
+            self._reset_requested = False
+            self.reset()
+            self.table.clear()
+        if frames and 'angle' in self.schema:
+            columns = self.schema.columns(self.schema.pack(frames))
+            missing = np.full(len(frames), np.nan)
+            self.process(*(columns.get(name, missing)
+                           for name in ('timestamp', 'angle', 'torque', 'preload')))
+
+    def process(self, timestamps, angles, torques, preloads):
+        """
+        Add a batch of samples and summarize any revolutions they complete
+
+        Args:
+            timestamps, angles, torques, preloads: 1-D arrays of equal length;
+                angles are encoder degrees wrapping at 360; samples without
+                a valid (finite) angle are skipped
+
+        Returns:
+            Structured array of the newly completed cycles
+        """
+        angles = np.asarray(angles, dtype=np.float64)
+        known = np.isfinite(angles)
+        if not known.all():
+            timestamps, angles, torques, preloads = (
+                np.asarray(column, dtype=np.float64)[known]
+                for column in (timestamps, angles, torques, preloads)
+            )
+        if angles.size == 0:
+            return np.zeros(0, dtype=CYCLE_DTYPE)
+
+        # Unwrap: any jump larger than half a turn is a wrap
+        if self.last_raw_angle is None:
+            self.last_raw_angle = self.last_unwrapped = angles[0]
+        previous = self.last_raw_angle
+        steps = np.diff(angles, prepend=previous)
+        steps[steps < -180.0] += 360.0
+        steps[steps > 180.0] -= 360.0
+        unwrapped = self.last_unwrapped + np.cumsum(steps)
+        self.last_raw_angle = angles[-1]
+        self.last_unwrapped = unwrapped[-1]
+
+        batch = np.stack([
+            np.asarray(timestamps, dtype=np.float64), unwrapped,
+            np.asarray(torques, dtype=np.float64), np.asarray(preloads, dtype=np.float64),
+        ])
+        if self.pending is not None:
+            batch = np.concatenate((self.pending, batch), axis=1)
+
+        cycle_ids = np.floor(batch[1] / 360.0).astype(np.int64)
+        if self.first_cycle is None:
+            # The revolution we started in is partial and never reported
+            self.first_cycle = cycle_ids[0] + 1
+
+        # Segment starts wherever the revolution number changes
+        starts = np.flatnonzero(np.diff(cycle_ids, prepend=cycle_ids[0] - 1))
+        # The last segment is still in progress
+        rows, self.entry_work = self._summarize(batch, cycle_ids, starts, self.entry_work)
+        self.pending = batch[:, starts[-1]:]
+        if self.pending.shape[1] > self.max_pending:
+            self.cycles_dropped += 1
+            self.first_cycle = max(self.first_cycle, cycle_ids[-1] + 1)
+            self.pending = None
+            self.entry_work = 0.0
+        rows = rows[:-1]
+        rows = rows[rows['cycle'] >= self.first_cycle]
+        if rows.size:
+            self.table.append(rows)
+        return rows
+
+    @staticmethod
+    def _summarize(data, cycle_ids, starts, entry_work=0.0):
+        """
+        Vectorized per-segment statistics
+
+        NaN torque or preload samples are left out of the statistics and
+        the work. The interval that crosses a revolution boundary is split
+        at the boundary, its torque there interpolated linearly.
+
+        Args:
+            entry_work: Work of the first segment from the boundary interval
+                before data (carried over from the previous batch)
+
+        Returns:
+            (rows for every segment, work the last segment got from the
+            boundary interval it starts in)
+        """
+        times, unwrapped, torque, preload = data
+        ends = np.append(starts[1:], cycle_ids.size)
+        counts = ends - starts
+        rows = np.zeros(starts.size, dtype=CYCLE_DTYPE)
+        rows['cycle'] = cycle_ids[starts]
+        rows['start_time'] = times[starts]
+        rows['end_time'] = times[ends - 1]
+        rows['samples'] = counts
+
+        known = np.isfinite(torque)
+        peak = np.fmax.reduceat(torque, starts)
+        rows['peak_torque'] = peak
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rows['mean_torque'] = (np.add.reduceat(np.where(known, torque, 0.0), starts)
+                                   / np.add.reduceat(known.astype(np.int64), starts))
+        rows['peak_preload'] = np.fmax.reduceat(preload, starts)
+
+        # First index in each segment where torque equals its segment peak
+        segment = np.repeat(np.arange(starts.size), counts)
+        at_peak = np.flatnonzero(torque == peak[segment])
+        angle_at_peak = np.full(starts.size, np.nan)
+        found, first = np.unique(segment[at_peak], return_index=True)
+        angle_at_peak[found] = np.mod(unwrapped[at_peak[first]], 360.0)
+        rows['angle_at_peak'] = angle_at_peak
+
+        # Trapezoidal ∫ torque dθ; intervals touching a NaN torque add nothing
+        radians = np.radians(unwrapped)
+        interval = np.diff(radians) * 0.5 * (torque[1:] + torque[:-1])
+        crossing = starts[1:] - 1
+        interval[crossing] = 0.0
+        work = np.bincount(segment[:-1], weights=np.nan_to_num(interval, nan=0.0),
+                           minlength=starts.size)
+
+        # Boundary intervals: the part before the boundary belongs to the
+        # ending revolution, the rest to the one starting
+        following = crossing + 1
+        boundary = np.radians(360.0 * np.maximum(cycle_ids[crossing], cycle_ids[following]))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            fraction = (boundary - radians[crossing]) / (radians[following] - radians[crossing])
+        torque_at_boundary = torque[crossing] + fraction * (torque[following] - torque[crossing])
+        before = (boundary - radians[crossing]) * 0.5 * (torque[crossing] + torque_at_boundary)
+        after = (radians[following] - boundary) * 0.5 * (torque_at_boundary + torque[following])
+        work[:-1] += np.nan_to_num(before, nan=0.0)
+        work[1:] += np.nan_to_num(after, nan=0.0)
+        work[0] += entry_work
+        rows['work'] = work
+        if after.size:
+            entry_work = float(np.nan_to_num(after[-1], nan=0.0))
+        return rows, entry_work
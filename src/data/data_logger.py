@@ -0,0 +1,364 @@
+# src/data/data_logger.py
+"""
+Compressed chunked logging of recorded sensor data
+
+A log file is a sequence of independent chunks, each holding a few
+thousand rows of every channel. Within a chunk each channel is encoded
+column-wise before general-purpose compression:
+
+    float64  lossless; each value's bit pattern XORed with the previous one,
+             so the unchanged sign/exponent/high mantissa bits become zeros
+    float32  cast to float32, then XORed like float64; lossy for anything
+             that is not already float32 (calibrated or filtered values),
+             so it is only used when asked for
+    fixed    rounded to integer multiples of `scale`, then delta encoded
+             `order` times (order 2 turns a steady sample clock into zeros)
+             and stored in the narrowest integer type that holds the deltas
+
+The encoded columns are byte-shuffled (all first bytes, then all second
+bytes, ...) and compressed with zlib or lzma. Every step is a whole-array
+NumPy operation; nothing runs per sample in Python.
+"""
+import lzma
+import os
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from ..sensors.channels import DEFAULT_SCHEMA
+
+MAGIC = b"SVL1"
+CHUNK_HEADER = struct.Struct("<4sBIBI")   # magic, compressor, rows, channels, payload bytes
+CHANNEL_HEADER = struct.Struct("<BBBdqq")  # kind, order, itemsize, scale, two anchors
+CHUNK_PREFIX = struct.Struct("<I")        # chunk length in the log file
+
+COMPRESSORS = {"none": 0, "zlib": 1, "lzma": 2}
+KINDS = {"float64": 0, "float32": 1, "fixed": 2}
+_KIND_NAMES = {code: name for name, code in KINDS.items()}
+_UNSIGNED = {1: np.uint8, 2: np.uint16, 4: np.uint32, 8: np.uint64}
+_SIGNED = {1: np.int8, 2: np.int16, 4: np.int32, 8: np.int64}
+
+
+class ChannelCodec:
+    """Encoding of one channel"""
+
+    def __init__(self, kind="float64", scale=1.0, order=1):
+        """
+        Args:
+            kind: "float64" (lossless), "float32" or "fixed"
+            scale: Quantization step for fixed (e.g. 1e-6 for microseconds)
+            order: Number of delta passes for fixed (1 or 2)
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown channel encoding: {kind}")
+        if kind == "fixed" and scale <= 0:
+            raise ValueError("scale must be positive")
+        if order not in (1, 2):
+            raise ValueError("order must be 1 or 2")
+        self.kind = kind
+        self.scale = float(scale)
+        self.order = int(order)
+
+    @classmethod
+    def from_config(cls, spec):
+        """Build a codec from {'type': kind, 'scale': ..., 'order': ...}"""
+        return cls(spec['type'], spec.get('scale', 1.0), spec.get('order', 1))
+
+    def encode(self, values):
+        """
+        Returns:
+            (header fields, encoded bytes)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        anchors = [0, 0]
+        if self.kind == "fixed":
+            data = np.rint(values / self.scale).astype(np.int64)
+            for _ in range(self.order):
+                data = np.diff(data, prepend=0)
+            # The first `order` deltas carry the absolute level; keep them
+            # aside so the rest can use a narrow integer type
+            head = min(self.order, data.size)
+            anchors[:head] = data[:head].tolist()
+            data[:head] = 0
+            data = data.astype(_narrowest(data))
+        else:
+            float_type = np.float64 if self.kind == "float64" else np.float32
+            bits = values.astype(float_type).view(_UNSIGNED[np.dtype(float_type).itemsize])
+            data = bits ^ np.concatenate((bits[:1] * 0, bits[:-1]))
+        fields = (KINDS[self.kind], self.order, data.dtype.itemsize, self.scale, *anchors)
+        return fields, _shuffle(data)
+
+    @staticmethod
+    def decode(fields, raw, rows):
+        """Inverse of encode for one channel's header fields and bytes"""
+        kind, order, itemsize, scale, first, second = fields
+        kind = _KIND_NAMES[kind]
+        if kind == "fixed":
+            data = _unshuffle(raw, np.dtype(_SIGNED[itemsize]), rows).astype(np.int64)
+            data[:min(order, rows)] = (first, second)[:min(order, rows)]
+            for _ in range(order):
+                data = np.cumsum(data)
+            return data * scale
+        bits = _unshuffle(raw, np.dtype(_UNSIGNED[itemsize]), rows)
+        # XOR is its own inverse: a running XOR restores the bit patterns
+        bits = np.bitwise_xor.accumulate(bits)
+        float_type = np.float64 if kind == "float64" else np.float32
+        return bits.view(float_type).astype(np.float64)
+
+
+def _narrowest(data):
+    """Smallest signed integer type holding every value"""
+    if data.size == 0:
+        return np.int8
+    low, high = int(data.min()), int(data.max())
+    for int_type in _SIGNED.values():
+        info = np.iinfo(int_type)
+        if info.min <= low and high <= info.max:
+            return int_type
+    return np.int64
+
+
+def _shuffle(data):
+    """Group the n-th bytes of all values together"""
+    return data.view(np.uint8).reshape(data.size, data.dtype.itemsize).T.tobytes()
+
+
+def _unshuffle(raw, dtype, rows):
+    planes = np.frombuffer(raw, dtype=np.uint8).reshape(dtype.itemsize, rows)
+    return np.ascontiguousarray(planes.T).view(dtype).ravel()
+
+
+def _compress(payload, compressor, level):
+    if compressor == "zlib":
+        return zlib.compress(payload, level)
+    if compressor == "lzma":
+        return lzma.compress(payload, preset=level)
+    return payload
+
+
+def _decompress(payload, compressor):
+    if compressor == COMPRESSORS["zlib"]:
+        return zlib.decompress(payload)
+    if compressor == COMPRESSORS["lzma"]:
+        return lzma.decompress(payload)
+    return payload
+
+
+def schema_codecs(schema, float32=False):
+    """
+    Default codecs for a channel schema: microsecond fixed-point timestamps
+    (device clocks count microseconds) and every channel stored losslessly
+
+    Args:
+        float32: Store channels the schema declares as 4-byte floats as
+            float32, halving their size. Only lossless for raw board values;
+            calibrated or filtered values lose precision.
+    """
+    codecs = {'timestamp': ChannelCodec("fixed", scale=1e-6, order=2)}
+    for channel in schema:
+        narrow = float32 and np.dtype(channel.dtype).itemsize <= 4
+        codecs[channel.name] = ChannelCodec("float32" if narrow else "float64")
+    return codecs
+
+
+DEFAULT_CODECS = schema_codecs(DEFAULT_SCHEMA)
+
+
+def encode_chunk(columns, codecs=None, compressor="zlib", level=6):
+    """
+    Encode one chunk
+
+    Args:
+        columns: Dictionary mapping channel name to a 1-D array (equal lengths)
+        codecs: Dictionary mapping channel name to a ChannelCodec; channels
+            without one are stored losslessly (default: DEFAULT_CODECS)
+        compressor: "zlib", "lzma" or "none"
+        level: Compression level (zlib 0-9, lzma preset 0-9)
+
+    Returns:
+        bytes of the chunk
+    """
+    if compressor not in COMPRESSORS:
+        raise ValueError(f"Unknown compressor: {compressor}")
+    codecs = DEFAULT_CODECS if codecs is None else codecs
+    lossless = ChannelCodec()
+    rows = len(next(iter(columns.values()))) if columns else 0
+
+    headers = []
+    parts = []
+    for name, values in columns.items():
+        if len(values) != rows:
+            raise ValueError("All channels of a chunk must have the same length")
+        fields, raw = codecs.get(name, lossless).encode(values)
+        encoded_name = name.encode()
+        headers.append(struct.pack("<B", len(encoded_name)) + encoded_name
+                       + CHANNEL_HEADER.pack(*fields))
+        parts.append(raw)
+
+    payload = _compress(b"".join(parts), compressor, level)
+    header = CHUNK_HEADER.pack(MAGIC, COMPRESSORS[compressor], rows, len(columns), len(payload))
+    return header + b"".join(headers) + payload
+
+
+def decode_chunk(data):
+    """
+    Decode a chunk produced by encode_chunk
+
+    Returns:
+        Dictionary mapping channel name to a float64 array
+    """
+    magic, compressor, rows, channels, length = CHUNK_HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a sensor log chunk")
+    offset = CHUNK_HEADER.size
+    layout = []
+    for _ in range(channels):
+        name_length = data[offset]
+        name = bytes(data[offset + 1:offset + 1 + name_length]).decode()
+        offset += 1 + name_length
+        fields = CHANNEL_HEADER.unpack_from(data, offset)
+        offset += CHANNEL_HEADER.size
+        layout.append((name, fields))
+
+    payload = _decompress(bytes(data[offset:offset + length]), compressor)
+    columns = {}
+    position = 0
+    for name, fields in layout:
+        size = rows * fields[2]
+        columns[name] = ChannelCodec.decode(fields, payload[position:position + size], rows)
+        position += size
+    return columns
+
+
+class DataLogger:
+    """Writes frames to a chunked, compressed log file"""
+
+    def __init__(self, path, channels=None, codecs=None, chunk_size=4096, compressor="zlib",
+                 level=6, flush_interval=10.0, schema=DEFAULT_SCHEMA):
+        """
+        Args:
+            path: Log file path (overwritten)
+            channels: Frame keys to record (default: timestamp and every
+                channel of the schema)
+            codecs: Per-channel ChannelCodec (default: schema_codecs(schema))
+            chunk_size: Rows per chunk
+            compressor: "zlib", "lzma" or "none"
+            level: Compression level
+            flush_interval: Seconds after which a partial chunk is written anyway,
+                bounding what a power cut can lose at low frame rates
+            schema: ChannelSchema of the logged frames
+        """
+        self.path = path
+        self.channels = ('timestamp',) + schema.names if channels is None else tuple(channels)
+        self.codecs = schema_codecs(schema) if codecs is None else codecs
+        self.chunk_size = chunk_size
+        self.compressor = compressor
+        self.level = level
+        self.flush_interval = flush_interval
+        self.last_flush = time.monotonic()
+
+        self.buffer = np.zeros((len(self.channels), chunk_size))
+        self.count = 0
+        self.rows_written = 0
+        self.bytes_written = 0
+        self.file = open(path, "wb")
+
+    def log_frame(self, frame):
+        """Add one frame (Sample or dictionary); missing channels are logged as NaN"""
+        column = self.buffer[:, self.count]
+        for index, name in enumerate(self.channels):
+            column[index] = frame.get(name, np.nan)
+        self.count += 1
+        if (self.count == self.chunk_size
+                or time.monotonic() - self.last_flush > self.flush_interval):
+            self.flush()
+
+    def log_batch(self, columns):
+        """Add rows given column-wise (dictionary of equal-length arrays)"""
+        data = np.array([columns[name] for name in self.channels], dtype=np.float64, ndmin=2)
+        start = 0
+        while start < data.shape[1]:
+            take = min(self.chunk_size - self.count, data.shape[1] - start)
+            self.buffer[:, self.count:self.count + take] = data[:, start:start + take]
+            self.count += take
+            start += take
+            if self.count == self.chunk_size:
+                self.flush()
+
+    def flush(self):
+        """Write the buffered rows as one chunk"""
+        self.last_flush = time.monotonic()
+        if self.count == 0:
+            return
+        chunk = encode_chunk(
+            {name: self.buffer[index, :self.count] for index, name in enumerate(self.channels)},
+            self.codecs, self.compressor, self.level
+        )
+        self.file.write(CHUNK_PREFIX.pack(len(chunk)) + chunk)
+        self.file.flush()
+        self.rows_written += self.count
+        self.bytes_written += CHUNK_PREFIX.size + len(chunk)
+        self.count = 0
+
+    def close(self):
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_chunks(path):
+    """Yield the decoded columns of each chunk of a log file"""
+    with open(path, "rb") as f:
+        while True:
+            prefix = f.read(CHUNK_PREFIX.size)
+            if len(prefix) < CHUNK_PREFIX.size:
+                return
+            (length,) = CHUNK_PREFIX.unpack(prefix)
+            chunk = f.read(length)
+            if len(chunk) < length:
+                # Truncated last chunk (e.g. power loss while writing)
+                return
+            yield decode_chunk(chunk)
+
+
+def count_rows(path):
+    """Rows of a log file, read from the chunk headers without decoding anything"""
+    rows = 0
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        while True:
+            prefix = f.read(CHUNK_PREFIX.size)
+            if len(prefix) < CHUNK_PREFIX.size:
+                return rows
+            (length,) = CHUNK_PREFIX.unpack(prefix)
+            start = f.tell()
+            if start + length > size:
+                # Truncated last chunk, skipped by iter_chunks too
+                return rows
+            magic, _, chunk_rows, _, _ = CHUNK_HEADER.unpack(f.read(CHUNK_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError("Not a sensor log chunk")
+            rows += chunk_rows
+            f.seek(start + length)
+
+
+def read_log(path):
+    """
+    Load a whole log file
+
+    Returns:
+        Dictionary mapping channel name to a float64 array
+    """
+    chunks = list(iter_chunks(path))
+    if not chunks:
+        return {}
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in chunks[0]}
@@ -4,6 +4,11 @@ import time
 import queue
 
 from ..sensors.sensor_manager import SensorManager
+from ..sensors.rig_registry import RigRegistry
+from ..sensors.async_engine import AsyncSensorManager
+from ..sensors.channels import DEFAULT_SCHEMA
+from ..sensors.sample import Sample
+from ..sensors.timing import SESSION_CLOCK
 
 
 class DataSource:
@@ -12,24 +17,67 @@ class DataSource:
     Handles data acquisition from multiple hardware sensors
     """
     
-    def __init__(self, data_queue, mode="hardware"):
+    def __init__(self, data_queue, mode="hardware", num_rigs=1, filter_stage=None,
+                 backend="threaded", decimation=None, schema=DEFAULT_SCHEMA, calibration=None):
         """
         Initialize the data source
         
         Args:
             data_queue: Queue to send data to the GUI
             mode: Data source mode (hardware, simulation, file)
+            num_rigs: Number of independent sensor sets (hardware mode only)
+            filter_stage: Optional FilterStage applied to every frame before it
+                is queued. Filters keep per-channel state, so it is only used
+                with a single rig.
+            backend: Sensor backend for a single rig: "threaded" (one thread
+                per sensor) or "asyncio" (all sensors on one event loop)
+            decimation: Optional DecimationStage reducing the frames sent to the
+                GUI; frame listeners (recorders) still get every frame. Like
+                filter_stage it is only used with a single rig.
+            schema: ChannelSchema generated in simulation mode; channels other
+                than angle, torque and preload get phase-shifted test signals
+            calibration: Optional CalibrationStage converting raw readings
+                before filter_stage; with several rigs each rig gets its own
+                copy, so tares are captured per rig
         """
         self.data_queue = data_queue
         self.mode = mode
+        self.schema = schema
+        self.calibration = calibration
+        self.filter_stage = filter_stage
+        self.decimation = decimation
+        self.frame_listeners = []
         self.running = False
         self.thread = None
         self.stop_event = threading.Event()
         
-        # Create sensor manager if using hardware
+        # Create sensor manager if using hardware. Several rigs share one
+        # registry so their synchronization runs on a pooled set of workers.
         self.sensor_manager = None
         if self.mode == "hardware":
-            self.sensor_manager = SensorManager(data_queue)
+            if num_rigs > 1:
+                self.sensor_manager = RigRegistry(data_queue)
+                for rig_id in range(num_rigs):
+                    self.sensor_manager.add_rig(
+                        rig_id, calibration=calibration.copy() if calibration is not None else None
+                    )
+            elif backend == "asyncio":
+                self.sensor_manager = AsyncSensorManager(
+                    data_queue, filter_stage=filter_stage, decimation=decimation,
+                    calibration=calibration
+                )
+            else:
+                self.sensor_manager = SensorManager(
+                    data_queue, filter_stage=filter_stage, decimation=decimation,
+                    calibration=calibration
+                )
+    
+    def add_frame_listener(self, callback):
+        """Register a callback receiving every full-rate frame (e.g. a recorder)"""
+        if hasattr(self.sensor_manager, 'add_frame_listener'):
+            self.sensor_manager.add_frame_listener(callback)
+        else:
+            self.frame_listeners.append(callback)
         
     def start(self):
         """Start the data source"""
@@ -99,23 +147,36 @@ class DataSource:
                     noise = random.uniform(-10, 10)
                     preload = base_preload + noise
                     
-                    data = {
-                        'timestamp': time.time(),
-                        'angle': angle,
-                        'torque': torque,
-                        'preload': preload
-                    }
+                    if self.schema == DEFAULT_SCHEMA:
+                        data = Sample(None, SESSION_CLOCK.now(), angle, torque, preload)
+                    else:
+                        standard = {'angle': angle, 'torque': torque, 'preload': preload}
+                        data = {'rig_id': None, 'timestamp': SESSION_CLOCK.now(),
+                                'valid': self.schema.all_valid}
+                        for index, name in enumerate(self.schema.names):
+                            data[name] = standard.get(name, 50 + 30 * math.sin(
+                                math.radians(angle + 15 * index)) + random.uniform(-2, 2))
                 elif self.mode == "file":
                     data = self._read_data_from_file()
                 else:
                     data = None
                 
                 if data:
-                    try:
-                        # Add data to queue with timeout
-                        self.data_queue.put(data, block=True, timeout=0.1)
-                    except queue.Full:
-                        print("Queue is full, skipping data point")
+                    if self.calibration is not None:
+                        data = self.calibration.process_frame(data)
+                    if self.filter_stage is not None:
+                        data = self.filter_stage.process_frame(data)
+                    
+                    for listener in self.frame_listeners:
+                        listener(data)
+                    frames = [data] if self.decimation is None else self.decimation.process_frame(data)
+                    
+                    for frame in frames:
+                        try:
+                            # Add data to queue with timeout
+                            self.data_queue.put(frame, block=True, timeout=0.1)
+                        except queue.Full:
+                            print("Queue is full, skipping data point")
                 
                 # Sleep until next reading
                 time.sleep(update_rate)
@@ -0,0 +1,207 @@
+# src/data/decimation.py
+"""
+Ingest-side decimation of the display stream
+
+A DecimationStage turns the full-rate frame stream into a reduced display
+stream: every block of `factor` frames becomes one output frame (two in
+min/max mode). Each channel is reduced with its own method:
+
+    boxcar     block mean (boxcar anti-alias filter, then downsample)
+    polyphase  windowed-sinc lowpass evaluated only at the kept positions,
+               the polyphase form of filter-then-downsample
+    minmax     block minimum and maximum in time order, so spikes and peaks
+               survive decimation on the plot
+    pick       one raw sample per block, for channels that must not be
+               averaged (e.g. the wrapping encoder angle)
+
+All channels share one timeline, so the factor applies to the whole stage.
+Like the filters, the stage keeps its state between calls: feeding frames
+in chunks of any size gives exactly the same output as feeding them at once.
+"""
+import numbers
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..sensors.channels import DEFAULT_SCHEMA
+from ..sensors.sample import Sample
+
+METHODS = ("boxcar", "polyphase", "minmax", "pick")
+
+
+def lowpass_taps(factor, taps_per_side):
+    """
+    Linear-phase anti-alias FIR for decimation by `factor`
+
+    The filter spans one block plus `taps_per_side` samples on either side,
+    so it is centered on the block it replaces.
+
+    Returns:
+        Taps normalized to unit DC gain
+    """
+    length = factor + 2 * taps_per_side
+    offsets = np.arange(length) - (length - 1) / 2
+    cutoff = 0.5 / factor  # new Nyquist frequency in cycles per input sample
+    taps = 2 * cutoff * np.sinc(2 * cutoff * offsets) * np.hamming(length)
+    return taps / taps.sum()
+
+
+class DecimationStage:
+    """
+    Reduces a stream of frames by a fixed factor, channel by channel
+    """
+
+    def __init__(self, factor, method="boxcar", channel_methods=None, taps_per_side=None):
+        """
+        Args:
+            factor: Input frames per output block
+            method: Reduction used for channels not listed in channel_methods
+            channel_methods: Dictionary mapping channel name to a method
+            taps_per_side: Extra FIR taps on each side of a block for the
+                polyphase method (default: 3 * factor)
+        """
+        if factor < 1:
+            raise ValueError("factor must be at least 1")
+        self.factor = int(factor)
+        self.method = method
+        self.channel_methods = dict(channel_methods or {})
+        for name in (method, *self.channel_methods.values()):
+            if name not in METHODS:
+                raise ValueError(f"Unknown decimation method: {name}")
+
+        self.taps_per_side = 3 * self.factor if taps_per_side is None else int(taps_per_side)
+        self.taps = lowpass_taps(self.factor, self.taps_per_side)
+        self.reset()
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Build a stage from a configuration dictionary
+
+        Args:
+            config: Dictionary with 'factor' and optional 'method',
+                'channels' (channel name to method) and 'taps_per_side'
+
+        Returns:
+            DecimationStage instance
+        """
+        return cls(config['factor'], config.get('method', "boxcar"),
+                   config.get('channels'), config.get('taps_per_side'))
+
+    def reset(self):
+        """Drop any partially collected block"""
+        self.pending = None
+        self.template = None
+
+    def method_for(self, channel):
+        return self.channel_methods.get(channel, self.method)
+
+    def _uses(self, method, channels):
+        return any(self.method_for(channel) == method for channel in channels)
+
+    def process_batch(self, columns):
+        """
+        Decimate frames stored column-wise
+
+        Args:
+            columns: Dictionary mapping channel name to a 1-D array; must
+                include 'timestamp'
+
+        Returns:
+            Dictionary of decimated columns (empty arrays while a block is
+            still being collected)
+        """
+        columns = {name: np.asarray(values, dtype=np.float64) for name, values in columns.items()}
+        channels = [name for name in columns if name != 'timestamp']
+        # Polyphase channels need samples on both sides of each block
+        margin = self.taps_per_side if self._uses("polyphase", channels) else 0
+
+        if self.pending is None:
+            # Start as if the first frame had been held forever
+            self.pending = {
+                name: np.full(margin, values[0] if values.size else 0.0)
+                for name, values in columns.items()
+            }
+        pending = {name: np.concatenate((self.pending[name], columns[name])) for name in columns}
+
+        count = pending['timestamp'].size
+        blocks = max(0, (count - 2 * margin) // self.factor)
+        # Keep the unprocessed tail plus the history the next block needs
+        consumed = blocks * self.factor
+        self.pending = {name: values[consumed:].copy() for name, values in pending.items()}
+
+        per_block = 2 if self._uses("minmax", channels) else 1
+        out = {}
+        times = self._blocks(pending['timestamp'], margin, blocks)
+        if per_block == 2:
+            out['timestamp'] = np.stack((times[:, 0], times[:, -1]), axis=1).ravel()
+        else:
+            out['timestamp'] = times.mean(axis=1)
+
+        for name in channels:
+            values = self._reduce(self.method_for(name), pending[name], margin, blocks)
+            if values.size == blocks and per_block == 2:
+                values = np.repeat(values, 2)
+            out[name] = values
+        return out
+
+    def _blocks(self, values, margin, blocks):
+        """(blocks, factor) view of the complete blocks"""
+        return values[margin:margin + blocks * self.factor].reshape(blocks, self.factor)
+
+    def _reduce(self, method, values, margin, blocks):
+        if method == "boxcar":
+            return self._blocks(values, margin, blocks).mean(axis=1)
+        if method == "pick":
+            return self._blocks(values, margin, blocks)[:, self.factor // 2].copy()
+        if method == "minmax":
+            block = self._blocks(values, margin, blocks)
+            rows = np.arange(blocks)
+            low, high = block.argmin(axis=1), block.argmax(axis=1)
+            first = np.where(low <= high, low, high)
+            second = np.where(low <= high, high, low)
+            return np.stack((block[rows, first], block[rows, second]), axis=1).ravel()
+        # polyphase: one filter window per block, none for the dropped samples
+        start = margin - self.taps_per_side
+        windows = sliding_window_view(values[start:], self.taps.size)[:blocks * self.factor:self.factor]
+        return windows @ self.taps
+
+    def process_frames(self, frames):
+        """
+        Decimate a list of frames (Sample objects or dictionaries)
+
+        Non-numeric fields such as rig_id and the valid mask are copied from
+        the latest frame; a Sample's valid bits are recomputed from the
+        reduced values.
+
+        Returns:
+            List of output frames, of the same type as the input
+        """
+        frames = [frame for frame in frames if frame]
+        if not frames:
+            return []
+        if self.template is None:
+            self.template = frames[0]
+        names = [
+            name for name in self.template.keys()
+            if name not in ('rig_id', 'valid') and isinstance(self.template[name], numbers.Real)
+        ]
+        columns = {name: [frame.get(name, 0.0) for frame in frames] for name in names}
+        self.template = frames[-1]
+
+        reduced = self.process_batch(columns)
+        # Valid bits of all output frames at once, then plain Python values
+        masks = DEFAULT_SCHEMA.valid_masks(reduced).tolist()
+        outputs = []
+        for values, mask in zip(zip(*(reduced[name].tolist() for name in names)), masks):
+            frame = self.template.copy()
+            for name, value in zip(names, values):
+                frame[name] = value
+            if isinstance(frame, Sample):
+                frame.valid = mask
+            outputs.append(frame)
+        return outputs
+
+    def process_frame(self, frame):
+        """Decimate one frame; returns the (possibly empty) list of output frames"""
+        return self.process_frames([frame])
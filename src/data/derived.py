@@ -0,0 +1,258 @@
+# src/data/derived.py
+"""
+Derived channels computed from the measured ones
+
+A derived channel is a vectorized function of base channels or of other
+derived channels, e.g. power = torque * angular velocity. Stateful
+channels (finite-difference derivatives) carry their last sample between
+batches, so the result does not depend on how the stream is chunked.
+
+Nothing is computed for a channel nobody has subscribed to. Each batch
+is wrapped in a DerivedBatch, which computes a derived column the first
+time a consumer asks for it and returns the cached column after that, so
+a plot, an alert and an export reading the same channel share one
+evaluation. Only stateful channels are evaluated eagerly, because they
+must see every batch to keep their state.
+"""
+import abc
+import copy
+import itertools
+import threading
+
+import numpy as np
+
+from ..sensors.channels import Channel
+
+
+class DerivedChannel(abc.ABC):
+    """Base class for a channel computed from other channels"""
+
+    # Stateful channels must see every batch while subscribed
+    stateful = False
+
+    def __init__(self, name, unit, inputs, label=None):
+        """
+        Args:
+            name: Channel name
+            unit: Unit of the computed values
+            inputs: Names of the channels the values are computed from
+            label: Display label (default: the name)
+        """
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.channel = Channel(name, unit, "f8", None, label)
+
+    @abc.abstractmethod
+    def compute(self, timestamps, *inputs):
+        """
+        Compute a batch
+
+        Args:
+            timestamps: 1-D array of frame timestamps (seconds)
+            inputs: One 1-D array per input channel
+
+        Returns:
+            1-D float64 array, NaN where the value is undefined
+        """
+
+    def reset(self):
+        """Forget the state carried from previous batches"""
+
+
+class ExpressionChannel(DerivedChannel):
+    """Stateless element-wise function of its inputs"""
+
+    def __init__(self, name, unit, inputs, function, label=None):
+        """
+        Args:
+            function: Vectorized callable taking one array per input
+        """
+        super().__init__(name, unit, inputs, label)
+        self.function = function
+
+    def compute(self, timestamps, *inputs):
+        # Division by zero or NaN inputs give NaN/inf rather than warnings
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.asarray(self.function(*inputs), dtype=np.float64)
+
+
+class DerivativeChannel(DerivedChannel):
+    """Backward finite-difference time derivative of one channel"""
+
+    stateful = True
+
+    def __init__(self, name, unit, source, scale=1.0, wrap=None, label=None):
+        """
+        Args:
+            source: Channel to differentiate
+            scale: Factor applied to the derivative (e.g. degrees to radians)
+            wrap: Period of a wrapping source (360 for encoder degrees); steps
+                are unwrapped into (-wrap/2, wrap/2] before differencing
+        """
+        super().__init__(name, unit, (source,), label)
+        self.scale = float(scale)
+        self.wrap = wrap
+        self.reset()
+
+    def reset(self):
+        self._last_value = np.nan
+        self._last_time = np.nan
+
+    def compute(self, timestamps, values):
+        values = np.asarray(values, dtype=np.float64)
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if values.size == 0:
+            return np.zeros(0)
+        history = np.concatenate(([self._last_value], values))
+        times = np.concatenate(([self._last_time], timestamps))
+
+        # Difference against the previous finite sample, so gaps are bridged
+        previous = np.where(np.isfinite(history), np.arange(history.size), 0)
+        np.maximum.accumulate(previous, out=previous)
+        last = previous[-1]
+        previous = previous[:-1]
+
+        steps = values - history[previous]
+        if self.wrap is not None:
+            steps = np.mod(steps + self.wrap / 2.0, self.wrap) - self.wrap / 2.0
+        intervals = timestamps - times[previous]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = np.where(intervals > 0, steps * self.scale / intervals, np.nan)
+        self._last_value = history[last]
+        self._last_time = times[last]
+        return out
+
+
+STANDARD_DERIVED = (
+    DerivativeChannel('angular_velocity', 'rad/s', 'angle', scale=np.pi / 180.0, wrap=360.0,
+                      label="Angular Velocity"),
+    DerivativeChannel('angular_acceleration', 'rad/s²', 'angular_velocity',
+                      label="Angular Acceleration"),
+    ExpressionChannel('power', 'W', ('torque', 'angular_velocity'), np.multiply, label="Power"),
+    ExpressionChannel('torque_preload_ratio', 'm', ('torque', 'preload'), np.divide,
+                      label="Torque/Preload"),
+)
+
+
+class DerivedEngine:
+    """Subscriptions to derived channels and their evaluation per batch"""
+
+    def __init__(self, definitions=STANDARD_DERIVED):
+        """
+        Args:
+            definitions: DerivedChannel definitions; inputs that are not
+                defined here must be base channels of the batches. Each
+                engine works on its own copies, so engines sharing
+                definitions (e.g. STANDARD_DERIVED) never share state.
+        """
+        self.definitions = {}
+        for definition in definitions:
+            definition = copy.copy(definition)
+            definition.reset()
+            self.definitions[definition.name] = definition
+        self.subscriptions = {}
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+        # Active definitions in dependency order, replaced as a whole
+        self.active = ()
+        self.evaluations = 0
+
+    def channels(self, names):
+        """Channel descriptions of derived channels (for plots and schemas)"""
+        return [self.definitions[name].channel for name in names]
+
+    def subscribe(self, name):
+        """
+        Start computing a derived channel (and what it depends on)
+
+        Returns:
+            Token for unsubscribe()
+        """
+        if name not in self.definitions:
+            raise KeyError(f"Unknown derived channel: {name}")
+        with self._lock:
+            token = next(self._tokens)
+            self.subscriptions[token] = name
+            self._update_active()
+        return token
+
+    def unsubscribe(self, token):
+        """Stop a subscription; channels nobody needs any more are dropped"""
+        with self._lock:
+            self.subscriptions.pop(token, None)
+            self._update_active()
+
+    def process(self, columns):
+        """
+        Wrap a batch for its consumers
+
+        Args:
+            columns: Dictionary mapping timestamp and the base channels to 1-D arrays
+
+        Returns:
+            DerivedBatch giving the base and the subscribed derived columns
+        """
+        batch = DerivedBatch(self, columns, self.active)
+        for definition in batch.active:
+            if definition.stateful:
+                batch[definition.name]
+        return batch
+
+    def reset(self):
+        """Reset every stateful channel (e.g. when the data is cleared)"""
+        for definition in self.definitions.values():
+            definition.reset()
+
+    def _update_active(self):
+        ordered = []
+        visiting = set()
+
+        def visit(name):
+            definition = self.definitions.get(name)
+            if definition is None or definition in ordered:
+                return
+            if name in visiting:
+                raise ValueError(f"Derived channel {name} depends on itself")
+            visiting.add(name)
+            for source in definition.inputs:
+                visit(source)
+            ordered.append(definition)
+
+        for name in self.subscriptions.values():
+            visit(name)
+        # A stateful channel joining the stream starts without history
+        for definition in ordered:
+            if definition.stateful and definition not in self.active:
+                definition.reset()
+        self.active = tuple(ordered)
+
+
+class DerivedBatch:
+    """One batch's base columns plus its lazily computed derived columns"""
+
+    def __init__(self, engine, columns, active):
+        self.engine = engine
+        self.columns = columns
+        self.active = active
+        self._names = {definition.name: definition for definition in active}
+        self._cache = {}
+
+    def __contains__(self, name):
+        return name in self.columns or name in self._names
+
+    def __getitem__(self, name):
+        if name in self.columns:
+            return self.columns[name]
+        values = self._cache.get(name)
+        if values is None:
+            definition = self._names.get(name)
+            if definition is None:
+                raise KeyError(f"{name} is neither a base channel nor a subscribed derived channel")
+            inputs = [self[source] for source in definition.inputs]
+            values = definition.compute(self.columns['timestamp'], *inputs)
+            self._cache[name] = values
+            self.engine.evaluations += 1
+        return values
+
+    def keys(self):
+        return list(self.columns) + list(self._names)
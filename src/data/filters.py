@@ -0,0 +1,293 @@
+# src/data/filters.py
+"""
+Streaming digital filters for sensor channels
+
+Every filter keeps its state between calls, so feeding a signal in chunks
+of any size gives exactly the same output as feeding it all at once.
+"""
+import abc
+import math
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+class StreamFilter(abc.ABC):
+    """Base class for stateful batch filters"""
+
+    @abc.abstractmethod
+    def process(self, batch):
+        """
+        Filter a batch of samples
+
+        Args:
+            batch: 1-D array-like of samples, oldest first
+
+        Returns:
+            numpy array of filtered samples, same length as batch
+        """
+
+    @abc.abstractmethod
+    def reset(self):
+        """Forget all state carried from previous batches"""
+
+
+class _WindowFilter(StreamFilter):
+    """Shared history handling for filters over a fixed window of samples"""
+
+    def __init__(self, window):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = int(window)
+        self.history = None
+
+    def reset(self):
+        self.history = None
+
+    def _windows(self, batch):
+        """Return a (len(batch), window) view over history + batch"""
+        batch = np.asarray(batch, dtype=np.float64)
+        if self.history is None:
+            # Start as if the first sample had been held forever
+            self.history = np.full(self.window - 1, batch[0] if batch.size else 0.0)
+        extended = np.concatenate((self.history, batch))
+        self.history = extended[extended.size - (self.window - 1):].copy()
+        return sliding_window_view(extended, self.window)
+
+    def process(self, batch):
+        if len(batch) == 0:
+            return np.empty(0)
+        return self._reduce(self._windows(batch))
+
+    @abc.abstractmethod
+    def _reduce(self, windows):
+        """Reduce each row of a (samples, window) array to one output sample"""
+
+
+class MovingAverageFilter(_WindowFilter):
+    """Boxcar average over the last `window` samples"""
+
+    def _reduce(self, windows):
+        # Each output only depends on its own window, never on a running sum
+        return windows.mean(axis=1)
+
+
+class MedianFilter(_WindowFilter):
+    """Running median over the last `window` samples (spike rejection)"""
+
+    def _reduce(self, windows):
+        return np.median(windows, axis=1)
+
+
+class BiquadFilter(StreamFilter):
+    """
+    Second-order IIR section in transposed direct form II
+
+    Recursive filters are inherently sequential, so the sample loop runs
+    over plain Python floats, which is far cheaper than per-sample NumPy
+    operations at these batch sizes.
+    """
+
+    def __init__(self, b, a):
+        """
+        Args:
+            b: Numerator coefficients (b0, b1, b2)
+            a: Denominator coefficients (a0, a1, a2)
+        """
+        a0 = float(a[0])
+        self.b0, self.b1, self.b2 = (float(v) / a0 for v in b)
+        self.a1, self.a2 = float(a[1]) / a0, float(a[2]) / a0
+        self.z1 = 0.0
+        self.z2 = 0.0
+        self.primed = False
+
+    @classmethod
+    def lowpass(cls, sample_rate, cutoff, q=1 / math.sqrt(2)):
+        """Butterworth-style low-pass (RBJ audio cookbook)"""
+        w0 = 2 * math.pi * cutoff / sample_rate
+        alpha = math.sin(w0) / (2 * q)
+        cos_w0 = math.cos(w0)
+        b = ((1 - cos_w0) / 2, 1 - cos_w0, (1 - cos_w0) / 2)
+        a = (1 + alpha, -2 * cos_w0, 1 - alpha)
+        return cls(b, a)
+
+    @classmethod
+    def notch(cls, sample_rate, center, q=30.0):
+        """Narrow band-stop, e.g. for mains hum (RBJ audio cookbook)"""
+        w0 = 2 * math.pi * center / sample_rate
+        alpha = math.sin(w0) / (2 * q)
+        cos_w0 = math.cos(w0)
+        b = (1, -2 * cos_w0, 1)
+        a = (1 + alpha, -2 * cos_w0, 1 - alpha)
+        return cls(b, a)
+
+    def reset(self):
+        self.z1 = 0.0
+        self.z2 = 0.0
+        self.primed = False
+
+    def _prime(self, x0):
+        """Set the state to the steady state for a constant input x0"""
+        dc_gain = (self.b0 + self.b1 + self.b2) / (1 + self.a1 + self.a2)
+        y0 = dc_gain * x0
+        self.z2 = self.b2 * x0 - self.a2 * y0
+        self.z1 = self.b1 * x0 - self.a1 * y0 + self.z2
+        self.primed = True
+
+    def process(self, batch):
+        samples = np.asarray(batch, dtype=np.float64).tolist()
+        if not samples:
+            return np.empty(0)
+        if not self.primed:
+            self._prime(samples[0])
+
+        b0, b1, b2, a1, a2 = self.b0, self.b1, self.b2, self.a1, self.a2
+        z1, z2 = self.z1, self.z2
+        out = [0.0] * len(samples)
+        for i, x in enumerate(samples):
+            y = b0 * x + z1
+            z1 = b1 * x - a1 * y + z2
+            z2 = b2 * x - a2 * y
+            out[i] = y
+        self.z1, self.z2 = z1, z2
+        return np.array(out)
+
+
+class EWMAFilter(BiquadFilter):
+    """Exponentially weighted moving average: y[n] = a*x[n] + (1-a)*y[n-1]"""
+
+    def __init__(self, alpha):
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        self.alpha = alpha
+        super().__init__(b=(alpha, 0.0, 0.0), a=(1.0, alpha - 1.0, 0.0))
+
+
+class FilterChain(StreamFilter):
+    """Several filters applied one after another"""
+
+    def __init__(self, filters):
+        self.filters = list(filters)
+
+    def process(self, batch):
+        out = np.asarray(batch, dtype=np.float64)
+        for stage in self.filters:
+            out = stage.process(out)
+        return out
+
+    def reset(self):
+        for stage in self.filters:
+            stage.reset()
+
+
+def create_filter(spec, sample_rate):
+    """
+    Build a filter from a configuration dictionary
+
+    Args:
+        spec: Dictionary with a 'type' key (moving_average, median, ewma,
+            lowpass, notch) and the parameters for that type
+        sample_rate: Channel sample rate in Hz (needed for lowpass/notch)
+
+    Returns:
+        StreamFilter instance
+    """
+    kind = spec['type']
+    if kind == "moving_average":
+        return MovingAverageFilter(spec['window'])
+    if kind == "median":
+        return MedianFilter(spec['window'])
+    if kind == "ewma":
+        return EWMAFilter(spec['alpha'])
+    if kind == "lowpass":
+        return BiquadFilter.lowpass(sample_rate, spec['cutoff'], spec.get('q', 1 / math.sqrt(2)))
+    if kind == "notch":
+        return BiquadFilter.notch(sample_rate, spec['center'], spec.get('q', 30.0))
+    raise ValueError(f"Unknown filter type: {kind}")
+
+
+class FilterStage:
+    """
+    Per-channel filtering between the data producers and their consumers
+
+    Channels without a configured filter pass through unchanged.
+    """
+
+    def __init__(self, channel_filters=None):
+        """
+        Args:
+            channel_filters: Dictionary mapping channel name to a StreamFilter
+                or a list of StreamFilters applied in order
+        """
+        self.channel_filters = {}
+        for channel, filters in (channel_filters or {}).items():
+            self.set_filter(channel, filters)
+
+    @classmethod
+    def from_config(cls, config, sample_rate):
+        """
+        Build a stage from a configuration dictionary
+
+        Args:
+            config: Dictionary mapping channel name to a list of filter specs
+                (see create_filter)
+            sample_rate: Sample rate in Hz shared by the channels
+
+        Returns:
+            FilterStage instance
+        """
+        return cls({
+            channel: [create_filter(spec, sample_rate) for spec in specs]
+            for channel, specs in config.items()
+        })
+
+    def set_filter(self, channel, filters):
+        """Attach a filter (or list of filters) to a channel"""
+        if isinstance(filters, (list, tuple)):
+            filters = FilterChain(filters)
+        self.channel_filters[channel] = filters
+
+    def reset(self):
+        """Reset the state of every channel filter"""
+        for channel_filter in self.channel_filters.values():
+            channel_filter.reset()
+
+    def process_batch(self, columns):
+        """
+        Filter a batch of frames stored column-wise
+
+        Args:
+            columns: Dictionary mapping channel name to a 1-D array
+
+        Returns:
+            New dictionary with filtered channels replaced; NaN samples
+            pass through and are skipped by the filter, as in process_frame
+        """
+        out = dict(columns)
+        for channel, channel_filter in self.channel_filters.items():
+            if channel not in out:
+                continue
+            values = np.asarray(out[channel], dtype=np.float64)
+            known = ~np.isnan(values)
+            if known.all():
+                out[channel] = channel_filter.process(values)
+            else:
+                filtered = values.copy()
+                filtered[known] = channel_filter.process(values[known])
+                out[channel] = filtered
+        return out
+
+    def process_frame(self, frame):
+        """
+        Filter a single frame (a dictionary or a Sample from SensorManager)
+
+        Returns:
+            New frame of the same type with filtered channel values
+        """
+        out = frame.copy()
+        for channel, channel_filter in self.channel_filters.items():
+            # A NaN (channel missing from a partial frame) would poison the
+            # filter state, so it passes through and the filter holds
+            if channel in out and out[channel] == out[channel]:
+                out[channel] = float(channel_filter.process((out[channel],))[0])
+        return out
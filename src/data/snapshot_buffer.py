@@ -0,0 +1,121 @@
+# src/data/snapshot_buffer.py
+"""
+Append-only column buffer with versioned, zero-copy snapshots
+
+One thread appends samples and publishes; any other thread can grab the
+latest published Snapshot at any time without locking. A published
+snapshot is never modified afterwards: the writer only ever writes past
+the end of the published region, and when the storage fills up it moves
+the live tail into a freshly allocated array instead of overwriting the
+old one, so readers still holding views keep seeing consistent data.
+"""
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+# version: increases on every publish; columns: channel name -> 1-D view;
+# length: number of samples in every column
+Snapshot = namedtuple('Snapshot', ['version', 'columns', 'length'])
+
+
+class SnapshotBuffer:
+    """Column store for a rolling window of samples with race-free snapshots"""
+
+    def __init__(self, channels, capacity=1000, dtype=np.float64):
+        """
+        Initialize the buffer
+
+        Args:
+            channels: Sequence of channel names, in the order rows are appended
+            capacity: Largest window (in samples) that can be published
+            dtype: Storage dtype for all channels
+        """
+        self.channels = tuple(channels)
+        self.capacity = capacity
+        self.dtype = dtype
+
+        # Serializes writers (append/publish/clear); readers never take it
+        self._write_lock = threading.Lock()
+        self._allocate()
+        self._snapshot = self._empty_snapshot(0)
+
+    def _allocate(self):
+        # Twice the capacity so compaction happens at most every `capacity` appends
+        self._store = np.empty((len(self.channels), 2 * self.capacity), dtype=self.dtype)
+        self._end = 0
+
+    def _empty_snapshot(self, version):
+        empty = np.empty((len(self.channels), 0), dtype=self.dtype)
+        return Snapshot(version, dict(zip(self.channels, empty)), 0)
+
+    def __len__(self):
+        return self._end
+
+    def append(self, row):
+        """
+        Append one sample (not visible to readers until publish())
+
+        Args:
+            row: Sequence of values in channel order
+        """
+        with self._write_lock:
+            if self._end == self._store.shape[1]:
+                self._compact()
+            self._store[:, self._end] = row
+            self._end += 1
+
+    def extend(self, rows):
+        """
+        Append several samples at once
+
+        Args:
+            rows: 2-D array-like shaped (samples, channels)
+        """
+        rows = np.asarray(rows, dtype=self.dtype)
+        with self._write_lock:
+            for block_start in range(0, len(rows), self.capacity):
+                block = rows[block_start:block_start + self.capacity]
+                if self._end + len(block) > self._store.shape[1]:
+                    self._compact()
+                self._store[:, self._end:self._end + len(block)] = block.T
+                self._end += len(block)
+
+    def _compact(self):
+        """Move the newest `capacity` samples into new storage"""
+        keep = min(self.capacity, self._end)
+        old = self._store
+        old_end = self._end
+        self._allocate()
+        self._store[:, :keep] = old[:, old_end - keep:old_end]
+        self._end = keep
+
+    def publish(self, window=None):
+        """
+        Make the newest samples visible to readers
+
+        Args:
+            window: Number of most recent samples to expose (default: capacity)
+
+        Returns:
+            The published Snapshot
+        """
+        with self._write_lock:
+            window = min(window or self.capacity, self.capacity, self._end)
+            view = self._store[:, self._end - window:self._end]
+            snapshot = Snapshot(
+                self._snapshot.version + 1, dict(zip(self.channels, view)), view.shape[1]
+            )
+            # A single reference assignment is atomic for readers
+            self._snapshot = snapshot
+            return snapshot
+
+    def snapshot(self):
+        """Latest published Snapshot (safe from any thread, no copy)"""
+        return self._snapshot
+
+    def clear(self):
+        """Drop all samples and publish an empty snapshot"""
+        with self._write_lock:
+            self._allocate()
+            self._snapshot = self._empty_snapshot(self._snapshot.version + 1)
@@ -0,0 +1,285 @@
+# src/data/spc.py
+"""
+Statistical process control per angle bin
+
+A fixed torque threshold cannot tell a curve that is normal for its angle
+from one that is within limits but abnormal there. AngleBinModel learns
+the mean and variance of a channel in every angle bin from baseline
+revolutions; SPCMonitor then scores each sample against the control
+limits of its bin (mean ± sigma standard deviations) and summarizes every
+revolution, optionally raising an AlertManager alert for revolutions out
+of control.
+
+Learning and scoring are vectorized over a batch (bincount per bin and a
+parallel merge of the running moments), so each batch costs O(batch) and
+the state is a few arrays of one value per bin whatever the stream length.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from ..sensors.channels import DEFAULT_SCHEMA
+
+# Summary of one scored revolution
+CycleScore = namedtuple('CycleScore', ['revolution', 'start_time', 'end_time', 'samples',
+                                       'violations', 'max_score'])
+
+
+class AngleBinModel:
+    """Running mean and variance of one channel in each angle bin"""
+
+    def __init__(self, bins=360):
+        """
+        Args:
+            bins: Number of equal angle bins per revolution
+        """
+        self.bins = bins
+        self.reset()
+
+    def reset(self):
+        self.count = np.zeros(self.bins, dtype=np.int64)
+        self.mean = np.zeros(self.bins)
+        # Sum of squared deviations from the mean
+        self.m2 = np.zeros(self.bins)
+
+    def bin_index(self, angles):
+        """Bin of each angle (degrees, any number of turns)"""
+        index = (np.mod(angles, 360.0) * (self.bins / 360.0)).astype(np.intp)
+        # mod() can round a tiny negative angle up to exactly 360
+        return np.minimum(index, self.bins - 1)
+
+    def update(self, angles, values):
+        """Add a batch of samples (NaN angles or values are ignored)"""
+        angles = np.asarray(angles, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        known = np.isfinite(angles) & np.isfinite(values)
+        if not known.any():
+            return
+        index = self.bin_index(angles[known])
+        values = values[known]
+
+        counts = np.bincount(index, minlength=self.bins)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            batch_mean = np.where(counts > 0,
+                                  np.bincount(index, weights=values, minlength=self.bins) / counts,
+                                  0.0)
+        deviation = values - batch_mean[index]
+        batch_m2 = np.bincount(index, weights=deviation * deviation, minlength=self.bins)
+
+        # Merge the batch moments into the running ones (Chan et al.)
+        total = self.count + counts
+        delta = batch_mean - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            weight = np.where(total > 0, counts / np.maximum(total, 1), 0.0)
+        self.mean += delta * weight
+        self.m2 += batch_m2 + delta * delta * self.count * weight
+        self.count = total
+
+    @property
+    def variance(self):
+        """Sample variance per bin (NaN with fewer than two samples)"""
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 1, self.m2 / np.maximum(self.count - 1, 1), np.nan)
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def limits(self, sigma=3.0):
+        """Lower and upper control limit per bin"""
+        std = self.std
+        return self.mean - sigma * std, self.mean + sigma * std
+
+    def score(self, angles, values, min_count=5, min_std=1e-6):
+        """
+        Deviation of each sample from its bin mean, in standard deviations
+
+        Args:
+            min_count: Bins with fewer baseline samples give NaN
+            min_std: Floor of the standard deviation, so a bin that never
+                varied does not divide by zero
+
+        Returns:
+            1-D array of signed scores (NaN where unknown)
+        """
+        angles = np.asarray(angles, dtype=np.float64)
+        values = np.asarray(values, dtype=np.float64)
+        index = self.bin_index(np.where(np.isfinite(angles), angles, 0.0))
+        std = np.fmax(self.std, min_std)
+        with np.errstate(invalid="ignore"):
+            scores = (values - self.mean[index]) / std[index]
+        scores[~np.isfinite(angles) | (self.count[index] < min_count)] = np.nan
+        return scores
+
+    def save(self, path):
+        """Write the model as .npz data (to path exactly, whatever its extension)"""
+        with open(path, "wb") as f:
+            np.savez(f, count=self.count, mean=self.mean, m2=self.m2)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            model = cls(len(data['count']))
+            model.count = data['count'].astype(np.int64)
+            model.mean = data['mean'].astype(np.float64)
+            model.m2 = data['m2'].astype(np.float64)
+        return model
+
+
+class SPCMonitor:
+    """Learns a baseline from the first revolutions, then scores the rest"""
+
+    def __init__(self, channel='torque', model=None, baseline_revolutions=20, sigma=3.0,
+                 min_count=5, min_violations=1, alert_manager=None, schema=DEFAULT_SCHEMA,
+                 batch_size=64, max_delay=0.05):
+        """
+        Args:
+            channel: Channel monitored against the encoder angle
+            model: AngleBinModel to start from (default: an empty one)
+            baseline_revolutions: Complete revolutions learned before
+                scoring starts (0 scores from the start with the given model)
+            sigma: Control limits in standard deviations of the bin
+            min_count: Bins with fewer baseline samples are not scored
+            min_violations: Samples outside the limits that make a
+                revolution out of control
+            alert_manager: AlertManager alerted (buzzer only) while
+                revolutions are out of control (optional)
+            schema: ChannelSchema of the frames passed to feed()
+            batch_size: Frames fed one at a time are processed once there
+                are this many...
+            max_delay: ...or once the oldest is this many seconds older
+                than the newest
+        """
+        if channel not in schema or 'angle' not in schema:
+            raise ValueError(f"SPC needs the angle and {channel} channels")
+        self.channel = channel
+        self.model = model if model is not None else AngleBinModel()
+        self.baseline_revolutions = baseline_revolutions
+        self.sigma = sigma
+        self.min_count = min_count
+        self.min_violations = min_violations
+        self.alert_manager = alert_manager
+        self.schema = schema
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+        self.cycles_scored = 0
+        self.cycles_out_of_control = 0
+        self._pending_frames = []
+        self.reset()
+
+    @property
+    def learning(self):
+        return self.baseline_revolutions > 0 and self.revolution <= self.baseline_revolutions
+
+    def reset(self):
+        """Restart revolution counting (the model is kept)"""
+        self.revolution = 0
+        self.last_angle = None
+        self._cycle = None
+
+    def feed(self, frame):
+        """Frame listener: buffer one frame and process full batches"""
+        pending = self._pending_frames
+        pending.append(frame)
+        if (len(pending) >= self.batch_size
+                or frame['timestamp'] - pending[0]['timestamp'] >= self.max_delay):
+            self.flush()
+
+    def flush(self):
+        """Process the frames buffered by feed()"""
+        frames, self._pending_frames = self._pending_frames, []
+        if frames:
+            records = self.schema.pack(frames)
+            self.process_batch(self.schema.columns(records))
+
+    def process_batch(self, columns):
+        """
+        Learn from or score a batch of frames stored column-wise
+
+        With a baseline to learn, samples of the first, partial revolution
+        are skipped, those of the next baseline_revolutions revolutions are
+        learned and later ones are scored. Without one, every sample is scored.
+
+        Args:
+            columns: Dictionary with timestamp, angle and the monitored channel
+
+        Returns:
+            (scores, cycles): the score of every sample (NaN where not
+            scored) and the CycleScores of the revolutions this batch completed
+        """
+        times = np.asarray(columns['timestamp'], dtype=np.float64)
+        angles = np.asarray(columns['angle'], dtype=np.float64)
+        values = np.asarray(columns[self.channel], dtype=np.float64)
+        scores = np.full(times.size, np.nan)
+        known = np.flatnonzero(np.isfinite(angles))
+        if known.size == 0:
+            return scores, []
+
+        # Revolution of each sample: a backward jump of more than half a turn is a wrap
+        steps = np.diff(angles[known], prepend=angles[known[0]] if self.last_angle is None
+                        else self.last_angle)
+        revolution = self.revolution + np.cumsum(steps < -180.0)
+        self.last_angle = angles[known[-1]]
+
+        learn = (revolution >= 1) & (revolution <= self.baseline_revolutions)
+        if learn.any():
+            self.model.update(angles[known[learn]], values[known[learn]])
+        if self.baseline_revolutions:
+            monitor = revolution > self.baseline_revolutions
+        else:
+            monitor = np.ones(revolution.size, dtype=bool)
+        if monitor.any():
+            scores[known[monitor]] = self.model.score(angles[known[monitor]], values[known[monitor]],
+                                                      self.min_count)
+        cycles = self._summarize(times[known], revolution, scores[known], monitor)
+        self.revolution = int(revolution[-1])
+        return scores, cycles
+
+    def _summarize(self, times, revolution, scores, monitor):
+        """Per-revolution violations, carried across batches until a revolution ends"""
+        if not monitor.any():
+            return []
+        times, revolution, scores = times[monitor], revolution[monitor], scores[monitor]
+        starts = np.flatnonzero(np.diff(revolution, prepend=revolution[0] - 1))
+        magnitude = np.abs(scores)
+        violations = np.add.reduceat((magnitude > self.sigma).astype(np.int64), starts)
+        peaks = np.fmax.reduceat(magnitude, starts)
+        counts = np.diff(np.append(starts, revolution.size))
+
+        completed = []
+        for segment, start in enumerate(starts):
+            number = int(revolution[start])
+            partial = [number, float(times[start]), float(times[start + counts[segment] - 1]),
+                       int(counts[segment]), int(violations[segment]), float(peaks[segment])]
+            if self._cycle is not None and self._cycle[0] == number:
+                cycle = self._cycle
+                cycle[2] = partial[2]
+                cycle[3] += partial[3]
+                cycle[4] += partial[4]
+                cycle[5] = float(np.fmax(cycle[5], partial[5]))
+            else:
+                if self._cycle is not None:
+                    completed.append(self._finish(self._cycle))
+                cycle = partial
+            self._cycle = cycle
+        return completed
+
+    def _finish(self, cycle):
+        score = CycleScore(*cycle)
+        self.cycles_scored += 1
+        out_of_control = score.violations >= self.min_violations
+        self.cycles_out_of_control += out_of_control
+        if self.alert_manager is not None:
+            alert_type = f"spc_{self.channel}"
+            if out_of_control:
+                self.alert_manager.alert(
+                    alert_type,
+                    f"{self.channel.capitalize()} out of control in revolution {score.revolution}: "
+                    f"{score.violations} samples beyond {self.sigma:g} sigma "
+                    f"(max {score.max_score:.1f})",
+                    popup=False
+                )
+            else:
+                self.alert_manager.dismiss_alert(alert_type)
+        return score
+
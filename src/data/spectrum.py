@@ -0,0 +1,176 @@
+# src/data/spectrum.py
+"""
+Incremental spectral analysis over a sliding sample buffer
+"""
+import numpy as np
+
+# np.fft gained out= in NumPy 2.0; older versions allocate each spectrum
+_RFFT_HAS_OUT = np.lib.NumpyVersion(np.__version__) >= "2.0.0"
+
+
+class SlidingSpectrum:
+    """
+    Windowed real FFT over a sliding buffer with an averaged PSD
+
+    Samples are pushed in batches of any size. Every `hop` samples a new
+    frame of `nfft` samples is windowed and transformed, and the power
+    spectral density is averaged over the last `averages` frames (Welch's
+    method). The window, frequency axis and all work arrays are allocated
+    once up front; with NumPy 2 the FFT writes into a preallocated array too,
+    while older NumPy allocates one complex spectrum (nfft // 2 + 1 values)
+    per frame.
+    """
+
+    def __init__(self, nfft=256, hop=64, sample_rate=1.0, averages=8, window="hann"):
+        """
+        Initialize the spectrum analyzer
+
+        Args:
+            nfft: FFT length in samples
+            hop: Samples between successive frames
+            sample_rate: Sample rate in Hz (sets the frequency axis scale)
+            averages: Number of frames averaged into the PSD
+            window: Window type (hann, hamming, blackman, rect)
+        """
+        if hop < 1 or hop > nfft:
+            raise ValueError("hop must be between 1 and nfft")
+        self.nfft = nfft
+        self.hop = hop
+        self.averages = averages
+        self.window = self._make_window(window, nfft)
+        self.nbins = nfft // 2 + 1
+
+        # Ring buffer holding the most recent nfft samples, duplicated so any
+        # frame is a contiguous slice without wrap-around copies
+        self._buffer = np.zeros(2 * nfft)
+        self._write = 0
+        self._filled = 0
+        self._since_frame = 0
+
+        # Preallocated work and output arrays
+        self._frame = np.empty(nfft)
+        self._spectrum = np.empty(self.nbins, dtype=np.complex128)
+        self._power = np.empty(self.nbins)
+        self._history = np.zeros((averages, self.nbins))
+        self._history_index = 0
+        self._history_count = 0
+        self._psd_sum = np.zeros(self.nbins)
+        self.psd = np.zeros(self.nbins)
+
+        # One-sided density scaling; DC and Nyquist are not doubled
+        self._scale = np.full(self.nbins, 2.0)
+        self._scale[0] = 1.0
+        if nfft % 2 == 0:
+            self._scale[-1] = 1.0
+        self._window_power = float(np.sum(self.window ** 2))
+
+        self.frames_computed = 0
+        self.sample_rate = None
+        self.frequencies = None
+        self.set_sample_rate(sample_rate)
+
+    @staticmethod
+    def _make_window(kind, n):
+        if kind == "hann":
+            return np.hanning(n)
+        if kind == "hamming":
+            return np.hamming(n)
+        if kind == "blackman":
+            return np.blackman(n)
+        if kind == "rect":
+            return np.ones(n)
+        raise ValueError(f"Unknown window type: {kind}")
+
+    def set_sample_rate(self, sample_rate):
+        """
+        Change the sample rate used for the frequency axis and PSD scale
+
+        The PSD average is discarded: its frames were scaled for the old
+        rate and belong to a different frequency axis. Buffered samples
+        are kept, so the next frame is computed as soon as it is due.
+        """
+        self.sample_rate = float(sample_rate)
+        self.frequencies = np.fft.rfftfreq(self.nfft, 1.0 / self.sample_rate)
+        self._density = self._scale / (self.sample_rate * self._window_power)
+        self._clear_average()
+
+    def reset(self):
+        """Discard buffered samples and the PSD average"""
+        self._write = 0
+        self._filled = 0
+        self._since_frame = 0
+        self._clear_average()
+
+    def _clear_average(self):
+        self._history[:] = 0.0
+        self._history_index = 0
+        self._history_count = 0
+        self.psd[:] = 0.0
+
+    def push(self, samples):
+        """
+        Add samples and compute any frames that became due
+
+        Args:
+            samples: 1-D array-like of new samples
+
+        Returns:
+            Number of new frames folded into the PSD
+        """
+        samples = np.asarray(samples, dtype=np.float64)
+        frames = 0
+        pos = 0
+        while pos < samples.size:
+            # Copy up to the next frame boundary in one slice
+            take = min(samples.size - pos, self.hop - self._since_frame)
+            self._append(samples[pos:pos + take])
+            pos += take
+            self._since_frame += take
+            if self._since_frame == self.hop:
+                self._since_frame = 0
+                if self._filled >= self.nfft:
+                    self._compute_frame()
+                    frames += 1
+        return frames
+
+    def _append(self, chunk):
+        """Write a chunk (at most hop <= nfft samples) into the mirrored ring"""
+        n = chunk.size
+        first = min(n, self.nfft - self._write)
+        start = self._write
+        self._buffer[start:start + first] = chunk[:first]
+        self._buffer[start + self.nfft:start + self.nfft + first] = chunk[:first]
+        if first < n:
+            rest = n - first
+            self._buffer[:rest] = chunk[first:]
+            self._buffer[self.nfft:self.nfft + rest] = chunk[first:]
+        self._write = (self._write + n) % self.nfft
+        self._filled = min(self.nfft, self._filled + n)
+
+    def _compute_frame(self):
+        """Transform the latest nfft samples and update the averaged PSD"""
+        latest = self._buffer[self._write:self._write + self.nfft]
+        # Remove the mean so the DC bin does not swamp the chatter peaks
+        np.subtract(latest, latest.mean(), out=self._frame)
+        np.multiply(self._frame, self.window, out=self._frame)
+        if _RFFT_HAS_OUT:
+            spectrum = np.fft.rfft(self._frame, out=self._spectrum)
+        else:
+            spectrum = np.fft.rfft(self._frame)
+        np.abs(spectrum, out=self._power)
+        np.multiply(self._power, self._power, out=self._power)
+        np.multiply(self._power, self._density, out=self._power)
+
+        # Average over the last `averages` frames (summed afresh, so no drift)
+        self._history[self._history_index] = self._power
+        self._history_index = (self._history_index + 1) % self.averages
+        self._history_count = min(self.averages, self._history_count + 1)
+        np.sum(self._history, axis=0, out=self._psd_sum)
+        np.divide(self._psd_sum, self._history_count, out=self.psd)
+        self.frames_computed += 1
+
+    def peak_frequency(self):
+        """Frequency (Hz) of the strongest non-DC bin of the averaged PSD"""
+        if self._history_count == 0:
+            return None
+        return float(self.frequencies[1 + int(np.argmax(self.psd[1:]))])
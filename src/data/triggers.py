@@ -0,0 +1,399 @@
+# src/data/triggers.py
+"""
+Oscilloscope-style triggered capture of the full-rate stream
+
+Every full-rate frame goes into a fixed-size ring holding the last few
+hundred milliseconds. Trigger conditions are evaluated on whole batches
+(one vectorized comparison per trigger), and every trigger starts a capture
+of the samples from pre_ms before to post_ms after it. Finished captures
+are kept in a bounded CaptureStore for the GUI to show and export.
+
+Like a scope in normal mode, a trigger is ignored while a capture is still
+collecting its post-trigger samples (plus an optional holdoff), so a
+signal staying above a level produces one capture, not one per sample.
+
+Trigger specifications, as accepted by parse_trigger:
+
+    torque:level:80            torque above 80 (":below" for below)
+    torque:edge:80             torque crossing 80 upwards (":falling", ":both")
+    preload:window:150:300     preload leaving [150, 300] (":enter" for entering)
+"""
+import abc
+import csv
+import math
+import threading
+from collections import deque, namedtuple
+
+import numpy as np
+
+from ..sensors.channels import DEFAULT_SCHEMA
+
+
+class Trigger(abc.ABC):
+    """Base class for trigger conditions on one channel"""
+
+    def __init__(self, channel, name=None):
+        self.channel = channel
+        self.name = name or channel
+
+    @abc.abstractmethod
+    def evaluate(self, columns):
+        """
+        Evaluate the condition on a batch
+
+        Args:
+            columns: Dictionary mapping channel name to a 1-D array
+
+        Returns:
+            Boolean array, True where the trigger fires
+        """
+
+    def reset(self):
+        """Forget the samples carried from the previous batch"""
+
+
+class LevelTrigger(Trigger):
+    """Fires on every sample above (or below) a level"""
+
+    def __init__(self, channel, level, below=False, name=None):
+        super().__init__(channel, name or f"{channel} {'<' if below else '>'} {level:g}")
+        self.level = float(level)
+        self.below = below
+
+    def evaluate(self, columns):
+        values = np.asarray(columns[self.channel], dtype=np.float64)
+        return values < self.level if self.below else values > self.level
+
+
+class _CarryTrigger(Trigger):
+    """Trigger comparing each sample with the one before it"""
+
+    def __init__(self, channel, name=None):
+        super().__init__(channel, name)
+        self._last = np.nan
+
+    def reset(self):
+        self._last = np.nan
+
+    def _with_previous(self, columns):
+        values = np.asarray(columns[self.channel], dtype=np.float64)
+        previous = np.empty_like(values)
+        if values.size:
+            previous[0] = self._last
+            previous[1:] = values[:-1]
+            self._last = values[-1]
+        return previous, values
+
+
+class EdgeTrigger(_CarryTrigger):
+    """Fires where a channel crosses a level (rising, falling or both)"""
+
+    def __init__(self, channel, level, slope="rising", name=None):
+        if slope not in ("rising", "falling", "both"):
+            raise ValueError(f"Unknown slope: {slope}")
+        super().__init__(channel, name or f"{channel} {slope} {level:g}")
+        self.level = float(level)
+        self.slope = slope
+
+    def evaluate(self, columns):
+        previous, values = self._with_previous(columns)
+        # Comparisons with NaN are False, so gaps never fire
+        rising = (previous < self.level) & (values >= self.level)
+        falling = (previous >= self.level) & (values < self.level)
+        if self.slope == "rising":
+            return rising
+        if self.slope == "falling":
+            return falling
+        return rising | falling
+
+
+class WindowTrigger(_CarryTrigger):
+    """Fires where a channel leaves (or enters) the band [low, high]"""
+
+    def __init__(self, channel, low, high, enter=False, name=None):
+        if high < low:
+            raise ValueError("high must not be below low")
+        super().__init__(channel, name or
+                         f"{channel} {'enters' if enter else 'leaves'} [{low:g}, {high:g}]")
+        self.low = float(low)
+        self.high = float(high)
+        self.enter = enter
+
+    def evaluate(self, columns):
+        previous, values = self._with_previous(columns)
+        was_inside = (previous >= self.low) & (previous <= self.high)
+        inside = (values >= self.low) & (values <= self.high)
+        was_outside = (previous < self.low) | (previous > self.high)
+        outside = (values < self.low) | (values > self.high)
+        return was_outside & inside if self.enter else was_inside & outside
+
+
+def create_trigger(spec):
+    """
+    Build a trigger from a configuration dictionary
+
+    Args:
+        spec: Dictionary with 'type' (level, edge, window), 'channel' and the
+            parameters for that type
+
+    Returns:
+        Trigger instance
+    """
+    kind = spec['type']
+    if kind == "level":
+        return LevelTrigger(spec['channel'], spec['level'], spec.get('below', False))
+    if kind == "edge":
+        return EdgeTrigger(spec['channel'], spec['level'], spec.get('slope', "rising"))
+    if kind == "window":
+        return WindowTrigger(spec['channel'], spec['low'], spec['high'], spec.get('enter', False))
+    raise ValueError(f"Unknown trigger type: {kind}")
+
+
+def parse_trigger(text):
+    """Build a trigger from a command line specification (see module docstring)"""
+    fields = text.split(":")
+    if len(fields) < 3:
+        raise ValueError(f"Invalid trigger specification: {text}")
+    channel, kind, args = fields[0], fields[1], fields[2:]
+    if kind == "level":
+        return LevelTrigger(channel, float(args[0]), below=args[1:] == ["below"])
+    if kind == "edge":
+        return EdgeTrigger(channel, float(args[0]), args[1] if len(args) > 1 else "rising")
+    if kind == "window":
+        return WindowTrigger(channel, float(args[0]), float(args[1]),
+                             enter=args[2:] == ["enter"])
+    raise ValueError(f"Unknown trigger type: {kind}")
+
+
+class SampleRing:
+    """
+    Fixed-size ring of the newest samples of several channels
+
+    There is a single writer and no lock. `written` counts every sample
+    ever written and is only advanced after the samples are stored, so a
+    reader never sees unwritten data. Before storing, the writer announces
+    the samples it is about to overwrite in `reserved`; read() re-checks it
+    after copying, like a sequence lock, to detect a concurrent overwrite.
+    """
+
+    def __init__(self, channels, capacity):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.channels = tuple(channels)
+        self.capacity = int(capacity)
+        self._data = np.full((len(self.channels), self.capacity), np.nan)
+        self.written = 0
+        self.reserved = 0
+
+    def write(self, block):
+        """
+        Append samples
+
+        Args:
+            block: 2-D array shaped (channels, samples)
+        """
+        count = block.shape[1]
+        self.reserved = self.written + count
+        skipped = max(0, count - self.capacity)
+        block = block[:, skipped:]
+        start = (self.written + skipped) % self.capacity
+        first = min(block.shape[1], self.capacity - start)
+        self._data[:, start:start + first] = block[:, :first]
+        self._data[:, :block.shape[1] - first] = block[:, first:]
+        self.written += count
+
+    def read(self, begin, end):
+        """
+        Copy of the samples with absolute indices [begin, end)
+
+        Returns:
+            2-D array shaped (channels, end - begin), or None if part of the
+            range is no longer (or not yet) in the ring
+        """
+        if end > self.written or begin < self.written - self.capacity:
+            return None
+        data = self._data[:, np.arange(begin, end) % self.capacity]
+        if begin < self.reserved - self.capacity:
+            return None
+        return data
+
+    def clear(self):
+        self._data.fill(np.nan)
+        self.written = 0
+        self.reserved = 0
+
+
+# One finished capture: columns maps timestamp and every channel to an array;
+# complete is False when the ring had already lost the start of the window
+Capture = namedtuple('Capture', ['number', 'trigger', 'time', 'channel', 'columns', 'complete'])
+
+# SensorManager publishes at most one frame per 10 ms, whatever the channel
+# rates declared in the schema
+MIN_RING_RATE = 100.0
+
+
+class CaptureStore:
+    """Bounded list of the most recent captures, shared with the GUI thread"""
+
+    def __init__(self, max_captures=20):
+        self.captures = deque(maxlen=max_captures)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def add(self, capture):
+        with self._lock:
+            self.captures.append(capture)
+            self.count += 1
+
+    def list(self):
+        """Stored captures, oldest first"""
+        with self._lock:
+            return list(self.captures)
+
+    def clear(self):
+        with self._lock:
+            self.captures.clear()
+
+    @staticmethod
+    def export_csv(capture, path):
+        """Write a capture as CSV with a time-from-trigger column in ms"""
+        names = list(capture.columns)
+        relative = (capture.columns['timestamp'] - capture.time) * 1000.0
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["t_ms"] + names)
+            writer.writerows(np.column_stack([relative] + [capture.columns[n] for n in names]))
+
+
+class TriggerEngine:
+    """Evaluates triggers on the full-rate stream and stores the captures"""
+
+    def __init__(self, triggers, schema=DEFAULT_SCHEMA, pre_ms=100.0, post_ms=100.0,
+                 holdoff_ms=0.0, sample_rate=None, store=None, batch_size=64, max_delay=0.05):
+        """
+        Args:
+            triggers: Sequence of Trigger conditions (any one starts a capture)
+            schema: ChannelSchema of the frames
+            pre_ms: Milliseconds captured before each trigger
+            post_ms: Milliseconds captured after each trigger
+            holdoff_ms: Extra dead time after a capture before re-arming
+            sample_rate: Highest frame rate in Hz, used to size the ring
+                (default: highest channel rate of the schema but at least
+                MIN_RING_RATE, else 1 kHz)
+            store: CaptureStore receiving the captures (default: a new one)
+            batch_size: Frames are evaluated in batches of at most this many
+                frames; frames fed one at a time are evaluated once there are
+                this many...
+            max_delay: ...or once the oldest unevaluated frame is this many
+                seconds older than the newest
+        """
+        for trigger in triggers:
+            if trigger.channel not in schema:
+                raise ValueError(f"Trigger on unknown channel: {trigger.channel}")
+        self.triggers = list(triggers)
+        self.schema = schema
+        self.pre = pre_ms / 1000.0
+        self.post = post_ms / 1000.0
+        self.holdoff = holdoff_ms / 1000.0
+        self.store = store if store is not None else CaptureStore()
+        self.batch_size = batch_size
+        self.max_delay = max_delay
+
+        if sample_rate is None:
+            sample_rate = max((max(c.rate, MIN_RING_RATE) for c in schema if c.rate),
+                              default=1000.0)
+        # The whole capture window plus one batch must fit in the ring
+        window = math.ceil((self.pre + self.post) * sample_rate * 1.5)
+        self.ring = SampleRing(('timestamp',) + schema.names, window + 2 * batch_size)
+
+        self.armed_at = -math.inf
+        self._pending_frames = []
+        self._open = []
+
+    def feed(self, frame):
+        """Frame listener: buffer one frame and evaluate full batches"""
+        pending = self._pending_frames
+        pending.append(frame)
+        if (len(pending) >= self.batch_size
+                or frame['timestamp'] - pending[0]['timestamp'] >= self.max_delay):
+            self.flush()
+
+    def flush(self):
+        """Evaluate the frames buffered by feed()"""
+        frames, self._pending_frames = self._pending_frames, []
+        if frames:
+            records = self.schema.pack(frames)
+            self.process_batch(self.schema.columns(records))
+
+    def process_batch(self, columns):
+        """
+        Add a batch of frames stored column-wise and fire triggers
+
+        Args:
+            columns: Dictionary mapping timestamp and every channel to a 1-D array
+
+        Returns:
+            List of the captures completed by this batch
+        """
+        times = np.asarray(columns['timestamp'], dtype=np.float64)
+        if times.size > self.batch_size:
+            # The ring only has room for one capture window plus a batch
+            completed = []
+            for start in range(0, times.size, self.batch_size):
+                completed += self.process_batch({
+                    name: values[start:start + self.batch_size] for name, values in columns.items()
+                })
+            return completed
+        if times.size == 0:
+            return []
+        self.ring.write(np.stack([np.asarray(columns[name], dtype=np.float64)
+                                  for name in self.ring.channels]))
+
+        # Index of the first trigger firing at each sample (-1 = none)
+        fired = np.full(times.size, -1)
+        for number in reversed(range(len(self.triggers))):
+            fired[self.triggers[number].evaluate(columns)] = number
+        candidates = np.flatnonzero(fired >= 0)
+
+        # Accept triggers only once the previous capture's window has passed
+        candidate_times = times[candidates]
+        position = np.searchsorted(candidate_times, self.armed_at, side='right')
+        while position < candidates.size:
+            time = candidate_times[position]
+            self._open.append((self.triggers[fired[candidates[position]]], time))
+            self.armed_at = time + self.post + self.holdoff
+            position = np.searchsorted(candidate_times, self.armed_at, side='right')
+
+        completed = []
+        newest = times[-1]
+        while self._open and self._open[0][1] + self.post <= newest:
+            completed.append(self._capture(*self._open.pop(0)))
+        return completed
+
+    def reset(self):
+        """Drop buffered samples and open captures, and re-arm"""
+        self.ring.clear()
+        self.armed_at = -math.inf
+        self._pending_frames = []
+        self._open = []
+        for trigger in self.triggers:
+            trigger.reset()
+
+    def _capture(self, trigger, time):
+        written = self.ring.written
+        begin = max(0, written - self.ring.capacity)
+        data = self.ring.read(begin, written)
+        timestamps = data[0]
+        keep = (timestamps >= time - self.pre) & (timestamps <= time + self.post)
+        # Samples before the oldest one kept may have been inside the window
+        complete = begin == 0 or timestamps[0] <= time - self.pre
+        capture = Capture(
+            number=self.store.count + 1, trigger=trigger.name, time=time, channel=trigger.channel,
+            columns={name: data[row][keep] for row, name in enumerate(self.ring.channels)},
+            complete=complete,
+        )
+        if not complete:
+            print(f"Capture {capture.number} is missing the start of its window: "
+                  f"frames arrive faster than the ring was sized for")
+        self.store.add(capture)
+        return capture
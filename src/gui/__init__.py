@@ -1,5 +1,12 @@
 # src/gui/__init__.py
-from src.gui.sensor_gui import SensorGUI
 
 # This allows you to import directly from the gui package:
-# from src.gui import SensorGUI
\ No newline at end of file
+# from src.gui import SensorGUI
+#
+# SensorGUI is imported on first use, so headless tools can use src.gui.plots
+# without Tk windows.
+def __getattr__(name):
+    if name == "SensorGUI":
+        from src.gui.sensor_gui import SensorGUI
+        return SensorGUI
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,78 @@
+# src/gui/cycle_panel.py
+import tkinter as tk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from src.gui.plots import create_cycle_trend_plot, update_cycle_trend_plot
+
+
+class CycleTrendPanel:
+    """Trend of per-revolution summaries read from a CycleTable"""
+
+    def __init__(self, parent, table, max_cycles=500, refresh_interval=1000):
+        """
+        Initialize the trend panel
+
+        Args:
+            parent: Tk widget to pack the canvas into
+            table: CycleTable filled by a CycleDetector on the data thread
+            max_cycles: Number of most recent cycles shown
+            refresh_interval: Milliseconds between checks for new cycles
+        """
+        self.parent = parent
+        self.table = table
+        self.max_cycles = max_cycles
+        self.refresh_interval = refresh_interval
+        self.drawn_count = -1
+        self.after_id = None
+
+        self.fig, self.ax_torque, self.ax_work = create_cycle_trend_plot()
+        self.peak_line = None
+        self.mean_line = None
+        self.work_line = None
+
+        self.summary_var = tk.StringVar(value="No complete cycles yet")
+        tk.Label(parent, textvariable=self.summary_var).pack(side=tk.BOTTOM, anchor="w")
+        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def start(self):
+        self._schedule_refresh()
+
+    def stop(self):
+        if self.after_id is not None:
+            try:
+                self.parent.after_cancel(self.after_id)
+            except tk.TclError:
+                pass
+            self.after_id = None
+
+    def _refresh(self):
+        """Redraw only when the table gained rows"""
+        rows = self.table.view()
+        if len(rows) == self.drawn_count:
+            return
+        self.drawn_count = len(rows)
+        if len(rows) == 0:
+            return
+
+        rows = rows[-self.max_cycles:]
+        cycles = rows['cycle']
+        self.peak_line = update_cycle_trend_plot(
+            self.ax_torque, cycles, rows['peak_torque'], self.peak_line, 'r.-', "Peak")
+        self.mean_line = update_cycle_trend_plot(
+            self.ax_torque, cycles, rows['mean_torque'], self.mean_line, 'b.-', "Mean")
+        self.work_line = update_cycle_trend_plot(
+            self.ax_work, cycles, rows['work'], self.work_line, 'g.-')
+
+        last = rows[-1]
+        self.summary_var.set(
+            f"Cycle {last['cycle']}: peak {last['peak_torque']:.1f} Nm at "
+            f"{last['angle_at_peak']:.0f}°, work {last['work']:.1f} J, "
+            f"peak preload {last['peak_preload']:.1f} N"
+        )
+        self.canvas.draw_idle()
+
+    def _schedule_refresh(self):
+        self._refresh()
+        self.after_id = self.parent.after(self.refresh_interval, self._schedule_refresh)
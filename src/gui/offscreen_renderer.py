@@ -0,0 +1,202 @@
+# src/gui/offscreen_renderer.py
+"""
+Off-thread figure rendering for Tk
+
+OffscreenRenderer owns a figure drawn with a plain Agg canvas on a worker
+thread. Artist changes are submitted as callables and applied on that
+thread just before the next render, so matplotlib is only ever touched by
+one thread. Finished frames go into three reusable RGBA buffers (triple
+buffering): the worker always has a free buffer to draw into, the Tk
+thread holds the one it is showing, and a finished frame that Tk has not
+picked up yet is simply replaced by a newer one.
+
+PhotoImageView is the Tk side: it copies the newest finished buffer into a
+PhotoImage, which takes a few milliseconds regardless of how long the
+figure took to render.
+"""
+import threading
+import time
+import tkinter as tk
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+try:
+    # Same C helper FigureCanvasTkAgg uses to copy RGBA data into a PhotoImage
+    from matplotlib.backends._backend_tk import blit as _tk_blit
+except ImportError:
+    _tk_blit = None
+
+
+class OffscreenRenderer:
+    """Renders a figure with Agg on a worker thread"""
+
+    def __init__(self, fig):
+        """
+        Args:
+            fig: Figure to render; from now on only change it through submit()
+        """
+        self.fig = fig
+        self.canvas = FigureCanvasAgg(fig)
+        self.running = False
+        self.thread = None
+        self._condition = threading.Condition()
+        self._pending = []
+
+        # Triple buffering: indices of the buffer being drawn, the newest
+        # finished frame, and the frame currently shown by Tk
+        self._buffers = [None, None, None]
+        self._back = 0
+        self._ready = None
+        self._front = None
+        self._ready_ms = 0.0
+        self._rendering = False
+
+        self.frames_rendered = 0
+        self.frames_dropped = 0
+        self.last_render_ms = 0.0
+
+    def start(self):
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._render_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        with self._condition:
+            self.running = False
+            self._condition.notify()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+    def submit(self, update=None):
+        """
+        Request a new frame
+
+        Args:
+            update: Optional callable changing artists, run on the render
+                thread before drawing. Updates submitted while a frame is
+                being drawn are all applied, in order, before the next one.
+        """
+        with self._condition:
+            self._pending.append(update or _no_update)
+            self._condition.notify()
+
+    def resize(self, width, height):
+        """Render at a new pixel size from the next frame on"""
+        dpi = self.fig.dpi
+        self.submit(lambda: self.fig.set_size_inches(width / dpi, height / dpi, forward=False))
+
+    @property
+    def busy(self):
+        """True while updates are queued or a frame is being drawn"""
+        return bool(self._pending) or self._rendering
+
+    @property
+    def has_frame(self):
+        """True if a finished frame is waiting for take_frame()"""
+        return self._ready is not None
+
+    def take_frame(self):
+        """
+        Hand the newest finished frame to the display thread
+
+        Returns:
+            (rgba array, render milliseconds), or None if nothing new. The
+            array stays valid until the next successful take_frame().
+        """
+        with self._condition:
+            if self._ready is None:
+                return None
+            # The previous front buffer becomes free for the next publish
+            self._front, self._ready = self._ready, None
+            return self._buffers[self._front], self._ready_ms
+
+    def _render_loop(self):
+        while True:
+            with self._condition:
+                while self.running and not self._pending:
+                    self._condition.wait()
+                if not self.running:
+                    return
+                updates, self._pending = self._pending, []
+                self._rendering = True
+
+            try:
+                start = time.perf_counter()
+                for update in updates:
+                    update()
+                self.canvas.draw()
+                image = np.asarray(self.canvas.buffer_rgba())
+                target = self._buffers[self._back]
+                if target is None or target.shape != image.shape:
+                    target = self._buffers[self._back] = np.empty_like(image)
+                np.copyto(target, image)
+                render_ms = (time.perf_counter() - start) * 1000.0
+            except Exception as e:
+                print(f"Error rendering figure: {str(e)}")
+                self._rendering = False
+                continue
+
+            with self._condition:
+                if self._ready is not None:
+                    # Tk never picked up the previous frame: reuse its buffer
+                    self.frames_dropped += 1
+                    self._back, self._ready = self._ready, self._back
+                else:
+                    self._ready = self._back
+                    self._back = ({0, 1, 2} - {self._ready, self._front}).pop()
+                self._ready_ms = render_ms
+                self.last_render_ms = render_ms
+                self.frames_rendered += 1
+                self._rendering = False
+
+
+def _no_update():
+    pass
+
+
+class PhotoImageView:
+    """Tk widget showing the frames of an OffscreenRenderer"""
+
+    def __init__(self, parent, renderer):
+        self.renderer = renderer
+        self.photo = tk.PhotoImage(width=1, height=1)
+        # A canvas does not ask for the image's size, so resizing never feeds back
+        self.widget = tk.Canvas(parent, width=1, height=1, highlightthickness=0, borderwidth=0)
+        self.image_item = self.widget.create_image(0, 0, anchor=tk.NW, image=self.photo)
+        self.widget.bind("<Configure>", self._on_configure)
+
+    def pack(self, **kwargs):
+        self.widget.pack(**kwargs)
+
+    def _on_configure(self, event):
+        if event.width > 1 and event.height > 1:
+            self.renderer.resize(event.width, event.height)
+
+    def present(self):
+        """
+        Show the newest finished frame, if any (Tk thread)
+
+        Returns:
+            Render time of the shown frame in milliseconds, or None
+        """
+        frame = self.renderer.take_frame()
+        if frame is None:
+            return None
+        image, render_ms = frame
+        height, width = image.shape[:2]
+        if self.photo.width() != width or self.photo.height() != height:
+            self.photo = tk.PhotoImage(width=width, height=height)
+            self.widget.itemconfigure(self.image_item, image=self.photo)
+        if _tk_blit is not None:
+            _tk_blit(self.photo, image, (0, 1, 2, 3))
+        else:
+            # Slower fallback: hand Tk a binary PPM of the RGB planes
+            header = f"P6 {width} {height} 255 ".encode()
+            self.photo.configure(data=header + image[:, :, :3].tobytes(), format="PPM")
+        return render_ms
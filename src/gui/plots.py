@@ -4,6 +4,8 @@ Specialized plotting functions for sensor visualization
 """
 from matplotlib.figure import Figure
 
+from src.sensors.channels import DEFAULT_SCHEMA
+
 def create_sensor_figure(fig_size=(12, 6), dpi=100):
     """
     Create a standard figure with two subplots for sensor visualization
@@ -17,26 +19,53 @@ def create_sensor_figure(fig_size=(12, 6), dpi=100):
         ax1: Torque vs Angle axes
         ax2: Preload vs Angle axes
     """
+    fig, axes = create_channel_figure(DEFAULT_SCHEMA, fig_size=fig_size, dpi=dpi)
+    return fig, axes['torque'], axes['preload']
+
+def create_channel_figure(schema, x_channel='angle', channels=None, fig_size=(12, 6), dpi=100):
+    """
+    Create a figure with one subplot per channel, plotted against x_channel
+    
+    Args:
+        schema: ChannelSchema describing the channels
+        x_channel: Channel on the horizontal axis of every subplot
+        channels: Channels to plot (default: every channel except x_channel)
+        fig_size: Figure size as (width, height) tuple
+        dpi: Dots per inch for figure resolution
+        
+    Returns:
+        fig: Figure object
+        axes: Dictionary mapping channel name to its axes, in schema order
+    """
+    import math
+    
+    if channels is None:
+        channels = [name for name in schema.names if name != x_channel]
+    
     fig = Figure(figsize=fig_size, dpi=dpi)
     
-    # Torque vs Angle plot (left)
-    ax1 = fig.add_subplot(121)
-    ax1.set_title("Torque vs Angle")
-    ax1.set_xlabel("Angle (degrees)")
-    ax1.set_ylabel("Torque (Nm)")
-    ax1.grid(True)
+    # Side by side up to two channels, otherwise the closest to square grid
+    count = max(1, len(channels))
+    cols = count if count <= 2 else math.ceil(math.sqrt(count))
+    rows = math.ceil(count / cols)
     
-    # Preload vs Angle plot (right)
-    ax2 = fig.add_subplot(122)
-    ax2.set_title("Preload vs Angle")
-    ax2.set_xlabel("Angle (degrees)")
-    ax2.set_ylabel("Preload (N)")
-    ax2.grid(True)
+    x = schema[x_channel]
+    x_label = x.label or x.name
+    axes = {}
+    for index, name in enumerate(channels):
+        channel = schema[name]
+        label = channel.label or channel.name
+        ax = fig.add_subplot(rows, cols, index + 1)
+        ax.set_title(f"{label} vs {x_label}")
+        ax.set_xlabel(f"{x_label} ({x.unit})")
+        ax.set_ylabel(f"{label} ({channel.unit})")
+        ax.grid(True)
+        axes[name] = ax
     
     # Set tight layout for better spacing
     fig.tight_layout()
     
-    return fig, ax1, ax2
+    return fig, axes
 
 def create_polar_plot(fig_size=(6, 6), dpi=100):
     """
@@ -60,6 +89,117 @@ def create_polar_plot(fig_size=(6, 6), dpi=100):
     
     return fig, ax
 
+def create_spectrum_plot(fig_size=(6, 4), dpi=100, title="Torque Spectrum"):
+    """
+    Create a figure for power spectral density display
+    
+    Args:
+        fig_size: Figure size as (width, height) tuple
+        dpi: Dots per inch for figure resolution
+        title: Axes title
+        
+    Returns:
+        fig: Figure object
+        ax: PSD axes (logarithmic power scale)
+    """
+    fig = Figure(figsize=fig_size, dpi=dpi)
+    
+    ax = fig.add_subplot(111)
+    ax.set_title(title)
+    ax.set_xlabel("Frequency (Hz)")
+    ax.set_ylabel("PSD (unit²/Hz)")
+    ax.set_yscale("log")
+    ax.grid(True, which="both", alpha=0.5)
+    
+    fig.tight_layout()
+    
+    return fig, ax
+
+def create_cycle_trend_plot(fig_size=(8, 5), dpi=100):
+    """
+    Create a figure for per-revolution trend display
+    
+    Args:
+        fig_size: Figure size as (width, height) tuple
+        dpi: Dots per inch for figure resolution
+        
+    Returns:
+        fig: Figure object
+        ax1: Peak/mean torque per cycle axes
+        ax2: Work per cycle axes (shares the cycle axis)
+    """
+    fig = Figure(figsize=fig_size, dpi=dpi)
+    
+    ax1 = fig.add_subplot(211)
+    ax1.set_title("Per-Cycle Trend")
+    ax1.set_ylabel("Torque (Nm)")
+    ax1.grid(True)
+    
+    ax2 = fig.add_subplot(212, sharex=ax1)
+    ax2.set_xlabel("Cycle")
+    ax2.set_ylabel("Work (J)")
+    ax2.grid(True)
+    
+    fig.tight_layout()
+    
+    return fig, ax1, ax2
+
+def create_capture_plot(fig_size=(8, 5), dpi=100):
+    """
+    Create a figure for a triggered capture
+    
+    Args:
+        fig_size: Figure size as (width, height) tuple
+        dpi: Dots per inch for figure resolution
+        
+    Returns:
+        fig: Figure object
+        ax: Axes with time relative to the trigger on the horizontal axis
+    """
+    fig = Figure(figsize=fig_size, dpi=dpi)
+    
+    ax = fig.add_subplot(111)
+    ax.set_title("Triggered Capture")
+    ax.set_xlabel("Time from trigger (ms)")
+    ax.grid(True)
+    
+    fig.tight_layout()
+    
+    return fig, ax
+
+def create_rig_grid_figure(num_rigs, fig_size=(12, 8), dpi=100):
+    """
+    Create a single shared figure with one Torque vs Angle subplot per rig
+    
+    Args:
+        num_rigs: Number of rigs to lay out
+        fig_size: Figure size as (width, height) tuple
+        dpi: Dots per inch for figure resolution
+        
+    Returns:
+        fig: Figure object
+        axes: List of axes, one per rig, in rig order
+    """
+    import math
+    
+    fig = Figure(figsize=fig_size, dpi=dpi)
+    
+    # Closest to square grid that fits all rigs
+    cols = max(1, math.ceil(math.sqrt(num_rigs)))
+    rows = max(1, math.ceil(num_rigs / cols))
+    
+    axes = []
+    for index in range(num_rigs):
+        ax = fig.add_subplot(rows, cols, index + 1)
+        ax.set_title(f"Rig {index}", fontsize=9)
+        ax.tick_params(labelsize=7)
+        ax.grid(True)
+        axes.append(ax)
+    
+    fig.tight_layout()
+    
+    return fig, axes
+
 def update_torque_angle_plot(ax, angles, torques, line=None):
     """
     Update the Torque vs Angle plot
@@ -108,6 +248,57 @@ def update_preload_angle_plot(ax, angles, preloads, line=None):
     
     return line
 
+def update_spectrum_plot(ax, frequencies, psd, line=None):
+    """
+    Update the spectrum plot
+    
+    Args:
+        ax: Matplotlib axes
+        frequencies: Frequency bin centres in Hz
+        psd: Power spectral density per bin
+        line: Line to update (optional)
+        
+    Returns:
+        line: The updated line
+    """
+    if line is None:
+        line, = ax.plot(frequencies, psd, 'm-', label="PSD")
+        ax.legend()
+    else:
+        line.set_data(frequencies, psd)
+    
+    ax.relim()
+    ax.autoscale_view()
+    
+    return line
+
+def update_cycle_trend_plot(ax, cycles, values, line=None, style='b.-', label=None):
+    """
+    Update one series of the per-cycle trend plot
+    
+    Args:
+        ax: Matplotlib axes
+        cycles: Cycle numbers
+        values: Metric value per cycle
+        line: Line to update (optional)
+        style: Matplotlib format string used when creating the line
+        label: Legend label used when creating the line
+        
+    Returns:
+        line: The updated line
+    """
+    if line is None:
+        line, = ax.plot(cycles, values, style, label=label, markersize=3)
+        if label:
+            ax.legend()
+    else:
+        line.set_data(cycles, values)
+    
+    ax.relim()
+    ax.autoscale_view()
+    
+    return line
+
 def plot_to_image(fig):
     """
     Convert a matplotlib figure to a PNG image
@@ -0,0 +1,168 @@
+# src/gui/polar_panel.py
+import tkinter as tk
+from collections import deque
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import time
+
+import numpy as np
+
+from src.gui.plots import create_polar_plot
+
+
+class PolarPanel:
+    """
+    Live polar view of a channel against encoder angle, one trace per revolution
+
+    The current revolution is a single animated line that is blitted over a
+    cached background, so a normal tick only redraws that one artist. When a
+    revolution completes its points move into one of a fixed pool of
+    pre-created history lines, older revolutions fade out, and the
+    background is re-rendered once.
+    """
+
+    def __init__(self, parent, channel="torque", max_revolutions=5, max_points_per_rev=2048):
+        """
+        Initialize the polar panel
+
+        Args:
+            parent: Tk widget to pack the canvas into
+            channel: Frame key plotted as the radius
+            max_revolutions: Number of previous revolutions kept on screen
+            max_points_per_rev: Capacity of the current revolution buffer
+        """
+        self.parent = parent
+        self.channel = channel
+        self.max_revolutions = max_revolutions
+
+        # Frames from the data thread (deque append/popleft are atomic)
+        self.pending = deque(maxlen=4 * max_points_per_rev)
+
+        # Preallocated buffers for the revolution being drawn
+        self.theta = np.empty(max_points_per_rev)
+        self.radius = np.empty(max_points_per_rev)
+        self.count = 0
+        self.last_angle = None
+        self.r_max = 1.0
+
+        self.fig, self.ax = create_polar_plot()
+        self.ax.set_title(f"{channel.capitalize()} vs Angle")
+        self.ax.set_rmax(self.r_max)
+
+        # The only artist touched on a regular tick
+        self.current_line, = self.ax.plot([], [], 'b-', linewidth=1.5, animated=True)
+
+        # Bounded pool of history artists, reused oldest-first
+        self.history_lines = [
+            self.ax.plot([], [], 'b-', linewidth=1.0, alpha=0.0)[0]
+            for _ in range(max_revolutions)
+        ]
+        self.history_order = deque()
+
+        self.background = None
+        self.last_tick_ms = 0.0
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def feed(self, frame):
+        """
+        Queue one data frame (safe to call from any thread)
+
+        Args:
+            frame: Dictionary with 'angle' and the plotted channel
+        """
+        angle = frame.get('angle')
+        value = frame.get(self.channel)
+        # NaN marks a channel missing from a partial frame
+        if angle is not None and value is not None and angle == angle and value == value:
+            self.pending.append((angle, value))
+
+    def clear(self):
+        """Drop the current and all previous revolutions"""
+        self.pending.clear()
+        self.count = 0
+        self.last_angle = None
+        for line in self.history_lines:
+            line.set_data([], [])
+            line.set_alpha(0.0)
+        self.history_order.clear()
+        self.current_line.set_data([], [])
+        self.canvas.draw_idle()
+
+    def update(self):
+        """Consume queued frames and redraw (call from the Tk thread)"""
+        start = time.perf_counter()
+        count = len(self.pending)
+        if count == 0:
+            return
+
+        items = [self.pending.popleft() for _ in range(count)]
+        angles = np.fromiter((a for a, _ in items), dtype=np.float64, count=count)
+        values = np.fromiter((v for _, v in items), dtype=np.float64, count=count)
+
+        # A drop of more than half a turn means the encoder wrapped past 360
+        previous = self.last_angle if self.last_angle is not None else angles[0]
+        steps = np.diff(angles, prepend=previous)
+        wraps = np.flatnonzero(steps < -180.0)
+        self.last_angle = angles[-1]
+
+        full_redraw = self.background is None
+        segment_start = 0
+        for wrap in wraps:
+            self._append(angles[segment_start:wrap], values[segment_start:wrap])
+            self._finish_revolution()
+            segment_start = wrap
+            full_redraw = True
+        self._append(angles[segment_start:], values[segment_start:])
+
+        peak = float(values.max())
+        if peak > self.r_max:
+            self.r_max = peak * 1.1
+            self.ax.set_rmax(self.r_max)
+            full_redraw = True
+
+        self.current_line.set_data(self.theta[:self.count], self.radius[:self.count])
+
+        if full_redraw:
+            # Re-renders the static parts; _on_draw recaptures the background
+            self.canvas.draw_idle()
+        else:
+            self.canvas.restore_region(self.background)
+            self.ax.draw_artist(self.current_line)
+            self.canvas.blit(self.fig.bbox)
+
+        self.last_tick_ms = (time.perf_counter() - start) * 1000.0
+
+    def _append(self, angles, values):
+        """Add samples to the current revolution buffer, dropping overflow"""
+        room = self.theta.size - self.count
+        n = min(room, angles.size)
+        if n <= 0:
+            return
+        np.radians(angles[:n], out=self.theta[self.count:self.count + n])
+        self.radius[self.count:self.count + n] = values[:n]
+        self.count += n
+
+    def _finish_revolution(self):
+        """Move the current revolution into the history pool and fade older ones"""
+        if self.count >= 2:
+            if len(self.history_order) == self.max_revolutions:
+                index = self.history_order.popleft()
+            else:
+                index = len(self.history_order)
+            self.history_lines[index].set_data(
+                self.theta[:self.count].copy(), self.radius[:self.count].copy()
+            )
+            self.history_order.append(index)
+
+            # Newest history trace is the most opaque
+            for age, index in enumerate(reversed(self.history_order)):
+                self.history_lines[index].set_alpha(0.6 * (1.0 - age / self.max_revolutions))
+        self.count = 0
+
+    def _on_draw(self, event):
+        """Capture the freshly rendered background, then draw the live trace on top"""
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.ax.draw_artist(self.current_line)
@@ -0,0 +1,127 @@
+# src/gui/refresh_scheduler.py
+"""
+Adaptive GUI refresh timing based on render cost and data arrival
+"""
+import time
+from collections import deque
+
+# Scheduler settings per profile (intervals in ms)
+PROFILES = {
+    "default": {
+        'base_interval': 50,
+        'idle_interval': 500,
+        'max_interval': 1000,
+        'budget_fraction': 0.5,
+        'idle_after': 1.0,
+    },
+    # Raspberry Pi: fewer redraws, and rendering may use less of each frame
+    "low_power": {
+        'base_interval': 150,
+        'idle_interval': 1000,
+        'max_interval': 2000,
+        'budget_fraction': 0.3,
+        'idle_after': 0.5,
+    },
+}
+
+
+def detect_profile():
+    """Pick the low-power profile on a Raspberry Pi, the default elsewhere"""
+    try:
+        with open("/proc/device-tree/model") as f:
+            if "Raspberry Pi" in f.read():
+                return "low_power"
+    except OSError:
+        pass
+    return "default"
+
+
+class RefreshScheduler:
+    """
+    Chooses the delay before the next GUI refresh
+
+    The interval starts at the profile's base rate. If rendering a frame
+    takes more than `budget_fraction` of the interval, the interval grows
+    so the Tk thread keeps time for input handling; it shrinks back
+    gradually once frames are cheap again. With no new data for
+    `idle_after` seconds, or with the window minimized, the scheduler drops
+    to the idle rate.
+    """
+
+    def __init__(self, profile="default", stats_window=100):
+        """
+        Args:
+            profile: Name of an entry in PROFILES
+            stats_window: Number of recent frames kept for statistics
+        """
+        self.set_profile(profile)
+        self.interval = self.base_interval
+        self.last_data_time = None
+        self.idle = False
+
+        self.frame_times = deque(maxlen=stats_window)
+        self.frame_stamps = deque(maxlen=stats_window)
+
+    def set_profile(self, profile):
+        """Switch to another profile from PROFILES"""
+        settings = PROFILES[profile]
+        self.profile = profile
+        self.base_interval = settings['base_interval']
+        self.idle_interval = settings['idle_interval']
+        self.max_interval = settings['max_interval']
+        self.budget_fraction = settings['budget_fraction']
+        self.idle_after = settings['idle_after']
+        self.interval = self.base_interval
+
+    def record_frame(self, render_ms):
+        """Record the cost of a completed redraw"""
+        self.frame_times.append(render_ms)
+        self.frame_stamps.append(time.perf_counter())
+
+        budget = self.interval * self.budget_fraction
+        if render_ms > budget:
+            # Back off so rendering stays within budget
+            self.interval = min(self.max_interval, render_ms / self.budget_fraction)
+        else:
+            # Recover towards the base rate a little each frame
+            self.interval = max(self.base_interval, self.interval * 0.9)
+
+    def next_interval(self, had_data, visible=True):
+        """
+        Delay (ms) before the next refresh
+
+        Args:
+            had_data: Whether new data was drawn on this tick
+            visible: Whether the window is currently shown
+        """
+        now = time.perf_counter()
+        if had_data:
+            self.last_data_time = now
+
+        stale = self.last_data_time is None or now - self.last_data_time > self.idle_after
+        self.idle = stale or not visible
+        if self.idle:
+            return int(self.idle_interval)
+        return int(self.interval)
+
+    def get_stats(self):
+        """
+        Frame statistics over the recent window
+
+        Returns:
+            Dictionary with fps, mean_ms, max_ms, interval_ms and idle
+        """
+        fps = 0.0
+        if len(self.frame_stamps) >= 2:
+            span = self.frame_stamps[-1] - self.frame_stamps[0]
+            # Frames older than the idle threshold do not count as current rate
+            if span > 0 and time.perf_counter() - self.frame_stamps[-1] < self.idle_after:
+                fps = (len(self.frame_stamps) - 1) / span
+        times = self.frame_times
+        return {
+            'fps': fps,
+            'mean_ms': sum(times) / len(times) if times else 0.0,
+            'max_ms': max(times) if times else 0.0,
+            'interval_ms': self.interval,
+            'idle': self.idle,
+        }
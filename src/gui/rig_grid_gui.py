@@ -0,0 +1,143 @@
+# src/gui/rig_grid_gui.py
+import tkinter as tk
+from tkinter import ttk
+from collections import deque
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import queue
+import threading
+
+from src.gui.plots import create_rig_grid_figure
+
+
+class RigGridGUI:
+    """Grid view showing Torque vs Angle for several rigs in one shared figure"""
+
+    def __init__(self, data_queue, rig_ids, max_points=300):
+        """
+        Initialize the grid GUI
+
+        Args:
+            data_queue: Queue containing rig-tagged sensor data
+            rig_ids: Rig ids to display, in grid order
+            max_points: Maximum number of data points kept per rig
+        """
+        self.data_queue = data_queue
+        self.rig_ids = list(rig_ids)
+        self.max_points = max_points
+
+        # Per-rig bounded storage; deques drop old points without copying
+        self.angles = {rig_id: deque(maxlen=max_points) for rig_id in self.rig_ids}
+        self.torques = {rig_id: deque(maxlen=max_points) for rig_id in self.rig_ids}
+
+        # Rigs that received data since the last redraw
+        self.dirty = set()
+        self.data_lock = threading.Lock()
+
+        # GUI update frequency (in ms)
+        self.update_interval = 100
+
+        self.root = tk.Tk()
+        self.root.title("SensorViz - Rig Overview")
+        self.root.geometry("1200x800")
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+        self._create_plots()
+
+        self.status_var = tk.StringVar(value="Ready")
+        ttk.Label(self.root, textvariable=self.status_var).pack(side=tk.BOTTOM, anchor="w", padx=10)
+
+        self.running = False
+        self.ingest_thread = None
+        self.stop_event = threading.Event()
+        self.update_count = 0
+
+    def _create_plots(self):
+        """Create one shared figure with a subplot and line per rig"""
+        self.fig, axes = create_rig_grid_figure(len(self.rig_ids))
+        self.axes = dict(zip(self.rig_ids, axes))
+        self.lines = {}
+        for rig_id, ax in self.axes.items():
+            ax.set_title(f"Rig {rig_id}", fontsize=9)
+            self.lines[rig_id], = ax.plot([], [], 'b-', linewidth=1)
+
+        self.canvas = FigureCanvasTkAgg(self.fig, master=self.root)
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def start_visualization(self):
+        """Start consuming data and redrawing"""
+        if self.running:
+            return
+
+        self.running = True
+        self.stop_event.clear()
+        self.ingest_thread = threading.Thread(target=self._ingest_loop, daemon=True)
+        self.ingest_thread.start()
+        self._schedule_update()
+
+    def stop_visualization(self):
+        """Stop consuming data"""
+        if not self.running:
+            return
+
+        self.running = False
+        self.stop_event.set()
+        if self.ingest_thread:
+            self.ingest_thread.join(timeout=1.0)
+
+    def on_closing(self):
+        """Handle window close event"""
+        self.stop_visualization()
+        self.root.destroy()
+
+    def _ingest_loop(self):
+        """Background thread that routes frames to their rig"""
+        while not self.stop_event.is_set():
+            try:
+                data = self.data_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            rig_id = data.get('rig_id')
+            if rig_id not in self.angles:
+                continue
+
+            with self.data_lock:
+                self.angles[rig_id].append(data.get('angle', 0))
+                self.torques[rig_id].append(data.get('torque', 0))
+                self.dirty.add(rig_id)
+
+    def _update_plots(self):
+        """Update only the rigs that changed, then redraw the shared canvas once"""
+        with self.data_lock:
+            changed = self.dirty
+            self.dirty = set()
+            snapshot = {
+                rig_id: (list(self.angles[rig_id]), list(self.torques[rig_id]))
+                for rig_id in changed
+            }
+
+        if not snapshot:
+            return
+
+        for rig_id, (angles, torques) in snapshot.items():
+            self.lines[rig_id].set_data(angles, torques)
+            ax = self.axes[rig_id]
+            ax.relim()
+            ax.autoscale_view()
+
+        # One redraw for the whole grid regardless of how many rigs changed
+        self.canvas.draw_idle()
+        self.update_count += 1
+        self.status_var.set(f"{len(snapshot)} of {len(self.rig_ids)} rigs updated")
+
+    def _schedule_update(self):
+        """Schedule the next UI update if still running"""
+        if self.running:
+            self._update_plots()
+            self.root.after(self.update_interval, self._schedule_update)
+
+    def run(self):
+        """Run the main application loop"""
+        self.start_visualization()
+        self.root.mainloop()
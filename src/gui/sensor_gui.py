@@ -2,43 +2,91 @@
 import tkinter as tk
 from tkinter import ttk
 from src.alerts.alert_manager import AlertManager
+from src.gui.spectrum_panel import SpectrumPanel
+from src.gui.polar_panel import PolarPanel
+from src.gui.cycle_panel import CycleTrendPanel
+from src.gui.trigger_panel import TriggerPanel
+from src.data.derived import DerivedEngine
+from src.data.snapshot_buffer import SnapshotBuffer
+from src.gui.refresh_scheduler import RefreshScheduler, detect_profile
+from src.gui.offscreen_renderer import OffscreenRenderer, PhotoImageView
+from src.gui.plots import create_channel_figure
+from src.sensors.channels import DEFAULT_SCHEMA, ChannelSchema, ChannelStats
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg, NavigationToolbar2Tk
-from matplotlib.figure import Figure
+import numpy as np
 import queue
 import threading
 import time
 
+# Line styles of the channel plots, cycled for larger schemas
+LINE_STYLES = ('b-', 'r-', 'g-', 'm-', 'c-', 'k-')
+
+# Channels whose maximum is shown in the status bar
+STATUS_CHANNELS = 4
+
 class SensorGUI:
     """Main GUI for sensor visualization application"""
     
-    def __init__(self, data_queue, max_points=500):
+    def __init__(self, data_queue, max_points=500, refresh_profile=None, render_mode="tk",
+                 schema=DEFAULT_SCHEMA, trigger_engine=None, derived=(), cycle_detector=None):
         """
         Initialize the GUI
         
         Args:
             data_queue: Queue containing sensor data
             max_points: Maximum number of data points to display
+            refresh_profile: Refresh scheduler profile ("default" or "low_power");
+                detected from the hardware when None
+            render_mode: "tk" to draw the plots on the Tk thread, or "offscreen"
+                to render them on a worker thread and only show finished frames
+            schema: ChannelSchema of the frames; every channel is plotted
+                against the angle
+            trigger_engine: Optional TriggerEngine fed with the full-rate
+                frames; its captures are shown in the Triggers window
+            derived: Names of derived channels (src.data.derived) plotted
+                after the schema's channels
+            cycle_detector: Optional CycleDetector fed with the full-rate
+                frames; its revolutions are shown in the Cycles window
         """
         self.data_queue = data_queue
         self.max_points = max_points
         
-        # Data storage
-        self.angles = []
-        self.torques = []
-        self.preloads = []
-        self.timestamps = []
+        # Data storage. The ingest thread appends and publishes versioned
+        # snapshots; the Tk thread only ever reads the latest snapshot.
+        self.schema = schema
+        self.trigger_engine = trigger_engine
+        self.cycle_detector = cycle_detector
+        self.derived = DerivedEngine()
+        for name in derived:
+            self.derived.subscribe(name)
+        # Frames are packed with the schema; everything shown uses the display schema
+        self.display_schema = ChannelSchema(list(schema) + self.derived.channels(derived))
+        self.x_channel = 'angle'
+        self.plot_channels = tuple(name for name in self.display_schema.names
+                                   if name != self.x_channel)
+        self.channels = ('timestamp',) + self.display_schema.names
+        self.buffer = SnapshotBuffer(self.channels, capacity=1000)
+        self.display_points = max_points
+        self.drawn_version = 0
         
         # Threshold values (default: None = no threshold)
         self.torque_threshold = None
         self.preload_threshold = None
         
-        # Statistics
-        self.max_torque = 0
-        self.max_preload = 0
+        # Statistics (updated column-wise by the ingest thread)
+        self.channel_stats = ChannelStats(self.display_schema)
         self.update_count = 0
         
-        # GUI update frequency (in ms)
-        self.update_interval = 50
+        # GUI update frequency (in ms), adapted to render cost and data arrival
+        self.scheduler = RefreshScheduler(refresh_profile or detect_profile())
+        self.update_interval = self.scheduler.base_interval
+        self.frame_start = None
+        
+        # Offscreen rendering (render_mode="offscreen")
+        self.render_mode = render_mode
+        self.renderer = None
+        self.plot_view = None
+        self.render_poll_id = None
         
         # Create the main window
         self.root = tk.Tk()
@@ -70,6 +118,22 @@ class SensorGUI:
         self.running = False
         self.animation_thread = None
         self.stop_event = threading.Event()
+        
+        # Optional spectrum window (created on demand)
+        self.spectrum_window = None
+        self.spectrum_panel = None
+        
+        # Optional polar window (created on demand)
+        self.polar_window = None
+        self.polar_panel = None
+        
+        # Optional per-cycle trend window (created on demand)
+        self.cycle_window = None
+        self.cycle_panel = None
+        
+        # Optional triggered capture window (created on demand)
+        self.trigger_window = None
+        self.trigger_panel = None
     
     def _create_header(self):
         """Create the header section"""
@@ -86,59 +150,51 @@ class SensorGUI:
         # Add app description
         desc_label = ttk.Label(
             header_frame,
-            text="Real-time monitoring of angle, torque, and preload sensors",
+            text=f"Real-time monitoring of {len(self.schema)} sensor channels",
             font=("Arial", 10)
         )
         desc_label.pack(side=tk.LEFT, padx=10)
     
     def _create_plots(self):
-        """Create the plot area with two plots"""
+        """Create the plot area with one plot per channel"""
         # Main plot frame
         plot_frame = ttk.Frame(self.root)
         plot_frame.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=10, pady=5)
         
-        # Create a figure with two subplots
-        self.fig = Figure(figsize=(12, 6), dpi=100)
-        
-        # Torque vs Angle plot (left)
-        self.ax1 = self.fig.add_subplot(121)
-        self.ax1.set_title("Torque vs Angle")
-        self.ax1.set_xlabel("Angle (degrees)")
-        self.ax1.set_ylabel("Torque (Nm)")
-        self.ax1.grid(True)
-        
-        # Initial empty line for torque plot
-        self.torque_line, = self.ax1.plot([], [], 'b-', label="Torque")
+        # One subplot per channel against the angle
+        self.fig, self.axes = create_channel_figure(self.display_schema, self.x_channel, self.plot_channels)
         
-        # Threshold line for torque (initially hidden)
-        self.torque_threshold_line = self.ax1.axhline(
-            y=0, color='r', linestyle='--', linewidth=2, visible=False, label="Threshold"
-        )
-        
-        self.ax1.legend()
+        # Initial empty line per channel
+        self.channel_lines = {}
+        for index, name in enumerate(self.plot_channels):
+            channel = self.display_schema[name]
+            self.channel_lines[name], = self.axes[name].plot(
+                [], [], LINE_STYLES[index % len(LINE_STYLES)], label=channel.label or name
+            )
         
-        # Preload vs Angle plot (right)
-        self.ax2 = self.fig.add_subplot(122)
-        self.ax2.set_title("Preload vs Angle")
-        self.ax2.set_xlabel("Angle (degrees)")
-        self.ax2.set_ylabel("Preload (N)")
-        self.ax2.grid(True)
+        # Threshold lines (initially hidden) for the channels that have them
+        self.torque_threshold_line = self._create_threshold_line('torque', 'r')
+        self.preload_threshold_line = self._create_threshold_line('preload', 'g')
         
-        # Initial empty line for preload plot
-        self.preload_line, = self.ax2.plot([], [], 'r-', label="Preload")
-        
-        # Threshold line for preload (initially hidden)
-        self.preload_threshold_line = self.ax2.axhline(
-            y=0, color='g', linestyle='--', linewidth=2, visible=False, label="Threshold"
-        )
-        
-        self.ax2.legend()
+        for ax in self.axes.values():
+            ax.legend()
         
         # Set tight layout for better spacing
         self.fig.tight_layout()
         
+        if self.render_mode == "offscreen":
+            # Agg draws on a worker thread; the Tk thread only copies finished
+            # frames. There is no toolbar: pan/zoom needs an interactive canvas.
+            self.renderer = OffscreenRenderer(self.fig)
+            self.canvas = self.renderer.canvas
+            self.plot_view = PhotoImageView(plot_frame, self.renderer)
+            self.plot_view.pack(fill=tk.BOTH, expand=True)
+            self.renderer.start()
+            return
+        
         # Create a canvas to display the figure
         self.canvas = FigureCanvasTkAgg(self.fig, master=plot_frame)
+        self.canvas.mpl_connect("draw_event", self._on_canvas_draw)
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
@@ -148,6 +204,14 @@ class SensorGUI:
         toolbar = NavigationToolbar2Tk(self.canvas, toolbar_frame)
         toolbar.update()
     
+    def _create_threshold_line(self, name, color):
+        """Hidden threshold line on a channel's plot, or None without that channel"""
+        if name not in self.axes:
+            return None
+        return self.axes[name].axhline(
+            y=0, color=color, linestyle='--', linewidth=2, visible=False, label="Threshold"
+        )
+    
     def _create_controls(self):
         """Create the control panel"""
         control_frame = ttk.LabelFrame(self.root, text="Controls", padding="10")
@@ -209,6 +273,44 @@ class SensorGUI:
         )
         self.export_btn.pack(side=tk.LEFT, padx=5)
         
+        # Spectrum window button
+        self.spectrum_btn = ttk.Button(
+            btn_frame,
+            text="Spectrum",
+            command=self.open_spectrum,
+            width=10
+        )
+        self.spectrum_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Polar window button
+        self.polar_btn = ttk.Button(
+            btn_frame,
+            text="Polar",
+            command=self.open_polar,
+            width=10
+        )
+        self.polar_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Cycle trend window button
+        self.cycle_btn = ttk.Button(
+            btn_frame,
+            text="Cycles",
+            command=self.open_cycles,
+            width=10,
+            state=tk.NORMAL if self.cycle_detector is not None else tk.DISABLED
+        )
+        self.cycle_btn.pack(side=tk.LEFT, padx=5)
+        
+        # Triggered capture window button
+        self.trigger_btn = ttk.Button(
+            btn_frame,
+            text="Triggers",
+            command=self.open_triggers,
+            width=10,
+            state=tk.NORMAL if self.trigger_engine is not None else tk.DISABLED
+        )
+        self.trigger_btn.pack(side=tk.LEFT, padx=5)
+        
         # Display options
         display_frame = ttk.Frame(control_frame)
         display_frame.pack(side=tk.RIGHT, padx=10)
@@ -234,6 +336,20 @@ class SensorGUI:
         # Update when points value changes
         self.points_var.trace_add("write", lambda *args: 
             self.points_label.config(text=str(self.points_var.get())))
+        
+        # Mirror the slider into a plain int so the ingest thread never calls Tk
+        self.points_var.trace_add("write", lambda *args:
+            setattr(self, 'display_points', self.points_var.get()))
+        
+        # Low-power refresh profile (e.g. Raspberry Pi)
+        self.low_power_var = tk.BooleanVar(value=self.scheduler.profile == "low_power")
+        ttk.Checkbutton(
+            display_frame,
+            text="Low power",
+            variable=self.low_power_var,
+            command=lambda: self.scheduler.set_profile(
+                "low_power" if self.low_power_var.get() else "default")
+        ).pack(side=tk.LEFT, padx=10)
     
     def _create_threshold_controls(self):
         """Create controls for setting thresholds"""
@@ -310,12 +426,15 @@ class SensorGUI:
     
     def _update_torque_threshold(self):
         """Update the torque threshold based on user input"""
+        if self.torque_threshold_line is None:
+            self.torque_threshold_enabled.set(False)
+            self.status_var.set("No torque channel in this schema")
+            return
         if self.torque_threshold_enabled.get():
             try:
                 threshold_value = float(self.torque_threshold_var.get())
                 self.torque_threshold = threshold_value
-                self.torque_threshold_line.set_ydata([threshold_value, threshold_value])
-                self.torque_threshold_line.set_visible(True)
+                self._redraw(lambda: self._show_threshold(self.torque_threshold_line, threshold_value))
                 self.status_var.set(f"Torque threshold set to {threshold_value} Nm")
             except ValueError:
                 self.status_var.set("Invalid torque threshold value")
@@ -323,20 +442,20 @@ class SensorGUI:
         else:
             # Disable threshold
             self.torque_threshold = None
-            self.torque_threshold_line.set_visible(False)
+            self._redraw(lambda: self.torque_threshold_line.set_visible(False))
             self.status_var.set("Torque threshold disabled")
-        
-        # Redraw canvas
-        self.canvas.draw_idle()
     
     def _update_preload_threshold(self):
         """Update the preload threshold based on user input"""
+        if self.preload_threshold_line is None:
+            self.preload_threshold_enabled.set(False)
+            self.status_var.set("No preload channel in this schema")
+            return
         if self.preload_threshold_enabled.get():
             try:
                 threshold_value = float(self.preload_threshold_var.get())
                 self.preload_threshold = threshold_value
-                self.preload_threshold_line.set_ydata([threshold_value, threshold_value])
-                self.preload_threshold_line.set_visible(True)
+                self._redraw(lambda: self._show_threshold(self.preload_threshold_line, threshold_value))
                 self.status_var.set(f"Preload threshold set to {threshold_value} N")
             except ValueError:
                 self.status_var.set("Invalid preload threshold value")
@@ -344,11 +463,41 @@ class SensorGUI:
         else:
             # Disable threshold
             self.preload_threshold = None
-            self.preload_threshold_line.set_visible(False)
+            self._redraw(lambda: self.preload_threshold_line.set_visible(False))
             self.status_var.set("Preload threshold disabled")
+    
+    @staticmethod
+    def _show_threshold(line, value):
+        """Move a threshold line to value and show it"""
+        line.set_ydata([value, value])
+        line.set_visible(True)
+    
+    def _redraw(self, update=None):
+        """
+        Apply artist changes and redraw on whichever thread owns the figure
         
-        # Redraw canvas
-        self.canvas.draw_idle()
+        Args:
+            update: Optional callable changing artists. With offscreen
+                rendering it runs on the render thread, so it must only use
+                data that is not modified afterwards.
+        """
+        if self.renderer is None:
+            if update is not None:
+                update()
+            self.canvas.draw_idle()
+            return
+        self.renderer.submit(update)
+        if self.render_poll_id is None:
+            self.render_poll_id = self.root.after(15, self._poll_render)
+    
+    def _poll_render(self):
+        """Show finished offscreen frames while the renderer has work (Tk thread)"""
+        self.render_poll_id = None
+        render_ms = self.plot_view.present()
+        if render_ms is not None:
+            self.scheduler.record_frame(render_ms)
+        if self.renderer.busy or self.renderer.has_frame:
+            self.render_poll_id = self.root.after(15, self._poll_render)
     
     def _create_status_bar(self):
         """Create the status bar with max values display"""
@@ -359,19 +508,15 @@ class SensorGUI:
         stats_frame = ttk.LabelFrame(status_frame, text="Statistics", padding="5")
         stats_frame.pack(side=tk.LEFT, fill=tk.X, expand=True)
         
-        # Max torque
-        torque_frame = ttk.Frame(stats_frame)
-        torque_frame.pack(side=tk.LEFT, padx=20)
-        ttk.Label(torque_frame, text="Max Torque:").pack(side=tk.LEFT)
-        self.max_torque_var = tk.StringVar(value="0.0 Nm")
-        ttk.Label(torque_frame, textvariable=self.max_torque_var, font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
-        
-        # Max preload
-        preload_frame = ttk.Frame(stats_frame)
-        preload_frame.pack(side=tk.LEFT, padx=20)
-        ttk.Label(preload_frame, text="Max Preload:").pack(side=tk.LEFT)
-        self.max_preload_var = tk.StringVar(value="0.0 N")
-        ttk.Label(preload_frame, textvariable=self.max_preload_var, font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
+        # Max value of the first few channels
+        self.max_vars = {}
+        for name in self.plot_channels[:STATUS_CHANNELS]:
+            channel = self.display_schema[name]
+            max_frame = ttk.Frame(stats_frame)
+            max_frame.pack(side=tk.LEFT, padx=20)
+            ttk.Label(max_frame, text=f"Max {channel.label or name}:").pack(side=tk.LEFT)
+            self.max_vars[name] = tk.StringVar(value=f"0.0 {channel.unit}")
+            ttk.Label(max_frame, textvariable=self.max_vars[name], font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
         
         # Current values
         current_frame = ttk.Frame(stats_frame)
@@ -380,6 +525,13 @@ class SensorGUI:
         self.current_angle_var = tk.StringVar(value="0.0°")
         ttk.Label(current_frame, textvariable=self.current_angle_var, font=("Arial", 10, "bold")).pack(side=tk.LEFT, padx=5)
         
+        # Refresh rate and frame cost
+        render_frame = ttk.Frame(stats_frame)
+        render_frame.pack(side=tk.LEFT, padx=20)
+        ttk.Label(render_frame, text="Display:").pack(side=tk.LEFT)
+        self.render_stats_var = tk.StringVar(value="idle")
+        ttk.Label(render_frame, textvariable=self.render_stats_var).pack(side=tk.LEFT, padx=5)
+        
         # Status message
         self.status_var = tk.StringVar(value="Ready")
         status_label = ttk.Label(status_frame, textvariable=self.status_var)
@@ -424,22 +576,25 @@ class SensorGUI:
     
     def clear_data(self):
         """Clear all stored data"""
-        self.angles = []
-        self.torques = []
-        self.preloads = []
-        self.timestamps = []
-        self.max_torque = 0
-        self.max_preload = 0
+        self.buffer.clear()
+        self.drawn_version = 0
+        self.channel_stats.reset()
         self.update_count = 0
         
         # Update plots with empty data
-        self.torque_line.set_data([], [])
-        self.preload_line.set_data([], [])
-        self.canvas.draw()
+        def clear_lines():
+            for line in self.channel_lines.values():
+                line.set_data([], [])
+        self._redraw(clear_lines)
+        if self.polar_panel is not None:
+            self.polar_panel.clear()
+        # The detector runs on the acquisition thread; it resets on its next batch
+        if self.cycle_detector is not None:
+            self.cycle_detector.request_reset()
         
         # Reset statistics
-        self.max_torque_var.set("0.0 Nm")
-        self.max_preload_var.set("0.0 N")
+        for name, var in self.max_vars.items():
+            var.set(f"0.0 {self.display_schema[name].unit}")
         self.current_angle_var.set("0.0°")
         
         self.status_var.set("Data cleared")
@@ -450,9 +605,104 @@ class SensorGUI:
         self.status_var.set("Export functionality not yet implemented")
         # TODO: Implement data export to CSV
     
+    def open_spectrum(self):
+        """Open (or raise) the torque spectrum window"""
+        if self.spectrum_window is not None:
+            self.spectrum_window.lift()
+            return
+        
+        self.spectrum_window = tk.Toplevel(self.root)
+        self.spectrum_window.title("Torque Spectrum")
+        self.spectrum_window.geometry("700x450")
+        self.spectrum_window.protocol("WM_DELETE_WINDOW", self.close_spectrum)
+        
+        self.spectrum_panel = SpectrumPanel(self.spectrum_window, channel="torque")
+        self.spectrum_panel.start()
+    
+    def close_spectrum(self):
+        """Close the spectrum window and stop its worker"""
+        if self.spectrum_panel is not None:
+            self.spectrum_panel.stop()
+            self.spectrum_panel = None
+        if self.spectrum_window is not None:
+            self.spectrum_window.destroy()
+            self.spectrum_window = None
+    
+    def open_polar(self):
+        """Open (or raise) the live polar torque window"""
+        if self.polar_window is not None:
+            self.polar_window.lift()
+            return
+        
+        self.polar_window = tk.Toplevel(self.root)
+        self.polar_window.title("Torque vs Angle (Polar)")
+        self.polar_window.geometry("600x600")
+        self.polar_window.protocol("WM_DELETE_WINDOW", self.close_polar)
+        
+        self.polar_panel = PolarPanel(self.polar_window, channel="torque")
+    
+    def close_polar(self):
+        """Close the polar window"""
+        self.polar_panel = None
+        if self.polar_window is not None:
+            self.polar_window.destroy()
+            self.polar_window = None
+    
+    def open_cycles(self):
+        """Open (or raise) the per-cycle trend window"""
+        if self.cycle_window is not None:
+            self.cycle_window.lift()
+            return
+        
+        self.cycle_window = tk.Toplevel(self.root)
+        self.cycle_window.title("Per-Cycle Trend")
+        self.cycle_window.geometry("700x500")
+        self.cycle_window.protocol("WM_DELETE_WINDOW", self.close_cycles)
+        
+        self.cycle_panel = CycleTrendPanel(self.cycle_window, self.cycle_detector.table)
+        self.cycle_panel.start()
+    
+    def close_cycles(self):
+        """Close the per-cycle trend window"""
+        if self.cycle_panel is not None:
+            self.cycle_panel.stop()
+            self.cycle_panel = None
+        if self.cycle_window is not None:
+            self.cycle_window.destroy()
+            self.cycle_window = None
+    
+    def open_triggers(self):
+        """Open (or raise) the triggered capture window"""
+        if self.trigger_window is not None:
+            self.trigger_window.lift()
+            return
+        
+        self.trigger_window = tk.Toplevel(self.root)
+        self.trigger_window.title("Triggered Captures")
+        self.trigger_window.geometry("900x500")
+        self.trigger_window.protocol("WM_DELETE_WINDOW", self.close_triggers)
+        
+        self.trigger_panel = TriggerPanel(self.trigger_window, self.trigger_engine.store, self.schema)
+        self.trigger_panel.start()
+    
+    def close_triggers(self):
+        """Close the triggered capture window"""
+        if self.trigger_panel is not None:
+            self.trigger_panel.stop()
+            self.trigger_panel = None
+        if self.trigger_window is not None:
+            self.trigger_window.destroy()
+            self.trigger_window = None
+    
     def on_closing(self):
         """Handle window close event"""
+        self.close_spectrum()
+        self.close_polar()
+        self.close_cycles()
+        self.close_triggers()
         self.stop_visualization()
+        if self.renderer is not None:
+            self.renderer.stop()
         if hasattr(self, 'alert_manager'):
             self.alert_manager.cleanup()
         self.root.destroy()
@@ -463,110 +713,155 @@ class SensorGUI:
             try:
                 # Try to get data from queue with timeout
                 try:
-                    data = self.data_queue.get(timeout=0.1)
+                    batch = [self.data_queue.get(timeout=0.1)]
                 except queue.Empty:
                     continue
                 
-                # Process the data (store for next UI update)
-                if data:
-                    angle = data.get('angle', 0)
-                    torque = data.get('torque', 0)
-                    preload = data.get('preload', 0)
-                    timestamp = data.get('timestamp', time.time())
-                    
-                    # Add data to lists
-                    self.angles.append(angle)
-                    self.torques.append(torque)
-                    self.preloads.append(preload)
-                    self.timestamps.append(timestamp)
-                    
-                    # Limit data points
-                    max_points = self.points_var.get()
-                    if len(self.angles) > max_points:
-                        self.angles = self.angles[-max_points:]
-                        self.torques = self.torques[-max_points:]
-                        self.preloads = self.preloads[-max_points:]
-                        self.timestamps = self.timestamps[-max_points:]
-                    
-                    # Update statistics
-                    if torque > self.max_torque:
-                        self.max_torque = torque
-                    if preload > self.max_preload:
-                        self.max_preload = preload
+                # Drain whatever else is already queued so it is published once
+                while len(batch) < 100:
+                    try:
+                        batch.append(self.data_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                
+                self._ingest([data for data in batch if data])
+                
+                # Expose the new samples to the renderer in one atomic swap
+                self.buffer.publish(window=self.display_points)
                 
             except Exception as e:
                 print(f"Error in animation loop: {str(e)}")
                 time.sleep(0.5)
     
+    def _ingest(self, frames):
+        """Store a batch of frames column-wise (ingest thread)"""
+        records = self.schema.pack(frames)
+        # Derived columns are computed once here and shared by every consumer
+        batch = self.derived.process(self.schema.columns(records))
+        block = np.column_stack([batch[name] for name in self.channels])
+        self.buffer.extend(block)
+        self.channel_stats.update(block[:, 1:])
+        
+        # Hand the frames to the spectrum and polar workers, if open
+        for panel in (self.spectrum_panel, self.polar_panel):
+            if panel is not None:
+                for data in frames:
+                    panel.feed(data)
+    
     def _update_plots(self):
-        """Update the plots with new data"""
-        if not self.angles:
-            return
+        """
+        Update the plots with new data
+        
+        Returns:
+            True if new data was drawn
+        """
+        snapshot = self.buffer.snapshot()
+        
+        # Nothing new since the last frame: skip the redraw entirely
+        if snapshot.version == self.drawn_version or snapshot.length == 0:
+            return False
+        self.drawn_version = snapshot.version
+        
+        columns = snapshot.columns
+        angles = columns[self.x_channel]
             
-        # Update torque plot
-        self.torque_line.set_data(self.angles, self.torques)
-        self.ax1.relim()
-        self.ax1.autoscale_view()
-        
-        # Update preload plot
-        self.preload_line.set_data(self.angles, self.preloads)
-        self.ax2.relim()
-        self.ax2.autoscale_view()
-        
-        # Ensure threshold lines are on top and visible based on settings
-        if self.torque_threshold is not None and self.torque_threshold_enabled.get():
-            self.torque_threshold_line.set_visible(True)
-            # Raise threshold line to top to ensure it's visible
-            self.ax1.figure.canvas.draw_idle()
+        show_torque_threshold = (self.torque_threshold is not None
+                                 and self.torque_threshold_enabled.get())
+        show_preload_threshold = (self.preload_threshold is not None
+                                  and self.preload_threshold_enabled.get())
+        
+        def update_lines():
+            # Update every channel plot
+            for name, line in self.channel_lines.items():
+                line.set_data(angles, columns[name])
+                line.axes.relim()
+                line.axes.autoscale_view()
             
+            # Ensure threshold lines are visible based on settings
+            if show_torque_threshold:
+                self.torque_threshold_line.set_visible(True)
+            if show_preload_threshold:
+                self.preload_threshold_line.set_visible(True)
+        
+        # Redraw the canvas (snapshot columns are immutable, so this may run
+        # on the render thread)
+        self._redraw(update_lines)
+        
+        if show_torque_threshold:
             # Check for torque threshold breach
-            if self.torques and self.torques[-1] > self.torque_threshold:
+            torques = columns['torque']
+            if torques[-1] > self.torque_threshold:
                 self.alert_manager.alert(
                     "torque_high",
-                    f"Warning: Torque exceeds threshold!\nCurrent: {self.torques[-1]:.1f} Nm\nThreshold: {self.torque_threshold:.1f} Nm",
+                    f"Warning: Torque exceeds threshold!\nCurrent: {torques[-1]:.1f} Nm\nThreshold: {self.torque_threshold:.1f} Nm",
                     sound=True,
                     popup=True
                 )
             else:
                 self.alert_manager.dismiss_alert("torque_high")
         
-        if self.preload_threshold is not None and self.preload_threshold_enabled.get():
-            self.preload_threshold_line.set_visible(True)
-            # Raise threshold line to top to ensure it's visible
-            self.ax2.figure.canvas.draw_idle()
-            
+        if show_preload_threshold:
             # Check for preload threshold breach
-            if self.preloads and self.preloads[-1] > self.preload_threshold:
+            preloads = columns['preload']
+            if preloads[-1] > self.preload_threshold:
                 self.alert_manager.alert(
                     "preload_high",
-                    f"Warning: Preload exceeds threshold!\nCurrent: {self.preloads[-1]:.1f} N\nThreshold: {self.preload_threshold:.1f} N",
+                    f"Warning: Preload exceeds threshold!\nCurrent: {preloads[-1]:.1f} N\nThreshold: {self.preload_threshold:.1f} N",
                     sound=True,
                     popup=False  # Only buzzer for preload, no popup
                 )
             else:
                 self.alert_manager.dismiss_alert("preload_high")
         
-        # Redraw the canvas
-        self.canvas.draw_idle()
-        
         # Update statistics display
-        self.max_torque_var.set(f"{self.max_torque:.1f} Nm")
-        self.max_preload_var.set(f"{self.max_preload:.1f} N")
+        maximum = self.channel_stats.maximum
+        for name, var in self.max_vars.items():
+            value = maximum[self.display_schema.index(name)]
+            var.set(f"{value if np.isfinite(value) else 0.0:.1f} {self.display_schema[name].unit}")
         
         # Update current angle (most recent)
-        if self.angles:
-            self.current_angle_var.set(f"{self.angles[-1]:.1f}°")
+        self.current_angle_var.set(f"{angles[-1]:.1f}°")
         
         # Update count for debugging
         self.update_count += 1
+        return True
+
+    def _on_canvas_draw(self, event):
+        """Record how long the frame took, from tick start to finished render"""
+        if self.frame_start is not None:
+            self.scheduler.record_frame((time.perf_counter() - self.frame_start) * 1000.0)
+            self.frame_start = None
+    
+    def _update_render_stats(self):
+        """Show the effective refresh rate and frame cost"""
+        stats = self.scheduler.get_stats()
+        if stats['idle']:
+            self.render_stats_var.set(f"idle ({self.update_interval} ms)")
+        else:
+            self.render_stats_var.set(
+                f"{stats['fps']:.1f} fps, frame {stats['mean_ms']:.1f} ms "
+                f"(max {stats['max_ms']:.1f})"
+            )
 
     def _schedule_update(self):
         """Schedule the next UI update if still running"""
         if self.running:
+            tick_start = time.perf_counter()
+            
             # Update the plots
-            self._update_plots()
+            drew = self._update_plots()
+            if drew and self.renderer is None:
+                # Timed until the deferred draw completes (see _on_canvas_draw)
+                self.frame_start = tick_start
+            
+            # The polar view blits only its live trace, so it shares this tick
+            if self.polar_panel is not None:
+                self.polar_panel.update()
             
-            # Schedule next update
+            # Schedule next update based on render cost, data flow and visibility
+            visible = self.root.state() != "iconic"
+            self.update_interval = self.scheduler.next_interval(drew, visible)
+            self._update_render_stats()
             self.root.after(self.update_interval, self._schedule_update)
     
     def run(self):
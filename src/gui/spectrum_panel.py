@@ -0,0 +1,167 @@
+# src/gui/spectrum_panel.py
+import tkinter as tk
+from collections import deque
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+import threading
+import time
+
+import numpy as np
+
+from src.data.spectrum import SlidingSpectrum
+from src.gui.plots import create_spectrum_plot, update_spectrum_plot
+
+
+class SpectrumPanel:
+    """
+    Live spectrum of one channel, embedded in any Tk container
+
+    Samples are handed over with feed() from the data thread. A worker
+    thread does all FFT work; the Tk thread only copies the latest finished
+    PSD into the line artist at its own (slower) refresh rate.
+    """
+
+    def __init__(self, parent, channel="torque", nfft=256, hop=32, averages=8,
+                 refresh_interval=500):
+        """
+        Initialize the spectrum panel
+
+        Args:
+            parent: Tk widget to pack the canvas into
+            channel: Frame key to analyse
+            nfft: FFT length in samples
+            hop: Samples between FFT frames
+            averages: Number of frames averaged into the PSD
+            refresh_interval: Milliseconds between spectrum redraws
+        """
+        self.parent = parent
+        self.channel = channel
+        self.refresh_interval = refresh_interval
+        self.spectrum = SlidingSpectrum(nfft=nfft, hop=hop, averages=averages)
+
+        # Pending samples from the data thread (deque append/popleft are atomic)
+        self.pending = deque(maxlen=16 * nfft)
+
+        # Latest finished result, swapped as a whole under the lock
+        self.result_lock = threading.Lock()
+        self.result = None
+        self.result_version = 0
+        self.drawn_version = 0
+
+        # Sample period estimate derived from frame timestamps
+        self.sample_period = None
+        self.last_timestamp = None
+
+        self.running = False
+        self.worker = None
+        self.stop_event = threading.Event()
+        self.after_id = None
+
+        self.fig, self.ax = create_spectrum_plot(title=f"{channel.capitalize()} Spectrum")
+        self.line = None
+        self.peak_var = tk.StringVar(value="Peak: -")
+        tk.Label(parent, textvariable=self.peak_var).pack(side=tk.BOTTOM, anchor="w")
+        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def feed(self, frame):
+        """
+        Queue one data frame for analysis (safe to call from any thread)
+
+        Args:
+            frame: Dictionary with 'timestamp' and the analysed channel
+        """
+        value = frame.get(self.channel)
+        # NaN marks a channel missing from a partial frame
+        if value is not None and value == value:
+            self.pending.append((frame.get('timestamp'), value))
+
+    def start(self):
+        """Start the FFT worker and the periodic redraw"""
+        if self.running:
+            return
+        self.running = True
+        self.stop_event.clear()
+        self.worker = threading.Thread(target=self._worker_loop, daemon=True)
+        self.worker.start()
+        self._schedule_refresh()
+
+    def stop(self):
+        """Stop the worker and cancel the pending redraw"""
+        if not self.running:
+            return
+        self.running = False
+        self.stop_event.set()
+        if self.after_id is not None:
+            try:
+                self.parent.after_cancel(self.after_id)
+            except tk.TclError:
+                pass
+            self.after_id = None
+        if self.worker:
+            self.worker.join(timeout=1.0)
+
+    def _drain_pending(self):
+        """Move queued samples into an array and update the sample period"""
+        count = len(self.pending)
+        if count == 0:
+            return None
+        items = [self.pending.popleft() for _ in range(count)]
+        timestamps = [t for t, _ in items if t is not None]
+        if self.last_timestamp is not None:
+            timestamps.insert(0, self.last_timestamp)
+        if len(timestamps) >= 2:
+            period = (timestamps[-1] - timestamps[0]) / (len(timestamps) - 1)
+            if period > 0:
+                # Smooth the estimate so the frequency axis does not jitter
+                if self.sample_period is None:
+                    self.sample_period = period
+                else:
+                    self.sample_period += 0.05 * (period - self.sample_period)
+            self.last_timestamp = timestamps[-1]
+        return np.fromiter((v for _, v in items), dtype=np.float64, count=count)
+
+    def _worker_loop(self):
+        """Background FFT computation"""
+        while not self.stop_event.is_set():
+            try:
+                samples = self._drain_pending()
+                if samples is not None:
+                    if self.sample_period:
+                        rate = 1.0 / self.sample_period
+                        if abs(rate - self.spectrum.sample_rate) > 0.01 * rate:
+                            self.spectrum.set_sample_rate(rate)
+                    if self.spectrum.push(samples):
+                        # Hand the Tk thread its own copy to draw from
+                        result = (self.spectrum.frequencies.copy(),
+                                  self.spectrum.psd.copy(),
+                                  self.spectrum.peak_frequency())
+                        with self.result_lock:
+                            self.result = result
+                            self.result_version += 1
+                time.sleep(0.02)
+            except Exception as e:
+                print(f"Error in spectrum worker: {str(e)}")
+                time.sleep(0.5)
+
+    def _refresh(self):
+        """Draw the latest PSD if a new one is available (Tk thread)"""
+        with self.result_lock:
+            result = self.result
+            version = self.result_version
+        if result is None or version == self.drawn_version:
+            return
+
+        frequencies, psd, peak = result
+        # Keep the log axis valid when a bin is exactly zero
+        np.maximum(psd, 1e-12, out=psd)
+        self.line = update_spectrum_plot(self.ax, frequencies, psd, self.line)
+        self.peak_var.set(f"Peak: {peak:.2f} Hz")
+        self.canvas.draw_idle()
+        self.drawn_version = version
+
+    def _schedule_refresh(self):
+        """Schedule the next spectrum redraw if still running"""
+        if self.running:
+            self._refresh()
+            self.after_id = self.parent.after(self.refresh_interval, self._schedule_refresh)
@@ -0,0 +1,131 @@
+# src/gui/trigger_panel.py
+import tkinter as tk
+from tkinter import filedialog, ttk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+from src.gui.plots import create_capture_plot
+
+# Line styles of the captured channels, cycled for larger schemas
+CAPTURE_STYLES = ('b-', 'r-', 'g-', 'm-', 'c-', 'k-')
+
+
+class TriggerPanel:
+    """List of triggered captures with a plot of the selected one"""
+
+    def __init__(self, parent, store, schema, refresh_interval=500):
+        """
+        Initialize the capture panel
+
+        Args:
+            parent: Tk widget to pack the panel into
+            store: CaptureStore filled by a TriggerEngine on the data thread
+            schema: ChannelSchema of the captures (for labels and units)
+            refresh_interval: Milliseconds between checks for new captures
+        """
+        self.parent = parent
+        self.store = store
+        self.schema = schema
+        self.refresh_interval = refresh_interval
+        self.listed_state = None
+        self.captures = []
+        self.after_id = None
+
+        side = ttk.Frame(parent, padding="5")
+        side.pack(side=tk.LEFT, fill=tk.Y)
+        self.listbox = tk.Listbox(side, width=34, exportselection=False)
+        self.listbox.pack(fill=tk.Y, expand=True)
+        self.listbox.bind("<<ListboxSelect>>", lambda event: self._show_selected())
+        ttk.Button(side, text="Export CSV", command=self.export_selected).pack(fill=tk.X, pady=2)
+        ttk.Button(side, text="Clear", command=self.clear).pack(fill=tk.X, pady=2)
+
+        self.status_var = tk.StringVar(value="Waiting for a trigger")
+        tk.Label(parent, textvariable=self.status_var).pack(side=tk.BOTTOM, anchor="w")
+        self.fig, self.ax = create_capture_plot()
+        self.canvas = FigureCanvasTkAgg(self.fig, master=parent)
+        self.canvas.draw()
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+
+    def start(self):
+        self._schedule_refresh()
+
+    def stop(self):
+        if self.after_id is not None:
+            try:
+                self.parent.after_cancel(self.after_id)
+            except tk.TclError:
+                pass
+            self.after_id = None
+
+    def clear(self):
+        self.store.clear()
+        self.listed_state = None
+        self._refresh()
+
+    def export_selected(self):
+        """Write the selected capture to a CSV file chosen by the user"""
+        capture = self._selected()
+        if capture is None:
+            self.status_var.set("Select a capture to export")
+            return
+        path = filedialog.asksaveasfilename(
+            parent=self.parent, defaultextension=".csv",
+            initialfile=f"capture_{capture.number}.csv",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+        )
+        if not path:
+            return
+        self.store.export_csv(capture, path)
+        self.status_var.set(f"Capture {capture.number} exported to {path}")
+
+    def _selected(self):
+        selection = self.listbox.curselection()
+        return self.captures[selection[0]] if selection else None
+
+    def _refresh(self):
+        """Relist only when captures were added or removed"""
+        captures = self.store.list()
+        state = (self.store.count, len(captures))
+        if state == self.listed_state:
+            return
+        self.listed_state = state
+        self.captures = captures
+
+        self.listbox.delete(0, tk.END)
+        for capture in captures:
+            self.listbox.insert(tk.END, f"#{capture.number} {capture.trigger} at {capture.time:.3f} s"
+                                        f"{'' if capture.complete else ' (incomplete)'}")
+        if captures:
+            # Follow the newest capture
+            self.listbox.selection_set(tk.END)
+            self.listbox.see(tk.END)
+        self._show_selected()
+
+    def _show_selected(self):
+        capture = self._selected()
+        for line in list(self.ax.lines):
+            line.remove()
+        if self.ax.get_legend() is not None:
+            self.ax.get_legend().remove()
+        if capture is None:
+            self.canvas.draw_idle()
+            return
+
+        relative = (capture.columns['timestamp'] - capture.time) * 1000.0
+        names = [name for name in self.schema.names if name != 'angle' and name in capture.columns]
+        for index, name in enumerate(names):
+            channel = self.schema[name]
+            self.ax.plot(relative, capture.columns[name], CAPTURE_STYLES[index % len(CAPTURE_STYLES)],
+                         label=f"{channel.label or name} ({channel.unit})",
+                         linewidth=2 if name == capture.channel else 1)
+        self.ax.axvline(0.0, color='k', linestyle='--', linewidth=1)
+        self.ax.legend()
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self.canvas.draw_idle()
+        self.status_var.set(f"Capture {capture.number}: {capture.trigger}, "
+                            f"{len(relative)} samples"
+                            f"{'' if capture.complete else ', start of the window lost'}")
+
+    def _schedule_refresh(self):
+        self._refresh()
+        self.after_id = self.parent.after(self.refresh_interval, self._schedule_refresh)
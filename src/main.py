@@ -1,25 +1,87 @@
 """
 Main entry point for the sensor visualization application
 """
+import argparse
 import queue
 
+from src.data.cycles import CycleDetector
 from src.data.data_source import DataSource
-from src.gui.sensor_gui import SensorGUI
+from src.data.decimation import DecimationStage
+from src.data.derived import STANDARD_DERIVED
+from src.data.triggers import TriggerEngine, parse_trigger
+from src.remote.client import FrameClient
+from src.remote.protocol import parse_address
+from src.sensors.channels import DEFAULT_SCHEMA, ChannelSchema
 
-def main():
-    """Main application entry point"""
+def main(num_rigs=1, decimate=1, connect=None, render_mode="tk", schema=DEFAULT_SCHEMA,
+         triggers=(), pre_ms=100.0, post_ms=100.0, derived=()):
+    """
+    Main application entry point
+    
+    Args:
+        num_rigs: Number of rigs to acquire; more than one opens the rig grid view
+        decimate: Display decimation factor for the single-rig view (min/max
+            preserving, angle picked rather than averaged); with connect it
+            is requested from the daemon instead
+        connect: Address of a running acquisition daemon (src.daemon); the
+            GUI then only displays and closing it leaves acquisition running
+        render_mode: "offscreen" renders the single-rig plots on a worker thread
+        schema: ChannelSchema of the single-rig view; with connect it must
+            match the daemon's --channels
+        triggers: Trigger conditions captured from the full-rate stream of
+            a local single-rig data source
+        pre_ms: Milliseconds captured before each trigger
+        post_ms: Milliseconds captured after each trigger
+        derived: Derived channels plotted in the single-rig view (e.g. power)
+    """
     print("Starting sensor visualization application")
     
     try:
-        # Create communication queue for data flow
-        data_queue = queue.Queue(maxsize=100)
-        
-        # Initialize the data source
-        # Mode can be "hardware" for real sensors or "simulation" for testing
-        data_source = DataSource(data_queue, mode="simulation")  # Using simulation mode for testing
-        
-        # Create and run the GUI
-        app = SensorGUI(data_queue)
+        if num_rigs > 1:
+            from src.gui.rig_grid_gui import RigGridGUI
+            
+            # Several rigs share one queue; frames are tagged with their rig id
+            data_queue = queue.Queue(maxsize=100 * num_rigs)
+            if connect:
+                data_source = FrameClient(data_queue, parse_address(connect), decimation=decimate)
+            else:
+                data_source = DataSource(data_queue, mode="hardware", num_rigs=num_rigs)
+            app = RigGridGUI(data_queue, rig_ids=range(num_rigs))
+        else:
+            from src.gui.sensor_gui import SensorGUI
+            
+            # Create communication queue for data flow
+            data_queue = queue.Queue(maxsize=100)
+            
+            # Initialize the data source
+            # Mode can be "hardware" for real sensors or "simulation" for testing
+            if connect:
+                # The daemon decimates before sending, so only drawable frames travel
+                data_source = FrameClient(data_queue, parse_address(connect), decimation=decimate)
+            else:
+                decimation = None
+                if decimate > 1:
+                    decimation = DecimationStage(decimate, "minmax", {'angle': "pick"})
+                data_source = DataSource(data_queue, mode="simulation", decimation=decimation,
+                                         schema=schema)  # Using simulation mode for testing
+            
+            # Triggers and cycle detection need the full-rate frames, which
+            # only a local source has
+            trigger_engine = None
+            cycle_detector = None
+            if triggers and connect:
+                print("Triggers are ignored with --connect (only decimated frames arrive)")
+            elif triggers:
+                trigger_engine = TriggerEngine(triggers, schema, pre_ms=pre_ms, post_ms=post_ms)
+                data_source.add_frame_listener(trigger_engine.feed)
+            if not connect and 'angle' in schema:
+                cycle_detector = CycleDetector(schema=schema)
+                data_source.add_frame_listener(cycle_detector.feed)
+            
+            # Create and run the GUI
+            app = SensorGUI(data_queue, render_mode=render_mode, schema=schema,
+                            trigger_engine=trigger_engine, derived=derived,
+                            cycle_detector=cycle_detector)
         
         # Start data source in background thread
         data_source.start()
@@ -35,4 +97,25 @@ def main():
         print(f"Error in main: {str(e)}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="SensorViz")
+    parser.add_argument("--rigs", type=int, default=1, help="Number of rigs to acquire")
+    parser.add_argument("--decimate", type=int, default=1,
+                        help="Display decimation factor (single rig)")
+    parser.add_argument("--connect", help="host:port or socket path of a running src.daemon")
+    parser.add_argument("--render", choices=("tk", "offscreen"), default="tk",
+                        help="Draw plots on the Tk thread or on a worker thread")
+    parser.add_argument("--channels", help="Channel schema JSON file (e.g. config/channels.json)")
+    parser.add_argument("--trigger", action="append", default=[], type=parse_trigger,
+                        metavar="SPEC", help="Capture around e.g. torque:level:80, "
+                        "torque:edge:80:falling or preload:window:150:300 (repeatable)")
+    parser.add_argument("--pre-ms", type=float, default=100.0, help="Capture before a trigger (ms)")
+    parser.add_argument("--post-ms", type=float, default=100.0, help="Capture after a trigger (ms)")
+    parser.add_argument("--derived", action="append", default=[],
+                        choices=[channel.name for channel in STANDARD_DERIVED],
+                        help="Also plot a derived channel (repeatable)")
+    args = parser.parse_args()
+    main(num_rigs=args.rigs, decimate=args.decimate, connect=args.connect,
+         render_mode=args.render,
+         schema=ChannelSchema.load(args.channels) if args.channels else DEFAULT_SCHEMA,
+         triggers=args.trigger, pre_ms=args.pre_ms, post_ms=args.post_ms,
+         derived=args.derived)
\ No newline at end of file
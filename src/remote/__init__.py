@@ -0,0 +1,6 @@
+# src/remote/__init__.py
+from .server import FrameServer
+from .client import FrameClient
+
+# This allows direct imports from the remote package:
+# from src.remote import FrameServer, FrameClient
\ No newline at end of file
@@ -0,0 +1,132 @@
+# src/remote/client.py
+"""
+Thin GUI-side client of the acquisition daemon
+
+Connects to a FrameServer, subscribes with the decimation the GUI can
+draw and puts the received frames on an ordinary queue, so SensorGUI and
+RigGridGUI consume a remote daemon exactly like a local DataSource.
+"""
+import queue
+import socket
+import threading
+
+from ..sensors.channels import DEFAULT_SCHEMA
+from .protocol import (
+    DEFAULT_ADDRESS, MSG_FRAMES, MSG_SCHEMA, MessageReader, decode_frames, decode_schema,
+    encode_subscribe, frames_from_records,
+)
+
+
+class FrameClient:
+    """Receives frames from a remote acquisition daemon"""
+
+    def __init__(self, data_queue, address=DEFAULT_ADDRESS, decimation=1, method="minmax",
+                 reconnect_interval=2.0):
+        """
+        Args:
+            data_queue: Queue the received frames are put on
+            address: Daemon (host, port) or Unix socket path
+            decimation: Frames the daemon should reduce into one before sending
+            method: Decimation method used by the daemon (see DecimationStage)
+            reconnect_interval: Seconds between connection attempts
+        """
+        self.data_queue = data_queue
+        self.address = address
+        self.decimation = decimation
+        self.method = method
+        self.reconnect_interval = reconnect_interval
+        # Replaced by the schema the daemon sends on subscription
+        self.schema = DEFAULT_SCHEMA
+        self.running = False
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.sock = None
+        self.connected = False
+
+        self.frames_received = 0
+        self.frames_dropped = 0
+        self.bytes_received = 0
+
+    def start(self):
+        """Start the receive thread (connects in the background)"""
+        if self.running:
+            print("Frame client is already running")
+            return
+        self.stop_event.clear()
+        self.running = True
+        self.thread = threading.Thread(target=self._receive_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Disconnect; the daemon keeps acquiring"""
+        if not self.running:
+            return
+        self.stop_event.set()
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+    def subscribe(self, decimation, method=None):
+        """Change the requested decimation of a running connection"""
+        self.decimation = decimation
+        if method is not None:
+            self.method = method
+        sock = self.sock
+        if sock is not None:
+            sock.sendall(encode_subscribe(self.decimation, self.method))
+
+    def _connect(self):
+        family = socket.AF_UNIX if isinstance(self.address, str) else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.settimeout(0.5)
+        sock.connect(self.address)
+        sock.sendall(encode_subscribe(self.decimation, self.method))
+        return sock
+
+    def _receive_loop(self):
+        while not self.stop_event.is_set():
+            try:
+                self.sock = self._connect()
+            except OSError as e:
+                print(f"Cannot connect to acquisition daemon at {self.address}: {str(e)}")
+                self.stop_event.wait(self.reconnect_interval)
+                continue
+
+            print(f"Connected to acquisition daemon at {self.address}")
+            self.connected = True
+            reader = MessageReader()
+            try:
+                while not self.stop_event.is_set():
+                    try:
+                        data = self.sock.recv(65536)
+                    except socket.timeout:
+                        continue
+                    if not data:
+                        print("Acquisition daemon closed the connection")
+                        break
+                    self.bytes_received += len(data)
+                    for kind, payload in reader.feed(data):
+                        if kind == MSG_SCHEMA:
+                            self.schema = decode_schema(payload)
+                        elif kind == MSG_FRAMES:
+                            records = decode_frames(payload, self.schema)
+                            self._deliver(frames_from_records(records, self.schema))
+            except (OSError, ValueError) as e:
+                print(f"Error receiving frames: {str(e)}")
+            finally:
+                self.connected = False
+                self.sock.close()
+                self.sock = None
+
+            self.stop_event.wait(self.reconnect_interval)
+
+    def _deliver(self, frames):
+        for frame in frames:
+            try:
+                self.data_queue.put_nowait(frame)
+            except queue.Full:
+                # The GUI is behind; newer frames are more useful than old ones
+                self.frames_dropped += 1
+                continue
+            self.frames_received += 1
@@ -0,0 +1,134 @@
+# src/remote/protocol.py
+"""
+Wire protocol between the acquisition daemon and remote GUI clients
+
+Every message is a header followed by its payload:
+
+    type    uint8     MSG_* constant
+    length  uint32    payload length in bytes
+
+MSG_SUBSCRIBE   client -> daemon, JSON {"decimation": N, "method": "minmax"}
+MSG_FRAMES      daemon -> client, zlib-compressed array of wire records
+MSG_SCHEMA      daemon -> client, JSON channel schema (ChannelSchema.to_config),
+                sent before the first frames of a subscription
+
+Frames travel as packed little-endian records rather than pickled objects,
+so a batch of a few hundred frames is one zlib call and one np.frombuffer.
+The record layout is the channel schema's wire_dtype(); WIRE_DTYPE is the
+layout of the standard angle/torque/preload schema.
+"""
+import json
+import struct
+import zlib
+
+import numpy as np
+
+from ..sensors.channels import DEFAULT_SCHEMA, ChannelSchema
+from ..sensors.sample import Sample
+
+DEFAULT_ADDRESS = ("127.0.0.1", 5760)
+
+HEADER = struct.Struct("<BI")
+MSG_SUBSCRIBE = 1
+MSG_FRAMES = 2
+MSG_SCHEMA = 3
+MAX_MESSAGE = 16 * 2 ** 20
+
+# rig is -1 for frames without a rig id
+WIRE_DTYPE = DEFAULT_SCHEMA.wire_dtype()
+
+
+def parse_address(text):
+    """
+    Parse "host:port" into a TCP address, anything containing a slash
+    into a Unix socket path
+    """
+    if "/" in text:
+        return text
+    host, _, port = text.rpartition(":")
+    return (host or DEFAULT_ADDRESS[0], int(port))
+
+
+def encode_message(kind, payload):
+    return HEADER.pack(kind, len(payload)) + payload
+
+
+def encode_subscribe(decimation=1, method="minmax"):
+    return encode_message(MSG_SUBSCRIBE, json.dumps(
+        {'decimation': int(decimation), 'method': method}
+    ).encode())
+
+
+def decode_subscribe(payload):
+    request = json.loads(payload.decode())
+    return max(1, int(request.get('decimation', 1))), request.get('method', "minmax")
+
+
+def encode_schema(schema):
+    return encode_message(MSG_SCHEMA, json.dumps(schema.to_config()).encode())
+
+
+def decode_schema(payload):
+    return ChannelSchema.from_config(json.loads(payload.decode()))
+
+
+def records_from_frames(frames, schema=DEFAULT_SCHEMA):
+    """Pack frames (Samples or dictionaries) into an array of the schema's wire records"""
+    return schema.pack(frames, schema.wire_dtype())
+
+
+def encode_frames(records, level=1):
+    """MSG_FRAMES message for a WIRE_DTYPE array"""
+    return encode_message(MSG_FRAMES, zlib.compress(records.tobytes(), level))
+
+
+def decode_frames(payload, schema=DEFAULT_SCHEMA):
+    """Wire record array from a MSG_FRAMES payload"""
+    return np.frombuffer(zlib.decompress(payload), dtype=schema.wire_dtype())
+
+
+def frames_from_records(records, schema=DEFAULT_SCHEMA):
+    """
+    Frames for the GUI, one per record, with NaN channels marked invalid
+
+    Returns:
+        Sample objects for the standard schema, dictionaries otherwise
+    """
+    valid = schema.valid_masks(records).tolist()
+    rigs = [None if rig < 0 else rig for rig in records['rig'].tolist()]
+    timestamps = records['timestamp'].tolist()
+    values = zip(*(records[name].tolist() for name in schema.names))
+    if schema == DEFAULT_SCHEMA:
+        return [Sample(rig, timestamp, *row, flags)
+                for rig, timestamp, row, flags in zip(rigs, timestamps, values, valid)]
+    return [
+        dict(zip(schema.names, row), rig_id=rig, timestamp=timestamp, valid=flags)
+        for rig, timestamp, row, flags in zip(rigs, timestamps, values, valid)
+    ]
+
+
+class MessageReader:
+    """Splits a byte stream into (type, payload) messages"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        """
+        Add received bytes
+
+        Returns:
+            List of complete (type, payload) messages
+        """
+        self.buffer += data
+        messages = []
+        while len(self.buffer) >= HEADER.size:
+            kind, length = HEADER.unpack_from(self.buffer)
+            if length > MAX_MESSAGE:
+                raise ValueError(f"Message too large: {length} bytes")
+            end = HEADER.size + length
+            if len(self.buffer) < end:
+                break
+            messages.append((kind, bytes(self.buffer[HEADER.size:end])))
+            del self.buffer[:end]
+        return messages
@@ -0,0 +1,247 @@
+# src/remote/server.py
+"""
+Frame server run by the acquisition daemon
+
+The acquisition side only appends frames to a pending list. One server
+thread multiplexes all client sockets with selectors: every send interval
+it packs the pending frames once, reduces them with each client's own
+DecimationStage and queues the compressed batch on that client's
+non-blocking socket. A client that cannot keep up loses whole batches
+instead of slowing acquisition or other clients.
+"""
+import os
+import selectors
+import socket
+import threading
+import time
+
+import numpy as np
+
+from ..data.decimation import DecimationStage
+from ..sensors.channels import DEFAULT_SCHEMA
+from .protocol import (
+    DEFAULT_ADDRESS, MSG_SUBSCRIBE, MessageReader, decode_subscribe, encode_frames,
+    encode_schema, records_from_frames,
+)
+
+
+class _Client:
+    """Connection state of one subscriber"""
+
+    def __init__(self, sock, address, schema):
+        self.sock = sock
+        self.address = address
+        self.names = ('timestamp',) + schema.names
+        self.reader = MessageReader()
+        self.outbound = bytearray()
+        self.subscribed = False
+        # Rig id -> DecimationStage, so rigs never share filter state
+        self.stages = {}
+        self.decimation = 1
+        self.method = "minmax"
+        self.batches_dropped = 0
+
+    def subscribe(self, decimation, method):
+        self.decimation = decimation
+        self.method = method
+        self.stages = {}
+        self.subscribed = True
+
+    def reduce(self, records):
+        """Apply this client's decimation to a batch of wire records"""
+        if self.decimation == 1 or records.size == 0:
+            return records
+        parts = []
+        for rig in np.unique(records['rig']):
+            rows = records[records['rig'] == rig]
+            stage = self.stages.get(rig)
+            if stage is None:
+                # The angle wraps at 360, so it is picked rather than averaged
+                stage = DecimationStage(self.decimation, self.method,
+                                        {'angle': "pick"} if 'angle' in self.names else None)
+                self.stages[rig] = stage
+            reduced = stage.process_batch({name: rows[name] for name in self.names})
+            part = np.empty(reduced['timestamp'].size, dtype=records.dtype)
+            part['rig'] = rig
+            for name, values in reduced.items():
+                part[name] = values
+            parts.append(part)
+        return np.concatenate(parts)
+
+
+class FrameServer:
+    """Streams frames to remote GUI clients"""
+
+    def __init__(self, address=DEFAULT_ADDRESS, send_interval=0.05, max_backlog=4 * 2 ** 20,
+                 schema=DEFAULT_SCHEMA):
+        """
+        Args:
+            address: (host, port) to listen on, or a Unix socket path
+            send_interval: Seconds between batches sent to clients
+            max_backlog: Unsent bytes per client above which batches are dropped
+            schema: ChannelSchema of the published frames, sent to every subscriber
+        """
+        self.address = address
+        self.schema = schema
+        self.send_interval = send_interval
+        self.max_backlog = max_backlog
+        self.running = False
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.selector = None
+        self.listener = None
+        self.clients = {}
+
+        self._pending = []
+        self._lock = threading.Lock()
+        self.frames_published = 0
+        self.bytes_sent = 0
+
+    @property
+    def bound_address(self):
+        """Address actually listened on (resolves port 0)"""
+        return self.listener.getsockname() if self.listener is not None else None
+
+    def publish(self, frame):
+        """Queue one full-rate frame for the clients (any thread, cheap)"""
+        with self._lock:
+            self._pending.append(frame)
+
+    def start(self):
+        if self.running:
+            print("Frame server is already running")
+            return
+
+        if isinstance(self.address, str):
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else:
+            self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(self.address)
+        self.listener.listen()
+        self.listener.setblocking(False)
+
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        print(f"Frame server listening on {self.bound_address}")
+
+        self.stop_event.clear()
+        self.running = True
+        self.thread = threading.Thread(target=self._serve_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.stop_event.set()
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+        for client in list(self.clients.values()):
+            self._drop(client)
+        self.selector.close()
+        self.listener.close()
+        self.listener = None
+        if isinstance(self.address, str) and os.path.exists(self.address):
+            os.unlink(self.address)
+
+    def _serve_loop(self):
+        next_send = time.monotonic()
+        while not self.stop_event.is_set():
+            timeout = max(0.0, next_send - time.monotonic())
+            for key, mask in self.selector.select(timeout):
+                try:
+                    if key.fileobj is self.listener:
+                        self._accept()
+                        continue
+                    if mask & selectors.EVENT_READ:
+                        self._read(key.data)
+                    if mask & selectors.EVENT_WRITE and key.data.sock.fileno() >= 0:
+                        self._write(key.data)
+                except (OSError, ValueError) as e:
+                    if key.data is not None:
+                        print(f"Dropping client {key.data.address}: {str(e)}")
+                        self._drop(key.data)
+
+            if time.monotonic() >= next_send:
+                next_send += self.send_interval
+                try:
+                    self._broadcast()
+                except Exception as e:
+                    print(f"Error sending frames: {str(e)}")
+
+    def _accept(self):
+        sock, address = self.listener.accept()
+        sock.setblocking(False)
+        client = _Client(sock, address or "local", self.schema)
+        self.clients[sock.fileno()] = client
+        self.selector.register(sock, selectors.EVENT_READ, client)
+        print(f"Client connected: {client.address}")
+
+    def _read(self, client):
+        data = client.sock.recv(4096)
+        if not data:
+            print(f"Client disconnected: {client.address}")
+            self._drop(client)
+            return
+        for kind, payload in client.reader.feed(data):
+            if kind == MSG_SUBSCRIBE:
+                if not client.subscribed:
+                    self._queue(client, encode_schema(self.schema))
+                client.subscribe(*decode_subscribe(payload))
+
+    def _write(self, client):
+        sent = client.sock.send(client.outbound)
+        del client.outbound[:sent]
+        self.bytes_sent += sent
+        if not client.outbound:
+            self.selector.modify(client.sock, selectors.EVENT_READ, client)
+
+    def _drop(self, client):
+        if client.sock.fileno() < 0:
+            return
+        self.clients.pop(client.sock.fileno(), None)
+        try:
+            self.selector.unregister(client.sock)
+        except (KeyError, ValueError):
+            pass
+        client.sock.close()
+
+    def _broadcast(self):
+        with self._lock:
+            frames, self._pending = self._pending, []
+        if not frames:
+            return
+        self.frames_published += len(frames)
+        records = records_from_frames(frames, self.schema)
+
+        for client in list(self.clients.values()):
+            if not client.subscribed:
+                continue
+            reduced = client.reduce(records)
+            if reduced.size == 0:
+                continue
+            if len(client.outbound) > self.max_backlog:
+                client.batches_dropped += 1
+                continue
+            self._queue(client, encode_frames(reduced))
+
+    def _queue(self, client, message):
+        """Append a message to a client's outbound buffer and wait for writability"""
+        was_idle = not client.outbound
+        client.outbound += message
+        if was_idle:
+            self.selector.modify(
+                client.sock, selectors.EVENT_READ | selectors.EVENT_WRITE, client
+            )
+
+    def get_stats(self):
+        return {
+            'clients': len(self.clients),
+            'frames_published': self.frames_published,
+            'bytes_sent': self.bytes_sent,
+            'batches_dropped': sum(c.batches_dropped for c in self.clients.values()),
+        }
@@ -0,0 +1,298 @@
+"""
+Batch report generation from recorded sessions
+
+Renders the standard report figures of every session (torque and preload
+against angle, the mean torque per degree in polar form and the
+per-revolution trend) without opening the GUI. Sessions are rendered on a
+process pool with one worker per core, and each session's result is
+cached next to the reports, so a re-run only renders sessions that are
+new or changed since the last run.
+
+Sessions are DataLogger files (.svlog) or raw SensorRecording captures
+(.npz, replayed through SensorManager).
+
+    python -m src.report recordings/ --out reports --format pdf
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import queue
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+SESSION_PATTERNS = ("*.svlog", "*.npz")
+CACHE_FILE = ".report_cache.json"
+# Bump when the figures change so cached reports are rendered again
+REPORT_VERSION = 3
+
+
+def find_sessions(paths):
+    """Session files among paths, with directories expanded (sorted, no duplicates)"""
+    sessions = []
+    for path in paths:
+        if os.path.isdir(path):
+            for pattern in SESSION_PATTERNS:
+                sessions += glob.glob(os.path.join(path, pattern))
+        else:
+            sessions.append(path)
+    return sorted({os.path.abspath(path) for path in sessions})
+
+
+def load_session(path):
+    """
+    Load a recorded session
+
+    Returns:
+        Dictionary mapping timestamp, angle, torque and preload to float64 arrays
+    """
+    if path.endswith(".npz"):
+        from src.sensors.channels import DEFAULT_SCHEMA
+        from src.sensors.replay import ReplayDriver, SensorRecording
+        from src.sensors.sensor_manager import SensorManager
+
+        frames = ReplayDriver(SensorManager(queue.Queue()), SensorRecording.load(path)).run()
+        records = DEFAULT_SCHEMA.pack(frames)
+        return {name: records[name].astype(np.float64)
+                for name in ('timestamp',) + DEFAULT_SCHEMA.names}
+
+    from src.data.data_logger import read_log
+    return read_log(path)
+
+
+def _decimated(columns, max_points):
+    """Every n-th sample, so plots stay below max_points"""
+    step = max(1, -(-len(columns['angle']) // max_points))
+    return {name: values[::step] for name, values in columns.items()}
+
+
+def _break_wraps(angles, values):
+    """Insert NaN where the angle wraps, so lines do not cross the plot"""
+    wraps = np.flatnonzero(np.diff(angles) < -180.0) + 1
+    return np.insert(angles, wraps, np.nan), np.insert(values, wraps, np.nan)
+
+
+def build_figures(columns, title, max_points=20000):
+    """
+    Standard report figures of one session
+
+    Returns:
+        List of (name, Figure) pairs
+    """
+    from src.data.cycles import CycleDetector
+    from src.gui.plots import (
+        create_cycle_trend_plot, create_polar_plot, create_sensor_figure,
+        update_cycle_trend_plot, update_preload_angle_plot, update_torque_angle_plot,
+    )
+
+    angle = columns['angle']
+    torque = columns['torque']
+    preload = columns['preload']
+    shown = _decimated(columns, max_points)
+
+    fig, ax1, ax2 = create_sensor_figure()
+    fig.suptitle(title)
+    update_torque_angle_plot(ax1, *_break_wraps(shown['angle'], shown['torque']))
+    update_preload_angle_plot(ax2, *_break_wraps(shown['angle'], shown['preload']))
+    fig.tight_layout()
+    figures = [("torque_preload", fig)]
+
+    # Mean torque per degree of the whole session
+    known = np.isfinite(angle) & np.isfinite(torque)
+    bins = np.floor(np.mod(angle[known], 360.0)).astype(np.intp)
+    counts = np.bincount(bins, minlength=360)
+    sums = np.bincount(bins, weights=torque[known], minlength=360)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = np.where(counts > 0, sums / counts, np.nan)
+    fig, ax = create_polar_plot()
+    ax.set_title(f"Mean Torque per Degree - {title}")
+    theta = np.radians(np.arange(361) + 0.5)
+    ax.plot(theta, np.append(mean, mean[0]), 'b-', label="Mean torque (Nm)")
+    ax.legend(loc="lower right")
+    figures.append(("polar", fig))
+
+    detector = CycleDetector()
+    detector.process(columns['timestamp'], angle, torque, preload)
+    cycles = detector.table.view()
+    if len(cycles):
+        fig, ax_torque, ax_work = create_cycle_trend_plot()
+        ax_torque.set_title(f"Per-Cycle Trend - {title}")
+        update_cycle_trend_plot(ax_torque, cycles['cycle'], cycles['peak_torque'],
+                                style='r.-', label="Peak")
+        update_cycle_trend_plot(ax_torque, cycles['cycle'], cycles['mean_torque'],
+                                style='b.-', label="Mean")
+        update_cycle_trend_plot(ax_work, cycles['cycle'], cycles['work'], style='g.-')
+        figures.append(("cycles", fig))
+    return figures
+
+
+def output_prefix(path):
+    """
+    File name prefix of a session's reports: its stem and a short hash of
+    its absolute path, so run1.svlog and run1.npz, or rigA/run1.svlog and
+    rigB/run1.svlog, never write (or find in the cache) each other's files
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    digest = hashlib.sha1(os.path.abspath(path).encode()).hexdigest()[:8]
+    return f"{stem}-{digest}"
+
+
+def render_session(path, out_dir, fmt="png", max_points=20000):
+    """
+    Render the report of one session (runs in a worker process)
+
+    Returns:
+        Dictionary with the output file names and a summary of the session
+    """
+    from src.gui.plots import plot_to_image
+
+    columns = load_session(path)
+    if not columns or len(columns.get('angle', ())) == 0:
+        raise ValueError("Session has no frames")
+    figures = build_figures(columns, os.path.basename(path), max_points)
+    prefix = output_prefix(path)
+
+    outputs = []
+    if fmt == "pdf":
+        from matplotlib.backends.backend_pdf import PdfPages
+        outputs.append(f"{prefix}.pdf")
+        with PdfPages(os.path.join(out_dir, outputs[0])) as pdf:
+            for _, fig in figures:
+                pdf.savefig(fig)
+    else:
+        for name, fig in figures:
+            outputs.append(f"{prefix}_{name}.png")
+            with open(os.path.join(out_dir, outputs[-1]), "wb") as f:
+                f.write(plot_to_image(fig))
+
+    timestamps = columns['timestamp']
+    return {
+        'outputs': outputs,
+        'frames': int(timestamps.size),
+        'duration': float(timestamps[-1] - timestamps[0]),
+        'peak_torque': float(np.nanmax(columns['torque'])),
+        'peak_preload': float(np.nanmax(columns['preload'])),
+    }
+
+
+class ReportCache:
+    """Per-session results of earlier runs, stored as JSON in the output directory"""
+
+    def __init__(self, out_dir):
+        self.path = os.path.join(out_dir, CACHE_FILE)
+        self.out_dir = out_dir
+        try:
+            with open(self.path) as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def key(path, fmt, max_points):
+        """Changes whenever the session file or the report settings change"""
+        stat = os.stat(path)
+        return f"{stat.st_size}:{stat.st_mtime_ns}:{fmt}:{max_points}:{REPORT_VERSION}"
+
+    def lookup(self, path, key):
+        """Cached result of a session, or None if stale or its files are gone"""
+        entry = self.entries.get(path)
+        if entry is None or entry['key'] != key:
+            return None
+        if not all(os.path.exists(os.path.join(self.out_dir, name)) for name in entry['outputs']):
+            return None
+        return entry
+
+    def store(self, path, key, result):
+        self.entries[path] = dict(result, key=key)
+
+    def save(self):
+        temporary = self.path + ".tmp"
+        with open(temporary, "w") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(temporary, self.path)
+
+
+def generate_reports(paths, out_dir, fmt="png", workers=None, force=False, max_points=20000):
+    """
+    Render the reports of every session that is new or changed
+
+    Args:
+        paths: Session files or directories of session files
+        out_dir: Directory receiving the reports and the cache
+        fmt: "png" (one image per figure) or "pdf" (one document per session)
+        workers: Worker processes (default: one per core); 1 renders inline
+        force: Render every session even if cached
+
+    Returns:
+        Dictionary mapping session path to its result; failed sessions map
+        to {'error': message}, cached ones have 'cached': True
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    cache = ReportCache(out_dir)
+    results = {}
+    jobs = {}
+    for path in find_sessions(paths):
+        key = ReportCache.key(path, fmt, max_points)
+        entry = None if force else cache.lookup(path, key)
+        if entry is not None:
+            results[path] = dict(entry, cached=True)
+        else:
+            jobs[path] = key
+
+    def finish(path, result):
+        cache.store(path, jobs[path], result)
+        results[path] = dict(result, cached=False)
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) <= 1:
+        for path in jobs:
+            try:
+                finish(path, render_session(path, out_dir, fmt, max_points))
+            except Exception as e:
+                results[path] = {'error': str(e)}
+    elif jobs:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            futures = {pool.submit(render_session, path, out_dir, fmt, max_points): path
+                       for path in jobs}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    finish(path, future.result())
+                except Exception as e:
+                    results[path] = {'error': str(e)}
+
+    cache.save()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render reports of recorded sessions")
+    parser.add_argument("sessions", nargs="+", help="Session files (.svlog, .npz) or directories")
+    parser.add_argument("--out", default="reports", help="Output directory")
+    parser.add_argument("--format", default="png", choices=("png", "pdf"))
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per core)")
+    parser.add_argument("--max-points", type=int, default=20000,
+                        help="Samples drawn per curve (sessions are thinned above this)")
+    parser.add_argument("--force", action="store_true", help="Ignore cached results")
+    args = parser.parse_args()
+
+    results = generate_reports(args.sessions, args.out, args.format, args.workers,
+                               args.force, args.max_points)
+    rendered = cached = failed = 0
+    for path, result in sorted(results.items()):
+        if 'error' in result:
+            failed += 1
+            print(f"FAILED  {path}: {result['error']}")
+        elif result['cached']:
+            cached += 1
+        else:
+            rendered += 1
+            print(f"{path}: {result['frames']} frames, {result['duration']:.1f} s, "
+                  f"peak torque {result['peak_torque']:.1f} Nm -> {', '.join(result['outputs'])}")
+    print(f"Rendered {rendered}, cached {cached}, failed {failed} (reports in {args.out})")
+
+
+if __name__ == "__main__":
+    main()
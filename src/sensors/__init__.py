@@ -2,6 +2,8 @@
 from .encoder import EncoderSensor
 from .strain_gauge import StrainGaugeSensor
 from .load_cell import LoadCellSensor
+from .rig_registry import RigRegistry
+from .sample import Reading, Sample
 
 # This allows you to import directly from the sensors package:
-# from src.sensors import EncoderSensor, StrainGaugeSensor, LoadCellSensor
\ No newline at end of file
+# from src.sensors import EncoderSensor, StrainGaugeSensor, LoadCellSensor, RigRegistry
\ No newline at end of file
@@ -0,0 +1,450 @@
+# src/sensors/async_engine.py
+"""
+asyncio acquisition backend
+
+All sensors run as coroutines on one event loop in one background thread.
+Serial sensors are woken by the loop when their file descriptor becomes
+readable, so waiting on I/O costs no thread at all. Synchronization and
+queue publishing run on the same loop; frames leave through the usual
+thread-safe queue.Queue, which the GUI already drains from its own thread.
+
+Frames follow the SensorManager contract: Samples for the standard
+channels, dictionaries otherwise, both with valid bits, and a stale
+sensor is published as NaN instead of holding back the other channels.
+"""
+import asyncio
+import queue
+import threading
+
+from .encoder import EncoderSensor
+from .strain_gauge import StrainGaugeSensor
+from .load_cell import LoadCellSensor
+from .channels import DEFAULT_SCHEMA, Channel, ChannelSchema
+from .health import SensorHealth
+from .sample import Reading, Sample
+from .serial_protocol import FrameParser, open_port
+from .timing import SESSION_CLOCK, ClockOffsetEstimator
+
+
+class AsyncSimulatedReader:
+    """Async stream over a sensor object's simulated _read_sensor()"""
+
+    def __init__(self, sensor):
+        self.sensor = sensor
+
+    async def read_sample(self):
+        await asyncio.sleep(self.sensor.update_rate)
+        return self.sensor._read_sensor(), None
+
+    def close(self):
+        pass
+
+
+class AsyncSerialDevice:
+    """
+    One serial board shared by the async readers of its channels
+
+    The port is opened once and watched with loop.add_reader; every chunk
+    of bytes is decoded with a single FrameParser and the newest sample of
+    each channel is handed to that channel's reader.
+    """
+
+    def __init__(self, port, baudrate=115200):
+        self.port_name = port
+        self.baudrate = baudrate
+        self.port = None
+        self.parser = FrameParser()
+        self.readers = {}
+        self._loop = None
+
+    def reader(self, channel):
+        """AsyncSerialReader of one channel (created on first use)"""
+        reader = self.readers.get(channel)
+        if reader is None:
+            reader = self.readers[channel] = AsyncSerialReader(self, channel)
+        return reader
+
+    def _fileno(self):
+        return self.port.fileno() if hasattr(self.port, 'fileno') else self.port.fd
+
+    def open(self):
+        """Start watching the port (on the running loop)"""
+        if self.port is None:
+            self._loop = asyncio.get_running_loop()
+            # Non-blocking reads: the loop tells us when data is there
+            self.port = open_port(self.port_name, self.baudrate, timeout=0)
+            self._loop.add_reader(self._fileno(), self._on_readable)
+
+    def _on_readable(self):
+        try:
+            self.parser.fill_from(self.port)
+        except BlockingIOError:
+            return
+        for channel, times, values in self.parser.parse():
+            reader = self.readers.get(channel)
+            if reader is not None:
+                reader.deliver(float(values[-1]), float(times[-1]))
+
+    def close(self):
+        if self.port is not None:
+            try:
+                self._loop.remove_reader(self._fileno())
+            except RuntimeError:
+                pass
+            self.port.close()
+            self.port = None
+
+
+class AsyncSerialReader:
+    """
+    Async stream of one channel from a shared AsyncSerialDevice
+
+    The coroutine sleeps until the device delivers a sample for this
+    channel, so waiting on I/O costs no thread.
+    """
+
+    def __init__(self, device, channel):
+        self.device = device
+        self.channel = channel
+        self.latest = None
+        self.fresh = False
+        # Created on the loop thread (older asyncio binds events to a loop)
+        self._ready = None
+
+    def deliver(self, value, device_time):
+        self.latest = (value, device_time)
+        self.fresh = True
+        if self._ready is not None:
+            self._ready.set()
+
+    async def read_sample(self):
+        if self._ready is None:
+            self._ready = asyncio.Event()
+        self.device.open()
+        while not self.fresh:
+            self._ready.clear()
+            await self._ready.wait()
+        self.fresh = False
+        return self.latest
+
+    def close(self):
+        # The first reader to close stops the shared port; closing twice is harmless
+        self.device.close()
+
+
+class _AsyncChannel:
+    """Latest reading of one sensor plus its clock estimator and health"""
+
+    def __init__(self, key, reader, name, period):
+        self.key = key
+        self.reader = reader
+        self.name = name
+        self.latest = None
+        self.clock_estimator = ClockOffsetEstimator()
+        self.health = SensorHealth(period)
+        self.error_count = 0
+        self.readings = 0
+
+
+class AsyncSensorManager:
+    """
+    SensorManager running every sensor on one asyncio loop
+
+    Publishes the same frames (Samples or dictionaries with valid bits,
+    NaN for stale sensors) and health statistics as SensorManager. Unlike
+    it, sensors never reconnect: a failing reader is retried every second,
+    and the queue is never waited on, so a full queue drops the frame.
+    """
+
+    def __init__(self, data_queue, sync_threshold=0.1, rig_id=None, update_rate=0.1,
+                 filter_stage=None, clock=None, sync_interval=0.02, default_sensors=True,
+                 decimation=None, calibration=None):
+        """
+        Initialize the async sensor manager
+
+        Args:
+            data_queue: Queue to send synchronized data
+            sync_threshold: Maximum time difference (in seconds) allowed between readings
+            rig_id: Identifier of the fixture these sensors belong to (tags every frame)
+            update_rate: Seconds between readings for the simulated default sensors
+            filter_stage: Optional FilterStage applied to each frame before publishing
+            clock: SessionClock for timestamps (default: process-wide clock)
+            sync_interval: Seconds between synchronization attempts
+            default_sensors: Add the encoder, strain gauge and load cell channels
+            decimation: Optional DecimationStage reducing the frames put on the
+                queue; frame listeners still receive every frame
+            calibration: Optional CalibrationStage converting raw readings,
+                applied before filter_stage
+        """
+        self.data_queue = data_queue
+        self.sync_threshold = sync_threshold
+        self.rig_id = rig_id
+        self.calibration = calibration
+        self.filter_stage = filter_stage
+        self.decimation = decimation
+        self.clock = clock or SESSION_CLOCK
+        self.update_rate = update_rate
+        self.sync_interval = sync_interval
+        self.running = False
+        self.thread = None
+        self.loop = None
+        self._stop_future = None
+
+        self.channels = {}
+        # One AsyncSerialDevice per port, shared by the channels on it
+        self.serial_devices = {}
+        self.last_sync_time = float("-inf")
+        # Names of stale sensors currently left out of frames
+        self.excluded = set()
+        self.frames_published = 0
+        self.frames_dropped = 0
+        self.frame_listeners = []
+        self.sample_frames = False
+
+        if default_sensors:
+            self.add_sensor('angle', EncoderSensor(update_rate=update_rate))
+            self.add_sensor('torque', StrainGaugeSensor(update_rate=update_rate))
+            self.add_sensor('preload', LoadCellSensor(update_rate=update_rate))
+
+    def add_sensor(self, key, source):
+        """
+        Add a sensor channel (before start)
+
+        Args:
+            key: Frame key the sensor's value is published under
+            source: A SensorBase instance (its serial port or simulation is
+                used) or any object with an async read_sample() method
+        """
+        if self.running:
+            raise RuntimeError("Cannot add sensors while the manager is running")
+        if hasattr(source, 'read_sample'):
+            reader = source
+        elif getattr(source, 'port', None) is not None and source.link is not None:
+            device = self.serial_devices.get(source.port)
+            if device is None:
+                device = self.serial_devices[source.port] = AsyncSerialDevice(
+                    source.port, source.link.baudrate)
+            reader = device.reader(source.link.channel)
+        else:
+            reader = AsyncSimulatedReader(source)
+        self.channels[key] = _AsyncChannel(key, reader, getattr(source, 'name', key),
+                                           getattr(source, 'update_rate', self.update_rate))
+        # Standard frames are compact Samples; other channels publish dictionaries
+        self.sample_frames = self.schema == DEFAULT_SCHEMA
+
+    @property
+    def schema(self):
+        """ChannelSchema of the channels, in frame order"""
+        if list(self.channels) == list(DEFAULT_SCHEMA.names):
+            return DEFAULT_SCHEMA
+        return ChannelSchema([Channel(key, "") for key in self.channels])
+
+    def add_frame_listener(self, callback):
+        """Register a callback called as callback(frame) for every synchronized frame"""
+        self.frame_listeners.append(callback)
+
+    def remove_frame_listener(self, callback):
+        """Unregister a frame callback"""
+        if callback in self.frame_listeners:
+            self.frame_listeners.remove(callback)
+
+    def start(self):
+        """Start the event loop thread"""
+        if self.running:
+            print("Sensor manager is already running")
+            return
+
+        print(f"Starting async sensor manager ({len(self.channels)} sensors)")
+        self.running = True
+        now = self.clock.now()
+        for channel in self.channels.values():
+            channel.health.reset(now)
+        started = threading.Event()
+        self.thread = threading.Thread(target=self._run_loop, args=(started,), daemon=True)
+        self.thread.start()
+        started.wait(timeout=2.0)
+
+    def stop(self):
+        """Stop all coroutines and the loop thread"""
+        if not self.running:
+            return
+
+        print("Stopping async sensor manager")
+        self.running = False
+        if self.loop is not None and self._stop_future is not None:
+            self.loop.call_soon_threadsafe(self._stop_future.set_result, None)
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+    def call_threadsafe(self, callback, *args):
+        """Run a callback on the acquisition loop from another thread (e.g. Tk)"""
+        if self.loop is not None:
+            self.loop.call_soon_threadsafe(callback, *args)
+
+    def _run_loop(self, started):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        try:
+            self.loop.run_until_complete(self._main(started))
+        finally:
+            self.loop.close()
+            self.loop = None
+
+    async def _main(self, started):
+        self._stop_future = self.loop.create_future()
+        tasks = [asyncio.ensure_future(self._sensor_task(channel))
+                 for channel in self.channels.values()]
+        tasks.append(asyncio.ensure_future(self._sync_task()))
+        started.set()
+
+        await self._stop_future
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for channel in self.channels.values():
+            channel.reader.close()
+
+    async def _sensor_task(self, channel):
+        """Read one sensor forever, stamping readings on the session clock"""
+        while True:
+            try:
+                requested = self.clock.now()
+                value, device_time = await channel.reader.read_sample()
+                received = self.clock.now()
+                if value is None:
+                    continue
+                timestamp = None
+                if device_time is not None:
+                    channel.clock_estimator.add(device_time, received)
+                    timestamp = channel.clock_estimator.to_session(device_time)
+                if timestamp is None:
+                    timestamp = 0.5 * (requested + received)
+                channel.latest = Reading(value, timestamp)
+                channel.readings += 1
+                channel.error_count = 0
+                channel.health.record_reading(timestamp)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error reading from {channel.key}: {str(e)}")
+                channel.error_count += 1
+                channel.health.record_error(self.clock.now(), e)
+                await asyncio.sleep(1.0)
+
+    async def _sync_task(self):
+        # Give sensors a moment to start collecting data
+        await asyncio.sleep(0.5)
+        while True:
+            try:
+                self.poll()
+            except Exception as e:
+                print(f"Error in sensor synchronization: {str(e)}")
+            await asyncio.sleep(self.sync_interval)
+
+    def poll(self):
+        """
+        Make a single synchronization attempt and publish the result
+
+        Returns:
+            True if a synchronized frame was produced and nothing was dropped
+        """
+        sync_data = self._get_synchronized_data()
+        if not sync_data:
+            return False
+
+        if self.calibration is not None:
+            sync_data = self.calibration.process_frame(sync_data)
+        if self.filter_stage is not None:
+            sync_data = self.filter_stage.process_frame(sync_data)
+
+        # Recorders get the full-rate stream, the queue only the display stream
+        for listener in self.frame_listeners:
+            listener(sync_data)
+        if self.decimation is None:
+            frames = [sync_data]
+        else:
+            frames = self.decimation.process_frame(sync_data)
+
+        for frame in frames:
+            try:
+                # Never block the loop; a full queue means the consumer is behind
+                self.data_queue.put_nowait(frame)
+            except queue.Full:
+                self.frames_dropped += 1
+                return False
+            self.frames_published += 1
+        return True
+
+    def _rig_label(self):
+        """Suffix used in log messages to identify the rig"""
+        return "" if self.rig_id is None else f" (rig {self.rig_id})"
+
+    def _get_synchronized_data(self):
+        """
+        Get synchronized data from all sensors
+
+        Returns:
+            Sample (or dictionary for other channels) with synchronized data,
+            NaN and a cleared valid bit for stale sensors, or None if cannot
+            synchronize
+        """
+        now = self.clock.now()
+
+        # As in SensorManager: stale sensors are left out, a sensor that has
+        # not reported yet is waited for until it has been running that long
+        readings = []
+        for channel in self.channels.values():
+            reading = channel.latest
+            if reading is None:
+                if not channel.health.is_stale(now):
+                    return None
+            elif now - reading.timestamp > channel.health.stale_after:
+                reading = None
+            readings.append(reading)
+        self._update_excluded(readings)
+
+        timestamps = [reading.timestamp for reading in readings if reading is not None]
+        if not timestamps:
+            return None
+        if max(timestamps) - min(timestamps) > self.sync_threshold:
+            return None
+
+        if now - self.last_sync_time < 0.01:  # Prevent too frequent updates
+            return None
+        self.last_sync_time = now
+
+        valid = 0
+        values = []
+        for index, reading in enumerate(readings):
+            if reading is None:
+                values.append(float("nan"))
+            else:
+                values.append(reading.value)
+                valid |= 1 << index
+
+        timestamp = sum(timestamps) / len(timestamps)
+        if self.sample_frames:
+            return Sample(self.rig_id, timestamp, *values, valid)
+        frame = dict(zip(self.channels, values))
+        frame.update(rig_id=self.rig_id, timestamp=timestamp, valid=valid)
+        return frame
+
+    def _update_excluded(self, readings):
+        """Log sensors dropping out of or returning to the frames"""
+        excluded = {channel.name for channel, reading in zip(self.channels.values(), readings)
+                    if reading is None}
+        if excluded == self.excluded:
+            return
+        for name in excluded - self.excluded:
+            print(f"{name} is stale, publishing frames without it{self._rig_label()}")
+        for name in self.excluded - excluded:
+            print(f"{name} is back{self._rig_label()}")
+        self.excluded = excluded
+
+    def get_health(self):
+        """Health statistics of every sensor, keyed by sensor name"""
+        now = self.clock.now()
+        return {channel.name: channel.health.snapshot(now)
+                for channel in self.channels.values()}
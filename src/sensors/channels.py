@@ -0,0 +1,248 @@
+# src/sensors/channels.py
+"""
+Channel registry
+
+A ChannelSchema declares the measured channels of a rig (name, unit,
+storage dtype, nominal rate). Record dtypes for storage and transport,
+frame packing, validity bits and running statistics are all generated from
+it, so adding a channel (e.g. a second strain gauge) is a schema change
+rather than a change in every layer. Rows are packed into structured
+arrays once and everything after that works on whole columns.
+
+Schemas can be loaded from JSON:
+
+    {"channels": [
+        {"name": "angle", "unit": "degrees", "dtype": "f4", "rate": 10, "label": "Angle"},
+        ...
+    ]}
+"""
+import json
+import operator
+from collections import namedtuple
+
+import numpy as np
+
+Channel = namedtuple('Channel', ['name', 'unit', 'dtype', 'rate', 'label'])
+Channel.__new__.__defaults__ = ("f4", None, None)
+
+# Frame keys that are not channels
+RESERVED = ('rig_id', 'timestamp', 'valid')
+
+
+class ChannelSchema:
+    """Ordered, named set of channels"""
+
+    def __init__(self, channels):
+        """
+        Args:
+            channels: Sequence of Channel (or dictionaries with its fields)
+        """
+        channels = [c if isinstance(c, Channel) else Channel(**c) for c in channels]
+        names = [c.name for c in channels]
+        if len(set(names)) != len(names):
+            raise ValueError("Channel names must be unique")
+        for channel in channels:
+            if channel.name in RESERVED:
+                raise ValueError(f"Reserved channel name: {channel.name}")
+            if np.dtype(channel.dtype).kind != 'f':
+                raise ValueError(f"Channel {channel.name} must have a float dtype (NaN = missing)")
+        self.channels = tuple(channels)
+        self.names = tuple(names)
+        self._index = {name: index for index, name in enumerate(names)}
+        self._pack_keys = ('timestamp',) + self.names
+        self._pack_getters = (operator.itemgetter(*self._pack_keys),
+                              operator.attrgetter(*self._pack_keys))
+        self._record_dtype = np.dtype([('timestamp', np.float64)]
+                                      + [(c.name, np.dtype(c.dtype)) for c in channels])
+        self._wire_dtype = np.dtype([('rig', '<i4'), ('timestamp', '<f8')]
+                                    + [(c.name, np.dtype(c.dtype).newbyteorder('<'))
+                                       for c in channels])
+
+    @classmethod
+    def from_config(cls, spec):
+        """Build a schema from {'channels': [...]} or a plain list of channel dictionaries"""
+        if isinstance(spec, dict):
+            spec = spec['channels']
+        return cls(spec)
+
+    @classmethod
+    def load(cls, path):
+        """Load a schema from a JSON file"""
+        with open(path) as f:
+            return cls.from_config(json.load(f))
+
+    def to_config(self):
+        return {'channels': [channel._asdict() for channel in self.channels]}
+
+    def __len__(self):
+        return len(self.channels)
+
+    def __iter__(self):
+        return iter(self.channels)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __getitem__(self, name):
+        return self.channels[self._index[name]]
+
+    def __eq__(self, other):
+        return isinstance(other, ChannelSchema) and self.channels == other.channels
+
+    def index(self, name):
+        return self._index[name]
+
+    def flag(self, name):
+        """Bit of this channel in a frame's valid mask"""
+        return 1 << self._index[name]
+
+    @property
+    def all_valid(self):
+        return (1 << len(self.channels)) - 1
+
+    def record_dtype(self):
+        """Storage row: timestamp plus every channel in its declared dtype"""
+        return self._record_dtype
+
+    def wire_dtype(self):
+        """Transport row: little-endian record prefixed with the rig id (-1 = none)"""
+        return self._wire_dtype
+
+    def validity(self, frame):
+        """
+        Valid mask of one frame from its values (missing or NaN = invalid);
+        use valid_masks() for batches
+        """
+        mask = 0
+        for index, name in enumerate(self.names):
+            value = frame.get(name)
+            # NaN is the only value not equal to itself
+            if value is not None and value == value:
+                mask |= 1 << index
+        return mask
+
+    def pack(self, frames, dtype=None):
+        """
+        Pack frames (Samples or dictionaries) into a structured array
+
+        Each frame's values are fetched by one C-level itemgetter or
+        attrgetter call, all rows are converted by a single np.array call
+        and the columns are assigned whole, so no Python code runs per value.
+
+        Args:
+            dtype: Target dtype (default: record_dtype()); a 'rig' field is
+                filled from the frames' rig_id (-1 if not an integer)
+        """
+        dtype = self._record_dtype if dtype is None else np.dtype(dtype)
+        keys = self._pack_keys
+        by_key, by_attribute = self._pack_getters
+        rows = []
+        partial = False
+        for frame in frames:
+            if not partial:
+                try:
+                    rows.append(by_key(frame) if isinstance(frame, dict) else by_attribute(frame))
+                    continue
+                except (KeyError, AttributeError):
+                    # Frames lacking channels: look the values up one by one
+                    # from here on, missing ones come back as None, i.e. NaN
+                    partial = True
+            rows.append(tuple(map(frame.get, keys)))
+        block = np.array(rows, dtype=np.float64).reshape(len(frames), len(keys))
+        timestamps = block[:, 0]
+        timestamps[np.isnan(timestamps)] = 0.0
+
+        records = np.empty(len(frames), dtype=dtype)
+        for index, name in enumerate(keys):
+            records[name] = block[:, index]
+        if 'rig' in dtype.names:
+            rigs = [frame.get('rig_id') for frame in frames]
+            records['rig'] = [rig if isinstance(rig, int) else -1 for rig in rigs]
+        return records
+
+    def columns(self, records):
+        """Dictionary of the timestamp and channel columns of packed records"""
+        return {name: records[name] for name in ('timestamp',) + self.names}
+
+    def valid_masks(self, records, count=None):
+        """
+        Valid mask of every packed record, from its NaN channels
+
+        Args:
+            records: Packed records, or a dictionary of columns (channels
+                it lacks are invalid)
+            count: Number of rows of a dictionary (default: the length of
+                its first column)
+        """
+        if isinstance(records, dict):
+            count = len(next(iter(records.values()), ())) if count is None else count
+        else:
+            count = len(records)
+        masks = np.zeros(count, dtype=np.int64)
+        for index, name in enumerate(self.names):
+            if isinstance(records, dict) and name not in records:
+                continue
+            masks[np.isfinite(records[name])] |= 1 << index
+        return masks
+
+
+class ChannelStats:
+    """Running count, minimum, maximum and mean of every channel (NaN ignored)"""
+
+    def __init__(self, schema):
+        self.schema = schema
+        self.reset()
+
+    def reset(self):
+        width = len(self.schema)
+        self.count = np.zeros(width, dtype=np.int64)
+        self.total = np.zeros(width)
+        self.minimum = np.full(width, np.inf)
+        self.maximum = np.full(width, -np.inf)
+
+    def update(self, block):
+        """
+        Add a batch of rows
+
+        Args:
+            block: 2-D array shaped (rows, channels) in schema order, or
+                packed records of the schema
+        """
+        if block.dtype.names is not None:
+            block = np.stack([block[name] for name in self.schema.names], axis=1)
+        block = np.asarray(block, dtype=np.float64)
+        if block.size == 0:
+            return
+        finite = np.isfinite(block)
+        self.count += finite.sum(axis=0)
+        self.total += np.where(finite, block, 0.0).sum(axis=0)
+        self.minimum = np.fmin(self.minimum, np.where(finite, block, np.inf).min(axis=0))
+        self.maximum = np.fmax(self.maximum, np.where(finite, block, -np.inf).max(axis=0))
+
+    @property
+    def mean(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(self.count > 0, self.total / np.maximum(self.count, 1), np.nan)
+
+    def summary(self):
+        """Dictionary mapping channel name to {'count', 'min', 'max', 'mean'}"""
+        mean = self.mean
+        return {
+            name: {
+                'count': int(self.count[index]),
+                'min': float(self.minimum[index]) if self.count[index] else None,
+                'max': float(self.maximum[index]) if self.count[index] else None,
+                'mean': float(mean[index]) if self.count[index] else None,
+            }
+            for index, name in enumerate(self.schema.names)
+        }
+
+
+STANDARD_CHANNELS = (
+    Channel('angle', 'degrees', 'f4', 10.0, 'Angle'),
+    Channel('torque', 'Nm', 'f4', 10.0, 'Torque'),
+    Channel('preload', 'N', 'f4', 10.0, 'Preload'),
+)
+
+# The encoder, strain gauge and load cell of a standard rig
+DEFAULT_SCHEMA = ChannelSchema(STANDARD_CHANNELS)
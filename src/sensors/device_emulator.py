@@ -0,0 +1,112 @@
+# src/sensors/device_emulator.py
+"""
+Local emulator of a serial sensor board on a pseudo-terminal
+
+Lets the serial drivers run end-to-end without hardware:
+
+    emulator = DeviceEmulator()
+    emulator.start()
+    sensor = EncoderSensor(port=emulator.port)
+"""
+import os
+import random
+import threading
+import time
+
+import numpy as np
+
+from .serial_protocol import (
+    CHANNEL_ENCODER, CHANNEL_LOAD_CELL, CHANNEL_STRAIN_GAUGE, encode_frame,
+)
+
+
+def _encoder_signal(angles):
+    return angles
+
+
+def _strain_gauge_signal(angles):
+    return 50 + 30 * np.sin(np.radians(angles)) + np.random.uniform(-1, 1, angles.size)
+
+
+def _load_cell_signal(angles):
+    return (200 + 0.5 * angles + 50 * np.sin(np.radians(angles * 2))
+            + np.random.uniform(-1, 1, angles.size))
+
+
+DEFAULT_CHANNELS = {
+    CHANNEL_ENCODER: _encoder_signal,
+    CHANNEL_STRAIN_GAUGE: _strain_gauge_signal,
+    CHANNEL_LOAD_CELL: _load_cell_signal,
+}
+
+
+class DeviceEmulator:
+    """Streams simulated sensor frames into a pty"""
+
+    def __init__(self, sample_rate=1000.0, samples_per_frame=10, channels=None,
+                 corruption_rate=0.0, degrees_per_sample=0.36):
+        """
+        Args:
+            sample_rate: Samples per second per channel
+            samples_per_frame: Records packed into each frame
+            channels: Dictionary mapping channel id to a function of the
+                angle array returning sample values (default: all three sensors)
+            corruption_rate: Probability of flipping a byte in each frame
+            degrees_per_sample: Simulated shaft rotation per sample
+        """
+        self.sample_rate = sample_rate
+        self.samples_per_frame = samples_per_frame
+        self.channels = channels or DEFAULT_CHANNELS
+        self.corruption_rate = corruption_rate
+        self.degrees_per_sample = degrees_per_sample
+
+        self.master_fd, self.slave_fd = os.openpty()
+        self.port = os.ttyname(self.slave_fd)
+        self.running = False
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.frames_sent = 0
+
+    def start(self):
+        if self.running:
+            return
+        self.stop_event.clear()
+        self.running = True
+        self.thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        if not self.running:
+            return
+        self.stop_event.set()
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+
+    def close(self):
+        self.stop()
+        for fd in (self.master_fd, self.slave_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def _write_loop(self):
+        sample_index = 0
+        start = time.perf_counter()
+        while not self.stop_event.is_set():
+            indices = sample_index + np.arange(self.samples_per_frame)
+            times_us = (indices * 1e6 / self.sample_rate).astype(np.uint64) % 2 ** 32
+            angles = (indices * self.degrees_per_sample) % 360
+            for channel, signal in self.channels.items():
+                frame = bytearray(encode_frame(channel, times_us, signal(angles)))
+                if self.corruption_rate and random.random() < self.corruption_rate:
+                    frame[random.randrange(len(frame))] ^= 0xFF
+                os.write(self.master_fd, frame)
+                self.frames_sent += 1
+            sample_index += self.samples_per_frame
+
+            # Pace against the start time so the average rate does not drift
+            delay = start + (sample_index / self.sample_rate) - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
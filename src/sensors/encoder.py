@@ -1,18 +1,21 @@
 # src/sensors/encoder.py
 from src.sensors.sensor_base import SensorBase
+from src.sensors.serial_protocol import CHANNEL_ENCODER, SerialSensorLink
 
 class EncoderSensor(SensorBase):
     """Reads angle data from a hardware encoder"""
     
-    def __init__(self, port=None, update_rate=0.1):
+    def __init__(self, port=None, update_rate=0.1, baudrate=115200):
         super().__init__(name="Encoder", update_rate=update_rate)
         self.port = port
+        self.baudrate = baudrate
+        if port is not None:
+            self.link = SerialSensorLink(port, channel=CHANNEL_ENCODER, baudrate=baudrate)
         # Add specific encoder configuration here
         
     def _read_sensor(self):
         """Read angle from hardware encoder"""
-        # Replace with actual encoder reading code
-        # For testing, can keep the simulation code:
+        # Simulation used when no serial port is configured
         if not hasattr(self, '_angle'):
             self._angle = 0
         self._angle = (self._angle + 1) % 360
@@ -0,0 +1,111 @@
+# src/sensors/health.py
+"""
+Per-sensor health statistics
+
+SensorHealth is updated by the sensor's reading thread and read by the
+manager and the GUI. Rate and jitter are exponentially weighted, so each
+reading costs a few float operations and no history is kept.
+"""
+
+OK = "ok"
+STALE = "stale"
+RECONNECTING = "reconnecting"
+
+
+class SensorHealth:
+    """Rate, jitter, staleness and error bursts of one sensor"""
+
+    def __init__(self, nominal_period, stale_after=None, smoothing=0.1, burst_gap=5.0):
+        """
+        Args:
+            nominal_period: Expected seconds between readings
+            stale_after: Seconds without a reading after which the sensor is
+                stale (default: five periods, at least 0.5 s)
+            smoothing: Weight of the newest interval in the rate/jitter averages
+            burst_gap: Errors less than this many seconds apart form one burst
+        """
+        self.nominal_period = nominal_period
+        self.stale_after = stale_after if stale_after is not None else max(0.5, 5 * nominal_period)
+        self.smoothing = smoothing
+        self.burst_gap = burst_gap
+        self.reset()
+
+    def reset(self, now=None):
+        """Forget all statistics; now is the session time the sensor started"""
+        self.connected_at = now
+        self.last_time = None
+        self.mean_interval = None
+        self.jitter = 0.0
+        self.readings = 0
+        self.errors = 0
+        self.burst_errors = 0
+        self.max_burst = 0
+        self.last_error = None
+        self.last_error_time = None
+        self.reconnecting = False
+        self.reconnects = 0
+
+    def record_reading(self, timestamp):
+        """Account for a reading taken at timestamp (session clock)"""
+        if self.last_time is not None:
+            interval = timestamp - self.last_time
+            if self.mean_interval is None:
+                self.mean_interval = interval
+            else:
+                self.jitter += self.smoothing * (abs(interval - self.mean_interval) - self.jitter)
+                self.mean_interval += self.smoothing * (interval - self.mean_interval)
+        self.last_time = timestamp
+        self.readings += 1
+        self.reconnecting = False
+
+    def record_error(self, now, error):
+        """Account for a failed read at session time now"""
+        if self.last_error_time is None or now - self.last_error_time > self.burst_gap:
+            self.burst_errors = 0
+        self.burst_errors += 1
+        self.max_burst = max(self.max_burst, self.burst_errors)
+        self.errors += 1
+        self.last_error = str(error)
+        self.last_error_time = now
+
+    def record_reconnect(self, now):
+        """The connection was re-established at session time now"""
+        self.connected_at = now
+        self.reconnecting = False
+        self.reconnects += 1
+
+    @property
+    def rate(self):
+        """Measured readings per second, or None before two readings"""
+        if not self.mean_interval:
+            return None
+        return 1.0 / self.mean_interval
+
+    def age(self, now):
+        """Seconds since the last reading or (re)connection, or None if unknown"""
+        references = [t for t in (self.last_time, self.connected_at) if t is not None]
+        return now - max(references) if references else None
+
+    def is_stale(self, now):
+        age = self.age(now)
+        return age is not None and age > self.stale_after
+
+    def state(self, now):
+        if self.reconnecting:
+            return RECONNECTING
+        return STALE if self.is_stale(now) else OK
+
+    def snapshot(self, now):
+        """Dictionary of the current statistics"""
+        return {
+            'state': self.state(now),
+            'rate': self.rate,
+            'jitter': self.jitter,
+            'age': self.age(now),
+            'readings': self.readings,
+            'errors': self.errors,
+            'burst_errors': self.burst_errors,
+            'max_burst': self.max_burst,
+            'last_error': self.last_error,
+            'reconnects': self.reconnects,
+        }
@@ -2,19 +2,22 @@
 import random
 import math
 from src.sensors.sensor_base import SensorBase
+from src.sensors.serial_protocol import CHANNEL_LOAD_CELL, SerialSensorLink
 
 class LoadCellSensor(SensorBase):
     """Reads preload force data from load cells"""
     
-    def __init__(self, port=None, update_rate=0.1):
+    def __init__(self, port=None, update_rate=0.1, baudrate=115200):
         super().__init__(name="Load Cell", update_rate=update_rate)
         self.port = port
+        self.baudrate = baudrate
+        if port is not None:
+            self.link = SerialSensorLink(port, channel=CHANNEL_LOAD_CELL, baudrate=baudrate)
         # Add specific load cell configuration here
         
     def _read_sensor(self):
         """Read preload from load cell"""
-        # Replace with actual load cell reading code
-        # For testing, use simulated data
+        # Simulation used when no serial port is configured
         if not hasattr(self, '_angle'):
             self._angle = 0
         self._angle = (self._angle + 1) % 360
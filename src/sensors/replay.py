@@ -0,0 +1,214 @@
+# src/sensors/replay.py
+"""
+Deterministic record and replay of raw sensor readings
+
+SensorRecorder captures every reading of every sensor (value and session
+timestamp, before synchronization). ReplayDriver feeds such a recording
+back into a SensorManager under a virtual clock, interleaving readings and
+synchronization polls in a fixed order, so the frames produced by
+_get_synchronized_data are identical on every run and at any speed.
+"""
+import time
+
+import numpy as np
+
+from .sample import READING_DTYPE, Reading, RecordLog
+
+
+class VirtualClock:
+    """Clock whose time only moves when told to (SessionClock interface)"""
+
+    def __init__(self, start=0.0):
+        self.time = float(start)
+        self.wall_origin = 0.0
+
+    def now(self):
+        return self.time
+
+    def to_wall(self, session_time):
+        return self.wall_origin + session_time
+
+    def advance_to(self, t):
+        self.time = float(t)
+
+
+class SensorRecording:
+    """Raw per-sensor reading streams"""
+
+    def __init__(self, names, timestamps, values):
+        """
+        Args:
+            names: Sensor names, in SensorManager.sensors order
+            timestamps: List of 1-D timestamp arrays, one per sensor
+            values: List of 1-D value arrays, one per sensor
+        """
+        self.names = list(names)
+        self.timestamps = [np.asarray(t, dtype=np.float64) for t in timestamps]
+        self.values = [np.asarray(v, dtype=np.float64) for v in values]
+
+    @property
+    def duration(self):
+        starts = [t[0] for t in self.timestamps if t.size]
+        ends = [t[-1] for t in self.timestamps if t.size]
+        return max(ends) - min(starts) if starts else 0.0
+
+    def save(self, path):
+        """Save to a compressed .npz file"""
+        arrays = {'names': np.array(self.names)}
+        for index in range(len(self.names)):
+            arrays[f'timestamps_{index}'] = self.timestamps[index]
+            arrays[f'values_{index}'] = self.values[index]
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path):
+        """Load a recording saved with save()"""
+        with np.load(path) as data:
+            names = [str(name) for name in data['names']]
+            timestamps = [data[f'timestamps_{i}'] for i in range(len(names))]
+            values = [data[f'values_{i}'] for i in range(len(names))]
+        return cls(names, timestamps, values)
+
+
+class SensorRecorder:
+    """Captures the raw readings of a SensorManager's sensors"""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.sensors = list(manager.sensors)
+        # One log per sensor, each written only by that sensor's thread
+        self._logs = {id(sensor): RecordLog(READING_DTYPE) for sensor in self.sensors}
+        self.recording = False
+
+    def start(self):
+        """Begin capturing (call before or after the manager starts)"""
+        if self.recording:
+            return
+        self.recording = True
+        for sensor in self.sensors:
+            sensor.add_listener(self._on_reading)
+
+    def stop(self):
+        """Stop capturing and return the recording"""
+        if self.recording:
+            for sensor in self.sensors:
+                sensor.remove_listener(self._on_reading)
+            self.recording = False
+        return self.get_recording()
+
+    def _on_reading(self, sensor, value, timestamp):
+        self._logs[id(sensor)].append((timestamp, value))
+
+    def get_recording(self):
+        """Snapshot of everything captured so far"""
+        rows = [self._logs[id(sensor)].view() for sensor in self.sensors]
+        return SensorRecording(
+            [sensor.name for sensor in self.sensors],
+            [log['timestamp'] for log in rows],
+            [log['value'] for log in rows],
+        )
+
+
+class ReplayDriver:
+    """
+    Replays a SensorRecording through a SensorManager under a virtual clock
+
+    The sensors are never started. Readings are applied to the sensor
+    objects in timestamp order (ties broken by sensor order), and the
+    manager is polled at fixed virtual intervals like its sync loop does.
+    """
+
+    def __init__(self, manager, recording, poll_interval=0.02, warmup=0.5):
+        """
+        Args:
+            manager: SensorManager to drive (must not be running)
+            recording: SensorRecording with one stream per manager sensor
+            poll_interval: Virtual seconds between synchronization attempts
+            warmup: Virtual seconds before the first poll (matches _sync_loop)
+        """
+        if len(recording.names) != len(manager.sensors):
+            raise ValueError("Recording does not match the manager's sensors")
+        self.manager = manager
+        self.recording = recording
+        self.poll_interval = poll_interval
+        self.warmup = warmup
+        self.clock = VirtualClock()
+
+        manager.clock = self.clock
+        for sensor in manager.sensors:
+            sensor.clock = self.clock
+
+    def _timeline(self):
+        """Merge all readings into one ordered event list"""
+        sensor_index = np.concatenate([
+            np.full(t.size, index) for index, t in enumerate(self.recording.timestamps)
+        ])
+        sample_index = np.concatenate([np.arange(t.size) for t in self.recording.timestamps])
+        timestamps = np.concatenate(self.recording.timestamps)
+        # lexsort sorts by the last key first: time, then sensor order
+        order = np.lexsort((sensor_index, timestamps))
+        return timestamps[order], sensor_index[order], sample_index[order]
+
+    def run(self, speed=None):
+        """
+        Replay the whole recording
+
+        Args:
+            speed: None to run as fast as possible, or a factor of real time
+                (e.g. 10.0 replays ten times faster than recorded)
+
+        Returns:
+            List of frames produced, in order
+        """
+        manager = self.manager
+        sensors = manager.sensors
+        values = self.recording.values
+        timestamps, sensor_index, sample_index = self._timeline()
+        if timestamps.size == 0:
+            return []
+
+        frames = []
+        manager.last_sync_time = float("-inf")
+        for sensor in sensors:
+            sensor.latest = None
+
+        start = timestamps[0]
+        first_poll = start + self.warmup
+        end = timestamps[-1]
+        wall_start = time.perf_counter()
+        event = 0
+        count = timestamps.size
+        poll_number = 0
+
+        while True:
+            # Computed from the poll number so rounding never accumulates
+            next_poll = first_poll + poll_number * self.poll_interval
+            if next_poll > end:
+                break
+
+            # Apply every reading taken up to this poll
+            while event < count and timestamps[event] <= next_poll:
+                sensor = sensors[sensor_index[event]]
+                sensor.latest = Reading(
+                    float(values[sensor_index[event]][sample_index[event]]),
+                    float(timestamps[event])
+                )
+                event += 1
+
+            self.clock.advance_to(next_poll)
+            if speed is not None:
+                delay = wall_start + (next_poll - start) / speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+
+            frame = manager._get_synchronized_data()
+            if frame:
+                if manager.calibration is not None:
+                    frame = manager.calibration.process_frame(frame)
+                if manager.filter_stage is not None:
+                    frame = manager.filter_stage.process_frame(frame)
+                frames.append(frame)
+
+            poll_number += 1
+
+        return frames
@@ -0,0 +1,148 @@
+# src/sensors/rig_registry.py
+import os
+import threading
+import time
+
+from .sensor_manager import SensorManager
+
+
+class RigRegistry:
+    """
+    Runs several independent sensor sets (rigs) in one acquisition host
+
+    Each rig gets its own SensorManager. Instead of one synchronization
+    thread per rig, the rigs are spread over a small pool of worker threads
+    sized to the number of CPU cores, and every frame is tagged with the
+    rig id before it reaches the shared queue.
+    """
+
+    def __init__(self, data_queue, num_workers=None, sync_interval=0.02):
+        """
+        Initialize the rig registry
+
+        Args:
+            data_queue: Queue shared by all rigs for synchronized data
+            num_workers: Number of synchronization workers (default: CPU count)
+            sync_interval: Seconds each worker sleeps between polling passes
+        """
+        self.data_queue = data_queue
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.sync_interval = sync_interval
+        self.running = False
+        self.stop_event = threading.Event()
+        self.workers = []
+
+        # Rig id -> SensorManager, in registration order
+        self.rigs = {}
+        self._lock = threading.Lock()
+
+    def add_rig(self, rig_id, **manager_kwargs):
+        """
+        Register a new rig
+
+        Args:
+            rig_id: Unique identifier for the rig
+            **manager_kwargs: Extra arguments passed to SensorManager
+
+        Returns:
+            The SensorManager created for the rig
+        """
+        with self._lock:
+            if rig_id in self.rigs:
+                raise ValueError(f"Rig {rig_id!r} is already registered")
+            if self.running:
+                raise RuntimeError("Cannot add rigs while the registry is running")
+            manager = SensorManager(self.data_queue, rig_id=rig_id, **manager_kwargs)
+            self.rigs[rig_id] = manager
+        return manager
+
+    def remove_rig(self, rig_id):
+        """Unregister a rig (the registry must be stopped)"""
+        with self._lock:
+            if self.running:
+                raise RuntimeError("Cannot remove rigs while the registry is running")
+            del self.rigs[rig_id]
+
+    def get_rig(self, rig_id):
+        """Get the SensorManager for a rig"""
+        return self.rigs[rig_id]
+
+    @property
+    def rig_ids(self):
+        """List of registered rig ids in registration order"""
+        return list(self.rigs)
+
+    def start(self):
+        """Start all rigs and the synchronization workers"""
+        if self.running:
+            print("Rig registry is already running")
+            return
+
+        managers = list(self.rigs.values())
+        worker_count = max(1, min(self.num_workers, len(managers)))
+        print(f"Starting rig registry ({len(managers)} rigs, {worker_count} workers)")
+
+        # Sensors keep their own reading threads; synchronization is pooled
+        for manager in managers:
+            manager.start(sync_thread=False)
+
+        self.stop_event.clear()
+        self.running = True
+
+        # Round-robin assignment keeps the per-worker load balanced
+        self.workers = []
+        for index in range(worker_count):
+            assigned = managers[index::worker_count]
+            worker = threading.Thread(
+                target=self._worker_loop, args=(assigned,), daemon=True
+            )
+            worker.start()
+            self.workers.append(worker)
+
+    def stop(self):
+        """Stop the synchronization workers and all rigs"""
+        if not self.running:
+            return
+
+        print("Stopping rig registry")
+        self.stop_event.set()
+        self.running = False
+
+        for worker in self.workers:
+            worker.join(timeout=2.0)
+        self.workers = []
+
+        for manager in self.rigs.values():
+            manager.stop()
+
+    def get_stats(self):
+        """
+        Get the number of frames published per rig
+
+        Returns:
+            Dictionary mapping rig id to published frame count
+        """
+        return {rig_id: manager.frames_published for rig_id, manager in self.rigs.items()}
+
+    def get_health(self):
+        """
+        Get the sensor health of every rig
+
+        Returns:
+            Dictionary mapping rig id to SensorManager.get_health()
+        """
+        return {rig_id: manager.get_health() for rig_id, manager in self.rigs.items()}
+
+    def _worker_loop(self, managers):
+        """Poll a fixed subset of rigs for synchronized data"""
+        # Give sensors a moment to start collecting data
+        self.stop_event.wait(0.5)
+
+        while not self.stop_event.is_set():
+            for manager in managers:
+                try:
+                    manager.poll()
+                except Exception as e:
+                    print(f"Error in rig {manager.rig_id} synchronization: {str(e)}")
+
+            time.sleep(self.sync_interval)
@@ -0,0 +1,170 @@
+# src/sensors/sample.py
+"""
+Compact sample types shared by sensors, managers, sources and the GUI
+
+Reading     latest (value, timestamp) of one sensor; an immutable tuple, so a
+            sensor publishes both halves with a single attribute assignment
+            and readers on other threads can never see a torn pair
+Sample      one synchronized frame; a __slots__ object instead of a dict,
+            still readable with frame['torque'] and frame.get('rig_id').
+            Channels of sensors that were left out are NaN and their bit
+            is cleared in `valid`
+RecordLog   growable fixed-dtype record array for samples that are kept
+            (one row per sample instead of one Python object per value)
+"""
+from collections import namedtuple
+
+import numpy as np
+
+from .channels import DEFAULT_SCHEMA
+
+Reading = namedtuple('Reading', ['value', 'timestamp'])
+
+READING_DTYPE = np.dtype([('timestamp', np.float64), ('value', np.float64)])
+
+# float32 values keep ~7 significant digits, well beyond the sensors' resolution
+SAMPLE_DTYPE = DEFAULT_SCHEMA.record_dtype()
+
+# Bits of Sample.valid
+CHANNEL_FLAGS = {name: DEFAULT_SCHEMA.flag(name) for name in DEFAULT_SCHEMA.names}
+VALID_ANGLE = CHANNEL_FLAGS['angle']
+VALID_TORQUE = CHANNEL_FLAGS['torque']
+VALID_PRELOAD = CHANNEL_FLAGS['preload']
+VALID_ALL = DEFAULT_SCHEMA.all_valid
+
+# Valid bits of a frame's channels from their values (missing or NaN = invalid)
+validity_flags = DEFAULT_SCHEMA.validity
+
+
+class Sample:
+    """
+    Synchronized frame of the three standard sensors (DEFAULT_SCHEMA)
+
+    Managers with another channel schema publish dictionaries with the
+    same reserved keys (rig_id, timestamp, valid) instead.
+    """
+
+    __slots__ = ('rig_id', 'timestamp', 'angle', 'torque', 'preload', 'valid')
+
+    def __init__(self, rig_id, timestamp, angle, torque, preload, valid=VALID_ALL):
+        self.rig_id = rig_id
+        self.timestamp = timestamp
+        self.angle = angle
+        self.torque = torque
+        self.preload = preload
+        self.valid = valid
+
+    @property
+    def complete(self):
+        """True if every sensor contributed to this frame"""
+        return self.valid == VALID_ALL
+
+    # Mapping-style access so code written against frame dictionaries keeps working
+
+    def keys(self):
+        return self.__slots__
+
+    def __iter__(self):
+        return iter(self.__slots__)
+
+    def __len__(self):
+        return len(self.__slots__)
+
+    def __contains__(self, key):
+        return key in self.__slots__
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        if key not in self.__slots__:
+            return default
+        return getattr(self, key)
+
+    def copy(self):
+        return Sample(self.rig_id, self.timestamp, self.angle, self.torque, self.preload,
+                      self.valid)
+
+    def as_dict(self):
+        return {key: getattr(self, key) for key in self.__slots__}
+
+    def as_record(self):
+        """Row for a RecordLog of SAMPLE_DTYPE"""
+        return (self.timestamp, self.angle, self.torque, self.preload)
+
+    def __eq__(self, other):
+        if isinstance(other, Sample):
+            return (self.as_record() == other.as_record() and self.rig_id == other.rig_id
+                    and self.valid == other.valid)
+        if isinstance(other, dict):
+            return self.as_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        return (f"Sample(rig_id={self.rig_id!r}, timestamp={self.timestamp!r}, "
+                f"angle={self.angle!r}, torque={self.torque!r}, preload={self.preload!r}, "
+                f"valid={self.valid!r})")
+
+
+class RecordLog:
+    """Append-only structured array that grows by doubling"""
+
+    def __init__(self, dtype, initial_capacity=1024):
+        """
+        Args:
+            dtype: Structured dtype of one row
+            initial_capacity: Rows allocated up front
+        """
+        self.dtype = np.dtype(dtype)
+        # (rows, count) is swapped as one tuple so readers on other threads
+        # always see an array and a row count that belong together
+        self._state = (np.zeros(initial_capacity, dtype=self.dtype), 0)
+
+    def __len__(self):
+        return self._state[1]
+
+    @property
+    def nbytes(self):
+        """Bytes allocated for rows (including unused capacity)"""
+        return self._state[0].nbytes
+
+    def _reserve(self, needed):
+        array, count = self._state
+        if needed <= len(array):
+            return array
+        # Grow into a new array; views held by readers stay valid
+        grown = np.zeros(max(needed, 2 * len(array)), dtype=self.dtype)
+        grown[:count] = array[:count]
+        return grown
+
+    def append(self, row):
+        """Append one row given as a tuple of field values (single writer)"""
+        count = self._state[1]
+        array = self._reserve(count + 1)
+        array[count] = row
+        self._state = (array, count + 1)
+
+    def extend(self, rows):
+        """Append a structured array of rows (single writer)"""
+        count = self._state[1]
+        needed = count + len(rows)
+        array = self._reserve(needed)
+        array[count:needed] = rows
+        self._state = (array, needed)
+
+    def view(self):
+        """Read-only view of all rows"""
+        array, count = self._state
+        rows = array[:count]
+        rows.flags.writeable = False
+        return rows
+
+    def clear(self):
+        self._state = (np.zeros(len(self._state[0]), dtype=self.dtype), 0)
@@ -3,6 +3,10 @@ import threading
 import time
 import abc
 
+from .health import SensorHealth
+from .sample import Reading
+from .timing import SESSION_CLOCK, ClockOffsetEstimator
+
 class SensorBase(abc.ABC):
     """Base class for all sensor implementations"""
     
@@ -12,11 +16,51 @@ class SensorBase(abc.ABC):
         self.running = False
         self.thread = None
         self.stop_event = threading.Event()
-        self.last_reading = None
-        self.last_timestamp = None
+        # Latest Reading(value, timestamp), replaced as a whole so other
+        # threads never pair a new value with an old timestamp
+        self.latest = None
         self.error_count = 0
         self.max_errors = 5
+        self.error_delay = 1.0
+        
+        # After max_errors consecutive errors the sensor reconnects, waiting
+        # reconnect_delay seconds and doubling the wait after every failure
+        self.reconnect_delay = 1.0
+        self.max_reconnect_delay = 30.0
+        self._backoff = None
+        self.health = SensorHealth(update_rate)
+        
+        # Timestamps are on the monotonic session clock; device-provided
+        # sample times are mapped onto it by the offset estimator
+        self.clock = SESSION_CLOCK
+        self.clock_estimator = ClockOffsetEstimator()
+        self.last_device_timestamp = None
         
+        # Serial link to real hardware; subclasses create it when given a port
+        self.link = None
+        
+        # Callbacks receiving (sensor, value, timestamp) for every new reading
+        self.listeners = []
+        
+    @property
+    def last_reading(self):
+        latest = self.latest
+        return None if latest is None else latest.value
+    
+    @property
+    def last_timestamp(self):
+        latest = self.latest
+        return None if latest is None else latest.timestamp
+    
+    def add_listener(self, callback):
+        """Register a callback called as callback(sensor, value, timestamp) per reading"""
+        self.listeners.append(callback)
+    
+    def remove_listener(self, callback):
+        """Unregister a reading callback"""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+    
     def start(self):
         """Start the sensor reading thread"""
         if self.running:
@@ -24,6 +68,8 @@ class SensorBase(abc.ABC):
             return
             
         print(f"Starting {self.name}")
+        self.health.reset(self.clock.now())
+        self.error_count = 0
         self.stop_event.clear()
         self.running = True
         self.thread = threading.Thread(target=self._reading_loop, daemon=True)
@@ -39,34 +85,108 @@ class SensorBase(abc.ABC):
         self.running = False
         if self.thread:
             self.thread.join(timeout=2.0)
+        if self.link is not None:
+            self.link.close()
     
     def _reading_loop(self):
         """Main sensor reading loop"""
         while not self.stop_event.is_set():
             try:
-                reading = self._read_sensor()
+                requested = self.clock.now()
+                reading, device_timestamp = self._read_sample()
+                received = self.clock.now()
                 if reading is not None:
-                    self.last_reading = reading
-                    self.last_timestamp = time.time()
+                    timestamp = self._sample_time(requested, received, device_timestamp)
+                    self.latest = Reading(reading, timestamp)
+                    self.last_device_timestamp = device_timestamp
                     self.error_count = 0
+                    self._backoff = None
+                    self.health.record_reading(timestamp)
+                    for listener in self.listeners:
+                        listener(self, reading, timestamp)
+                elif self.link is not None and self.health.is_stale(received):
+                    # A silent device counts as failing, so it gets reconnected too
+                    raise TimeoutError(f"no data for {self.health.age(received):.1f} s")
                 time.sleep(self.update_rate)
             except Exception as e:
                 print(f"Error reading from {self.name}: {str(e)}")
                 self.error_count += 1
+                self.health.record_error(self.clock.now(), e)
                 if self.error_count > self.max_errors:
-                    print(f"Too many errors from {self.name}, stopping sensor")
-                    self.running = False
-                    break
-                time.sleep(1.0)  # Wait longer after error
+                    self._reconnect_with_backoff()
+                    continue
+                self.stop_event.wait(self.error_delay)  # Wait longer after error
+    
+    def _reconnect_with_backoff(self):
+        """
+        Retry _reconnect() with exponential backoff until it succeeds or the
+        sensor stops. The wait keeps growing across rounds until a reading
+        arrives, so a device that accepts connections but stays silent is not
+        retried at full speed.
+        """
+        if self._backoff is None:
+            self._backoff = self.reconnect_delay
+        print(f"Too many errors from {self.name}, reconnecting in {self._backoff:g} s")
+        self.health.reconnecting = True
+        while not self.stop_event.wait(self._backoff):
+            self._backoff = min(2 * self._backoff, self.max_reconnect_delay)
+            try:
+                self._reconnect()
+            except Exception as e:
+                print(f"Reconnecting {self.name} failed: {str(e)}; "
+                      f"next attempt in {self._backoff:g} s")
+                continue
+            print(f"{self.name} reconnected")
+            self.error_count = 0
+            self.health.record_reconnect(self.clock.now())
+            return
+    
+    def _reconnect(self):
+        """
+        Re-establish the connection to the sensor; raise if it is not back yet
+        
+        Serial sensors reopen their port. The device may have restarted, so
+        its clock offset is estimated afresh.
+        """
+        if self.link is not None:
+            self.link.reconnect()
+        self.clock_estimator = ClockOffsetEstimator()
+    
+    def _sample_time(self, requested, received, device_timestamp):
+        """
+        Best estimate of when the sample was taken, on the session clock
+        
+        Args:
+            requested: Session time just before the read started
+            received: Session time just after the read returned
+            device_timestamp: Sample time from the device clock, or None
+        """
+        if device_timestamp is not None:
+            self.clock_estimator.add(device_timestamp, received)
+            corrected = self.clock_estimator.to_session(device_timestamp)
+            if corrected is not None:
+                return corrected
+        # Without a device clock the sample happened somewhere during the read
+        return 0.5 * (requested + received)
     
     def get_reading(self):
-        """Get the latest reading with timestamp"""
-        if self.last_reading is None:
-            return None
-        return {
-            'value': self.last_reading,
-            'timestamp': self.last_timestamp
-        }
+        """Get the latest Reading(value, timestamp), or None before the first one"""
+        return self.latest
+    
+    def _read_sample(self):
+        """
+        Read one sample together with its device timestamp
+        
+        Sensors connected through a serial link return the newest sample
+        and its device timestamp; otherwise _read_sensor() is used.
+        
+        Returns:
+            (value, device_timestamp) where device_timestamp is in seconds on
+            the device clock, or None if the device has no clock
+        """
+        if self.link is not None:
+            return self.link.read_sample()
+        return self._read_sensor(), None
     
     @abc.abstractmethod
     def _read_sensor(self):
@@ -6,69 +6,130 @@ import queue
 from .encoder import EncoderSensor
 from .strain_gauge import StrainGaugeSensor
 from .load_cell import LoadCellSensor
+from .channels import DEFAULT_SCHEMA, Channel, ChannelSchema
+from .sample import Sample
+from .timing import SESSION_CLOCK
 
 class SensorManager:
     """
     Manages and synchronizes data from multiple sensors
     """
     
-    def __init__(self, data_queue, sync_threshold=0.1):
+    def __init__(self, data_queue, sync_threshold=0.1, rig_id=None, update_rate=0.1,
+                 filter_stage=None, clock=None, decimation=None, sensors=None, schema=None,
+                 calibration=None):
         """
         Initialize the sensor manager
         
         Args:
             data_queue: Queue to send synchronized data
             sync_threshold: Maximum time difference (in seconds) allowed between readings
+            rig_id: Identifier of the fixture these sensors belong to (tags every frame)
+            update_rate: Seconds between readings for each sensor
+            filter_stage: Optional FilterStage applied to each frame before publishing
+            clock: SessionClock shared by the sensors (default: process-wide clock)
+            decimation: Optional DecimationStage reducing the frames put on the
+                queue; frame listeners still receive every frame
+            sensors: Dictionary mapping channel name to a SensorBase (default:
+                encoder, strain gauge and load cell as angle, torque, preload)
+            schema: ChannelSchema of the sensors' channels, in frame order
+                (default: DEFAULT_SCHEMA, or unit-less channels named after
+                the keys of sensors)
+            calibration: Optional CalibrationStage converting raw readings,
+                applied before filter_stage
         """
         self.data_queue = data_queue
         self.sync_threshold = sync_threshold
+        self.rig_id = rig_id
+        self.calibration = calibration
+        self.filter_stage = filter_stage
+        self.decimation = decimation
+        self.clock = clock or SESSION_CLOCK
         self.running = False
         self.thread = None
         self.stop_event = threading.Event()
         
         # Create sensor instances
-        self.encoder = EncoderSensor()
-        self.strain_gauge = StrainGaugeSensor()
-        self.load_cell = LoadCellSensor()
+        if sensors is None:
+            self.encoder = EncoderSensor(update_rate=update_rate)
+            self.strain_gauge = StrainGaugeSensor(update_rate=update_rate)
+            self.load_cell = LoadCellSensor(update_rate=update_rate)
+            sensors = {'angle': self.encoder, 'torque': self.strain_gauge,
+                       'preload': self.load_cell}
+        if schema is None:
+            schema = DEFAULT_SCHEMA if list(sensors) == list(DEFAULT_SCHEMA.names) else \
+                ChannelSchema([Channel(name, "") for name in sensors])
+        if set(schema.names) != set(sensors):
+            raise ValueError("The schema must name exactly the channels of the sensors")
+        self.schema = schema
+        # Standard frames are compact Samples; other schemas publish dictionaries
+        self.sample_frames = schema == DEFAULT_SCHEMA
         
-        # List of all sensors for easier management
-        self.sensors = [self.encoder, self.strain_gauge, self.load_cell]
+        # List of all sensors for easier management, in schema order
+        self.sensors = [sensors[name] for name in schema.names]
+        for sensor in self.sensors:
+            sensor.clock = self.clock
         
         # Last synchronized timestamp
-        self.last_sync_time = 0
+        self.last_sync_time = float("-inf")
+        
+        # Names of stale sensors currently left out of frames
+        self.excluded = set()
+        
+        # Number of frames successfully handed to the queue
+        self.frames_published = 0
+        
+        # Callbacks receiving every full-rate frame (e.g. recorders)
+        self.frame_listeners = []
+    
+    def add_frame_listener(self, callback):
+        """Register a callback called as callback(frame) for every synchronized frame"""
+        self.frame_listeners.append(callback)
+    
+    def remove_frame_listener(self, callback):
+        """Unregister a frame callback"""
+        if callback in self.frame_listeners:
+            self.frame_listeners.remove(callback)
         
-    # ... rest of the class implementation stays the same ...
+    def start(self, sync_thread=True):
+        """
+        Start all sensors and the synchronization thread
         
-    def start(self):
-        """Start all sensors and the synchronization thread"""
+        Args:
+            sync_thread: Run a dedicated synchronization thread. Pass False when
+                an external scheduler (e.g. RigRegistry) calls poll() instead.
+        """
         if self.running:
             print("Sensor manager is already running")
             return
             
-        print("Starting sensor manager")
+        print(f"Starting sensor manager{self._rig_label()}")
         
         # Start all sensors
         for sensor in self.sensors:
             sensor.start()
         
-        # Start synchronization thread
         self.stop_event.clear()
         self.running = True
-        self.thread = threading.Thread(target=self._sync_loop, daemon=True)
-        self.thread.start()
+        
+        # Start synchronization thread
+        if sync_thread:
+            self.thread = threading.Thread(target=self._sync_loop, daemon=True)
+            self.thread.start()
         
     def stop(self):
         """Stop all sensors and the synchronization thread"""
         if not self.running:
             return
             
-        print("Stopping sensor manager")
+        print(f"Stopping sensor manager{self._rig_label()}")
         self.stop_event.set()
         self.running = False
         
         # Stop synchronization thread
         if self.thread:
             self.thread.join(timeout=2.0)
+            self.thread = None
         
         # Stop all sensors
         for sensor in self.sensors:
@@ -83,15 +144,7 @@ class SensorManager:
         
         while not self.stop_event.is_set():
             try:
-                # Attempt to collect synchronized data
-                sync_data = self._get_synchronized_data()
-                
-                if sync_data:
-                    try:
-                        # Add synchronized data to queue with timeout
-                        self.data_queue.put(sync_data, block=True, timeout=0.1)
-                    except queue.Full:
-                        print("Queue is full, skipping synchronized data point")
+                self.poll()
                 
                 # Sleep a short time before next sync attempt
                 time.sleep(0.02)  # 20ms sleep allows for up to 50Hz sync rate
@@ -100,46 +153,117 @@ class SensorManager:
                 print(f"Error in sensor synchronization: {str(e)}")
                 time.sleep(0.5)
     
+    def poll(self):
+        """
+        Make a single synchronization attempt and publish the result
+        
+        Returns:
+            True if a synchronized frame was produced and nothing was dropped
+        """
+        # Attempt to collect synchronized data
+        sync_data = self._get_synchronized_data()
+        if not sync_data:
+            return False
+        
+        if self.calibration is not None:
+            sync_data = self.calibration.process_frame(sync_data)
+        if self.filter_stage is not None:
+            sync_data = self.filter_stage.process_frame(sync_data)
+        
+        # Recorders get the full-rate stream, the queue only the display stream
+        for listener in self.frame_listeners:
+            listener(sync_data)
+        if self.decimation is None:
+            frames = [sync_data]
+        else:
+            frames = self.decimation.process_frame(sync_data)
+        
+        for frame in frames:
+            try:
+                # Add synchronized data to queue with timeout
+                self.data_queue.put(frame, block=True, timeout=0.1)
+            except queue.Full:
+                print(f"Queue is full, skipping synchronized data point{self._rig_label()}")
+                return False
+            self.frames_published += 1
+        return True
+    
+    def _rig_label(self):
+        """Suffix used in log messages to identify the rig"""
+        return "" if self.rig_id is None else f" (rig {self.rig_id})"
+    
     def _get_synchronized_data(self):
         """
         Get synchronized data from all sensors
         
         Returns:
-            Dictionary with synchronized data or None if cannot synchronize
+            Sample with synchronized data (NaN and a cleared valid bit for
+            stale sensors) or None if cannot synchronize
         """
-        # Get current readings from all sensors
-        encoder_data = self.encoder.get_reading()
-        strain_data = self.strain_gauge.get_reading()
-        load_cell_data = self.load_cell.get_reading()
+        now = self.clock.now()
         
-        # Ensure all sensors have data
-        if not encoder_data or not strain_data or not load_cell_data:
-            return None
+        # Sensors whose latest reading is older than their health's
+        # stale_after are left out: their channels become NaN and the
+        # others keep flowing. A sensor that has not reported yet is waited
+        # for until it has been running that long.
+        readings = []
+        for sensor in self.sensors:
+            reading = sensor.get_reading()
+            if reading is None:
+                if not sensor.health.is_stale(now):
+                    return None
+            elif now - reading.timestamp > sensor.health.stale_after:
+                reading = None
+            readings.append(reading)
+        self._update_excluded(readings)
         
-        # Check if timestamps are within threshold
-        timestamps = [
-            encoder_data['timestamp'],
-            strain_data['timestamp'],
-            load_cell_data['timestamp']
-        ]
+        # Check if timestamps are within threshold. These are corrected sample
+        # times on the monotonic session clock, not wall-clock read times.
+        timestamps = [reading.timestamp for reading in readings if reading is not None]
+        if not timestamps:
+            return None
         
         max_diff = max(timestamps) - min(timestamps)
         if max_diff > self.sync_threshold:
             # Data is not synchronized enough
             return None
         
-        # Data is synchronized, create data packet
-        now = time.time()
-        
         # Only send if this is newer than our last sync
         if now - self.last_sync_time < 0.01:  # Prevent too frequent updates
             return None
             
         self.last_sync_time = now
         
-        return {
-            'timestamp': now,
-            'angle': encoder_data['value'],
-            'torque': strain_data['value'],
-            'preload': load_cell_data['value']
-        }
\ No newline at end of file
+        valid = 0
+        values = []
+        for index, reading in enumerate(readings):
+            if reading is None:
+                values.append(float("nan"))
+            else:
+                values.append(reading.value)
+                valid |= 1 << index
+        
+        # Frame time is the mean sample time of its readings
+        timestamp = sum(timestamps) / len(timestamps)
+        if self.sample_frames:
+            return Sample(self.rig_id, timestamp, *values, valid)
+        frame = dict(zip(self.schema.names, values))
+        frame.update(rig_id=self.rig_id, timestamp=timestamp, valid=valid)
+        return frame
+    
+    def _update_excluded(self, readings):
+        """Log sensors dropping out of or returning to the frames"""
+        excluded = {sensor.name for sensor, reading in zip(self.sensors, readings)
+                    if reading is None}
+        if excluded == self.excluded:
+            return
+        for name in excluded - self.excluded:
+            print(f"{name} is stale, publishing frames without it{self._rig_label()}")
+        for name in self.excluded - excluded:
+            print(f"{name} is back{self._rig_label()}")
+        self.excluded = excluded
+    
+    def get_health(self):
+        """Health statistics of every sensor, keyed by sensor name"""
+        now = self.clock.now()
+        return {sensor.name: sensor.health.snapshot(now) for sensor in self.sensors}
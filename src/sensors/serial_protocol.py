@@ -0,0 +1,387 @@
+# src/sensors/serial_protocol.py
+"""
+Framed binary protocol for the serial sensor boards
+
+Frame layout (little endian):
+
+    sync    2 bytes   0xA5 0x5A
+    length  uint16    payload length in bytes
+    channel uint8     sensor channel (see CHANNEL_* constants)
+    payload length    records of (uint32 device time in µs, float32 value)
+    crc     uint16    CRC-CCITT (0xFFFF init) over length, channel and payload
+
+Bytes are read straight into a preallocated bytearray, sync words are
+located with bytearray.find, CRCs are computed by binascii and payloads
+are decoded with np.frombuffer, so no Python code runs per byte.
+"""
+import binascii
+import collections
+import os
+import select
+import struct
+import threading
+
+import numpy as np
+
+try:
+    import serial  # PySerial, used when available
+except ImportError:
+    serial = None
+
+SYNC = b"\xa5\x5a"
+HEADER = struct.Struct("<2sHB")
+CRC = struct.Struct("<H")
+RECORD_DTYPE = np.dtype([('time_us', '<u4'), ('value', '<f4')])
+MAX_PAYLOAD = 4096
+
+CHANNEL_ENCODER = 0
+CHANNEL_STRAIN_GAUGE = 1
+CHANNEL_LOAD_CELL = 2
+
+
+def encode_frame(channel, times_us, values):
+    """
+    Build one frame (used by device emulators and tests)
+
+    Args:
+        channel: Sensor channel id
+        times_us: Device timestamps in microseconds
+        values: Sample values
+
+    Returns:
+        bytes of the complete frame
+    """
+    records = np.empty(len(values), dtype=RECORD_DTYPE)
+    records['time_us'] = times_us
+    records['value'] = values
+    payload = records.tobytes()
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError("Too many records for one frame")
+    body = HEADER.pack(SYNC, len(payload), channel)[2:] + payload
+    return SYNC + body + CRC.pack(binascii.crc_hqx(body, 0xFFFF))
+
+
+class FrameParser:
+    """Incremental frame decoder with resynchronization after corruption"""
+
+    def __init__(self, capacity=65536):
+        """
+        Args:
+            capacity: Size of the receive buffer in bytes
+        """
+        self.buffer = bytearray(capacity)
+        self.view = memoryview(self.buffer)
+        self.start = 0
+        self.end = 0
+
+        # Counters for link diagnostics
+        self.frames_ok = 0
+        self.crc_errors = 0
+        self.bytes_discarded = 0
+
+    def fill_from(self, port):
+        """
+        Read whatever the port has directly into the free part of the buffer
+
+        Returns:
+            Number of bytes read
+        """
+        self._make_room()
+        count = port.readinto(self.view[self.end:]) or 0
+        self.end += count
+        return count
+
+    def feed(self, data):
+        """Append bytes from any other source"""
+        self._make_room(len(data))
+        self.buffer[self.end:self.end + len(data)] = data
+        self.end += len(data)
+
+    def _make_room(self, needed=1):
+        """Move unparsed bytes to the front of the buffer"""
+        if self.start == 0 and len(self.buffer) - self.end >= needed:
+            return
+        pending = self.end - self.start
+        # bytes() so the overlapping move cannot alias itself
+        self.buffer[:pending] = bytes(self.view[self.start:self.end])
+        self.start = 0
+        self.end = pending
+        if len(self.buffer) - self.end < needed:
+            raise BufferError("Receive buffer overflow")
+
+    def parse(self):
+        """
+        Decode all complete frames in the buffer
+
+        Returns:
+            List of (channel, times, values) with times in seconds (float64)
+            and values as float64 arrays
+        """
+        frames = []
+        buffer = self.buffer
+        while True:
+            index = buffer.find(SYNC, self.start, self.end)
+            if index < 0:
+                # Keep a trailing byte that may be the first half of a sync word
+                keep = 1 if self.end > self.start and buffer[self.end - 1] == SYNC[0] else 0
+                self.bytes_discarded += self.end - self.start - keep
+                self.start = self.end - keep
+                break
+            self.bytes_discarded += index - self.start
+            self.start = index
+
+            if self.end - self.start < HEADER.size:
+                break
+            _, length, channel = HEADER.unpack_from(buffer, self.start)
+            if length > MAX_PAYLOAD or length % RECORD_DTYPE.itemsize:
+                # Not a real header: skip this sync word and search again
+                self.start += 1
+                self.bytes_discarded += 1
+                continue
+
+            total = HEADER.size + length + CRC.size
+            if self.end - self.start < total:
+                break
+
+            body = self.view[self.start + 2:self.start + HEADER.size + length]
+            (crc,) = CRC.unpack_from(buffer, self.start + HEADER.size + length)
+            if binascii.crc_hqx(body, 0xFFFF) != crc:
+                self.crc_errors += 1
+                self.start += 1
+                self.bytes_discarded += 1
+                continue
+
+            records = np.frombuffer(
+                buffer, dtype=RECORD_DTYPE, count=length // RECORD_DTYPE.itemsize,
+                offset=self.start + HEADER.size
+            )
+            # The conversions copy out of the receive buffer, which is reused
+            frames.append((channel, records['time_us'] * 1e-6, records['value'].astype(np.float64)))
+            self.frames_ok += 1
+            self.start += total
+        return frames
+
+
+class PosixSerialPort:
+    """Minimal raw serial/pty port used when PySerial is not installed"""
+
+    def __init__(self, port, baudrate=115200, timeout=0.1):
+        import termios
+        import tty
+
+        speed = getattr(termios, f"B{baudrate}", None)
+        if speed is None:
+            raise ValueError(f"Unsupported baud rate: {baudrate}")
+        self.timeout = timeout
+        self.fd = os.open(port, os.O_RDWR | os.O_NOCTTY | os.O_NONBLOCK)
+        try:
+            tty.setraw(self.fd, termios.TCSANOW)
+            attributes = termios.tcgetattr(self.fd)
+            attributes[4] = attributes[5] = speed   # input and output speed
+            termios.tcsetattr(self.fd, termios.TCSANOW, attributes)
+        except termios.error:
+            # Not a terminal (e.g. a plain pipe): there is no line speed to set
+            pass
+
+    def readinto(self, buffer):
+        """Wait up to timeout for data, then read it straight into buffer"""
+        ready, _, _ = select.select([self.fd], [], [], self.timeout)
+        if not ready:
+            return 0
+        try:
+            return os.readv(self.fd, [buffer])
+        except BlockingIOError:
+            return 0
+
+    def write(self, data):
+        return os.write(self.fd, data)
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+def open_port(port, baudrate=115200, timeout=0.1):
+    """Open a serial port with PySerial if available, else the POSIX fallback"""
+    if serial is not None:
+        return serial.Serial(port, baudrate=baudrate, timeout=timeout)
+    return PosixSerialPort(port, baudrate=baudrate, timeout=timeout)
+
+
+class SerialDevice:
+    """
+    One serial board: a single port and parser shared by all its channels
+
+    A board streams every channel over the same port, so the frames are
+    decoded once here and routed to per-channel queues. Whichever link
+    reads first pulls everything the port has; the frames of the other
+    channels wait in their queues instead of being lost.
+    """
+
+    # Frames kept per channel for a link that has not read them yet
+    MAX_QUEUED_FRAMES = 1024
+
+    _devices = {}
+    _devices_lock = threading.Lock()
+
+    def __init__(self, port, baudrate=115200, timeout=0.1):
+        self.port_name = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.port = None
+        self.parser = FrameParser()
+        self.queues = {}
+        self.users = 0
+        self.frames_dropped = 0
+        self.lock = threading.Lock()
+
+    @classmethod
+    def acquire(cls, port, baudrate=115200, timeout=0.1):
+        """Shared device of a port, opened by its first user"""
+        with cls._devices_lock:
+            device = cls._devices.get(port)
+            if device is None:
+                device = cls._devices[port] = cls(port, baudrate, timeout)
+            device.users += 1
+        return device
+
+    def release(self):
+        """Drop one user; the last one closes the port"""
+        with SerialDevice._devices_lock:
+            self.users -= 1
+            if self.users > 0:
+                return
+            if SerialDevice._devices.get(self.port_name) is self:
+                del SerialDevice._devices[self.port_name]
+        with self.lock:
+            self._close_port()
+
+    def subscribe(self, channel):
+        """Queue the frames of a channel from now on, opening the port if needed"""
+        with self.lock:
+            self.queues.setdefault(channel, collections.deque(maxlen=self.MAX_QUEUED_FRAMES))
+            if self.port is None:
+                self.port = open_port(self.port_name, self.baudrate, self.timeout)
+
+    def reopen(self):
+        """Close and reopen the port (e.g. after the board restarted)"""
+        with self.lock:
+            self._close_port()
+            self.parser = FrameParser()
+            self.port = open_port(self.port_name, self.baudrate, self.timeout)
+
+    def read(self, channel):
+        """
+        Frames of one channel received so far
+
+        Reads the port first if the channel has nothing queued.
+
+        Returns:
+            List of (times, values) pairs
+        """
+        with self.lock:
+            queue = self.queues[channel]
+            if not queue:
+                if self.port is None:
+                    self.port = open_port(self.port_name, self.baudrate, self.timeout)
+                self.parser.fill_from(self.port)
+                for number, times, values in self.parser.parse():
+                    target = self.queues.get(number)
+                    if target is None:
+                        continue
+                    if len(target) == target.maxlen:
+                        self.frames_dropped += 1
+                    target.append((times, values))
+            frames = list(queue)
+            queue.clear()
+        return frames
+
+    def _close_port(self):
+        if self.port is not None:
+            self.port.close()
+            self.port = None
+
+
+class SerialSensorLink:
+    """Connection from one sensor object to its channel on a serial board"""
+
+    def __init__(self, port, channel, baudrate=115200, timeout=0.1):
+        """
+        Args:
+            port: Device path (e.g. /dev/ttyUSB0); links on the same port
+                share one SerialDevice
+            channel: Channel id whose frames this link accepts
+            baudrate: Serial baud rate
+            timeout: Seconds a read may block waiting for data
+        """
+        self.port_name = port
+        self.channel = channel
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.device = None
+
+        # Device timestamps are 32-bit microseconds and wrap every ~71.6 minutes
+        self._wrap_offset = 0.0
+        self._last_raw_time = None
+        self.samples_received = 0
+
+    def open(self):
+        if self.device is None:
+            device = SerialDevice.acquire(self.port_name, self.baudrate, self.timeout)
+            try:
+                device.subscribe(self.channel)
+            except Exception:
+                device.release()
+                raise
+            self.device = device
+
+    def close(self):
+        if self.device is not None:
+            self.device.release()
+            self.device = None
+
+    def reconnect(self):
+        """Reopen the board's port for every channel on it"""
+        self.open()
+        self.device.reopen()
+
+    def read_batch(self):
+        """
+        Read available frames for this channel
+
+        Returns:
+            (times, values) arrays with device times in seconds (unwrapped),
+            both empty if nothing arrived before the timeout
+        """
+        self.open()
+        frames = self.device.read(self.channel)
+        if not frames:
+            return np.empty(0), np.empty(0)
+        times = np.concatenate([f[0] for f in frames])
+        values = np.concatenate([f[1] for f in frames])
+        self.samples_received += values.size
+        return self._unwrap(times), values
+
+    def _unwrap(self, times):
+        """Remove 2**32 µs wrap-arounds from device timestamps"""
+        period = 2 ** 32 * 1e-6
+        previous = times[0] if self._last_raw_time is None else self._last_raw_time
+        steps = np.diff(times, prepend=previous)
+        wraps = np.cumsum(steps < -period / 2) * period
+        self._last_raw_time = times[-1]
+        unwrapped = times + self._wrap_offset + wraps
+        self._wrap_offset += wraps[-1]
+        return unwrapped
+
+    def read_sample(self):
+        """
+        Read the newest sample for this channel
+
+        Returns:
+            (value, device_time) or (None, None) if nothing arrived
+        """
+        times, values = self.read_batch()
+        if values.size == 0:
+            return None, None
+        return float(values[-1]), float(times[-1])
@@ -2,19 +2,22 @@
 import random
 import math
 from src.sensors.sensor_base import SensorBase
+from src.sensors.serial_protocol import CHANNEL_STRAIN_GAUGE, SerialSensorLink
 
 class StrainGaugeSensor(SensorBase):
     """Reads torque data from strain gauge"""
     
-    def __init__(self, port=None, update_rate=0.1):
+    def __init__(self, port=None, update_rate=0.1, baudrate=115200):
         super().__init__(name="Strain Gauge", update_rate=update_rate)
         self.port = port
+        self.baudrate = baudrate
+        if port is not None:
+            self.link = SerialSensorLink(port, channel=CHANNEL_STRAIN_GAUGE, baudrate=baudrate)
         # Add specific strain gauge configuration here
         
     def _read_sensor(self):
         """Read torque from strain gauge"""
-        # Replace with actual strain gauge reading code
-        # For testing, use simulated data
+        # Simulation used when no serial port is configured
         if not hasattr(self, '_angle'):
             self._angle = 0
         self._angle = (self._angle + 1) % 360
@@ -0,0 +1,140 @@
+# src/sensors/timing.py
+"""
+Clock domain helpers for sensor timestamps
+
+All acquisition timestamps are expressed in seconds on a monotonic session
+clock, so wall-clock steps (NTP, manual changes) cannot break the
+synchronization checks. Sensors that report their own sample time have it
+mapped onto the session clock by an online offset/drift estimator.
+"""
+import time
+
+import numpy as np
+
+
+class SessionClock:
+    """Monotonic clock counting seconds since the session started"""
+
+    def __init__(self):
+        self._origin = time.perf_counter()
+        # Wall time at the origin, only used to label data for humans
+        self.wall_origin = time.time()
+
+    def now(self):
+        """Seconds since the session started (monotonic)"""
+        return time.perf_counter() - self._origin
+
+    def to_wall(self, session_time):
+        """Convert a session timestamp to approximate Unix time"""
+        return self.wall_origin + session_time
+
+
+# Shared clock so every sensor in the process uses the same time domain
+SESSION_CLOCK = SessionClock()
+
+
+class ClockOffsetEstimator:
+    """
+    Online estimate of a device clock's offset and drift against the session clock
+
+    Keeps the last `window` (device time, host arrival time) pairs and fits
+    host = offset + rate * device with a vectorized least-squares fit. Since
+    arrival times only ever lag the true sample time, the fitted line is
+    then lowered onto the earliest arrivals so the transport latency is
+    removed rather than averaged in.
+    """
+
+    def __init__(self, window=256, refit_interval=16, min_samples=8):
+        """
+        Args:
+            window: Number of recent timestamp pairs used for the fit
+            refit_interval: Refit after this many new pairs
+            min_samples: Pairs required before the estimate is used
+        """
+        self.window = window
+        self.refit_interval = refit_interval
+        self.min_samples = min_samples
+
+        self._device = np.zeros(window)
+        self._host = np.zeros(window)
+        self._index = 0
+        self._count = 0
+        self._since_fit = 0
+
+        # Device times are stored relative to the first one for precision
+        self._device_origin = None
+
+        self.offset = 0.0
+        self.rate = 1.0
+        self.ready = False
+
+    @property
+    def drift_ppm(self):
+        """
+        Device clock drift relative to the session clock, in parts per million;
+        positive when the device clock runs fast (rate is session seconds per
+        device second, so a fast device clock has a rate below one)
+        """
+        return (1.0 / self.rate - 1.0) * 1e6
+
+    def reset(self):
+        """Forget all timestamp pairs"""
+        self._index = 0
+        self._count = 0
+        self._since_fit = 0
+        self._device_origin = None
+        self.offset = 0.0
+        self.rate = 1.0
+        self.ready = False
+
+    def add(self, device_time, host_time):
+        """
+        Record a new timestamp pair
+
+        Args:
+            device_time: Sample time reported by the device (seconds)
+            host_time: Session time at which the sample arrived
+        """
+        if self._device_origin is None:
+            self._device_origin = device_time
+        self._device[self._index] = device_time - self._device_origin
+        self._host[self._index] = host_time
+        self._index = (self._index + 1) % self.window
+        self._count = min(self.window, self._count + 1)
+        self._since_fit += 1
+
+        if self._count >= self.min_samples and (
+                not self.ready or self._since_fit >= self.refit_interval):
+            self._fit()
+
+    def _fit(self):
+        device = self._device[:self._count]
+        host = self._host[:self._count]
+
+        device_mean = device.mean()
+        centered = device - device_mean
+        spread = np.dot(centered, centered)
+        if spread > 0:
+            rate = np.dot(centered, host - host.mean()) / spread
+        else:
+            rate = 1.0
+        offset = host.mean() - rate * device_mean
+
+        # Lower envelope: shift onto the least-delayed arrival
+        offset += float(np.min(host - (offset + rate * device)))
+
+        self.rate = float(rate)
+        self.offset = float(offset)
+        self.ready = True
+        self._since_fit = 0
+
+    def to_session(self, device_time):
+        """
+        Map a device timestamp onto the session clock
+
+        Returns:
+            Session time, or None until enough pairs have been collected
+        """
+        if not self.ready:
+            return None
+        return self.offset + self.rate * (device_time - self._device_origin)
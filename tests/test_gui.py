@@ -0,0 +1,51 @@
+# tests/test_gui.py
+from src.gui.refresh_scheduler import RefreshScheduler
+
+
+def test_scheduler_backs_off_when_render_exceeds_budget():
+    scheduler = RefreshScheduler("default")
+    scheduler.next_interval(had_data=True)
+
+    scheduler.record_frame(80.0)
+
+    assert scheduler.next_interval(had_data=True) == 160
+    for _ in range(50):
+        scheduler.record_frame(5.0)
+    assert scheduler.next_interval(had_data=True) == scheduler.base_interval
+
+
+def test_scheduler_idles_without_data_or_when_hidden():
+    scheduler = RefreshScheduler("low_power")
+
+    assert scheduler.next_interval(had_data=False) == scheduler.idle_interval
+    assert scheduler.next_interval(had_data=True, visible=False) == scheduler.idle_interval
+    assert scheduler.next_interval(had_data=True) == scheduler.base_interval
+
+
+def test_offscreen_renderer_applies_updates_and_keeps_newest_frame():
+    import time
+
+    from matplotlib.figure import Figure
+
+    from src.gui.offscreen_renderer import OffscreenRenderer
+
+    fig = Figure(figsize=(2, 1), dpi=50)
+    line, = fig.add_subplot().plot([], [])
+    renderer = OffscreenRenderer(fig)
+    renderer.start()
+    try:
+        for step in range(5):
+            renderer.submit(lambda step=step: line.set_data([0, 1], [step, step]))
+            renderer.submit(lambda: time.sleep(0.02))
+        deadline = time.monotonic() + 5.0
+        while (renderer.busy or not renderer.has_frame) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        image, render_ms = renderer.take_frame()
+        assert image.shape == (50, 100, 4)
+        assert render_ms > 0
+        assert list(line.get_ydata()) == [4, 4]
+        assert renderer.frames_rendered - renderer.frames_dropped == 1
+        assert renderer.take_frame() is None
+    finally:
+        renderer.stop()
@@ -0,0 +1,515 @@
+# tests/tests_data_source.py
+import os
+import queue
+
+import numpy as np
+import pytest
+
+from src.data.filters import (
+    BiquadFilter, EWMAFilter, FilterStage, MedianFilter, MovingAverageFilter,
+)
+from src.data.calibration import CalibrationStage
+from src.data.cycles import CycleDetector
+from src.data.data_logger import (
+    ChannelCodec, DataLogger, decode_chunk, encode_chunk, read_log, schema_codecs,
+)
+from src.data.data_source import DataSource
+from src.data.decimation import DecimationStage
+from src.data.derived import DerivedEngine
+from src.data.snapshot_buffer import SnapshotBuffer
+from src.data.spc import AngleBinModel, SPCMonitor
+from src.data.spectrum import SlidingSpectrum
+from src.data.triggers import CaptureStore, EdgeTrigger, TriggerEngine, parse_trigger
+from src.analysis import METRICS_DTYPE, analyze_sessions, compute_metrics, content_hash
+from src.report import generate_reports, output_prefix
+from src.sensors.channels import DEFAULT_SCHEMA, ChannelSchema, ChannelStats
+from src.sensors.sample import SAMPLE_DTYPE, RecordLog, Sample
+
+
+def _chunked(make_filter, signal, sizes):
+    """Run a fresh filter over the signal split into chunks of the given sizes"""
+    stream_filter = make_filter()
+    out, start = [], 0
+    for size in sizes:
+        out.append(stream_filter.process(signal[start:start + size]))
+        start += size
+    out.append(stream_filter.process(signal[start:]))
+    return np.concatenate(out)
+
+
+@pytest.mark.parametrize("make_filter", [
+    lambda: MovingAverageFilter(7),
+    lambda: MedianFilter(5),
+    lambda: EWMAFilter(0.2),
+    lambda: BiquadFilter.lowpass(1000.0, 20.0),
+    lambda: BiquadFilter.notch(1000.0, 50.0),
+])
+def test_filters_are_bit_exact_across_chunks(make_filter):
+    rng = np.random.default_rng(0)
+    signal = rng.normal(50.0, 5.0, 1000)
+
+    whole = make_filter().process(signal)
+    pieces = _chunked(make_filter, signal, [1, 3, 250, 0, 17, 400])
+
+    assert np.array_equal(whole, pieces)
+
+
+def test_lowpass_passes_dc():
+    out = BiquadFilter.lowpass(1000.0, 10.0).process(np.full(100, 3.0))
+    assert np.allclose(out, 3.0)
+
+
+def test_filter_stage_only_touches_configured_channels():
+    stage = FilterStage.from_config({'torque': [{'type': 'moving_average', 'window': 2}]}, 20.0)
+
+    stage.process_frame({'angle': 1, 'torque': 10.0})
+    frame = stage.process_frame({'angle': 2, 'torque': 20.0})
+
+    assert frame == {'angle': 2, 'torque': 15.0}
+
+
+def test_filter_stage_skips_nan_the_same_in_batches_and_frames():
+    config = {'torque': [{'type': 'moving_average', 'window': 2}, {'type': 'ewma', 'alpha': 0.5}]}
+    torque = [10.0, float("nan"), 20.0, 30.0, float("nan"), float("nan"), 40.0]
+    frames = FilterStage.from_config(config, 20.0)
+    expected = [frames.process_frame({'torque': value})['torque'] for value in torque]
+
+    batched = FilterStage.from_config(config, 20.0)
+    out = np.concatenate([batched.process_batch({'torque': np.array(torque[:2])})['torque'],
+                          batched.process_batch({'torque': np.array(torque[2:])})['torque']])
+
+    assert np.array_equal(out, expected, equal_nan=True) and np.isfinite(out[-1])
+
+
+def test_filter_stage_keeps_sample_frames_compact():
+    stage = FilterStage.from_config({'torque': [{'type': 'moving_average', 'window': 2}]}, 20.0)
+    first = Sample("A", 0.0, 1.0, 10.0, 200.0)
+
+    stage.process_frame(first)
+    frame = stage.process_frame(Sample("A", 0.1, 2.0, 20.0, 201.0))
+
+    assert isinstance(frame, Sample)
+    assert frame['torque'] == 15.0 and frame.get('rig_id') == "A"
+    assert first.torque == 10.0  # input frames are not modified
+    log = RecordLog(SAMPLE_DTYPE, initial_capacity=1)
+    log.append(first.as_record())
+    log.append(frame.as_record())
+    assert list(log.view()['torque']) == [10.0, 15.0]
+
+
+def test_sliding_spectrum_finds_tone_independent_of_chunking():
+    t = np.arange(4096) / 1000.0
+    signal = 40.0 + np.sin(2 * np.pi * 125.0 * t)
+
+    whole = SlidingSpectrum(nfft=256, hop=64, sample_rate=1000.0)
+    whole.push(signal)
+    chunked = SlidingSpectrum(nfft=256, hop=64, sample_rate=1000.0)
+    for piece in np.array_split(signal, 37):
+        chunked.push(piece)
+
+    assert whole.peak_frequency() == pytest.approx(125.0, abs=1000.0 / 256)
+    assert whole.frames_computed == chunked.frames_computed
+    assert np.allclose(whole.psd, chunked.psd)
+    # Frames averaged at the old rate are dropped when the rate changes
+    whole.set_sample_rate(2000.0)
+    assert whole.peak_frequency() is None and not whole.psd.any()
+    whole.push(signal[:64])
+    assert whole.peak_frequency() == pytest.approx(250.0, abs=2000.0 / 256)
+
+
+def test_published_snapshot_is_immutable_across_appends_and_compaction():
+    buffer = SnapshotBuffer(('angle', 'torque'), capacity=4)
+    for i in range(3):
+        buffer.append((i, 10 * i))
+    first = buffer.publish()
+    expected = first.columns['torque'].copy()
+
+    # Enough appends to force several compactions
+    for i in range(3, 20):
+        buffer.append((i, 10 * i))
+    latest = buffer.publish(window=3)
+
+    assert np.array_equal(first.columns['torque'], expected)
+    assert latest.version == first.version + 1
+    assert list(latest.columns['angle']) == [17, 18, 19]
+    assert buffer.snapshot() is latest
+
+
+def test_cycle_detector_summaries_are_independent_of_chunking():
+    # 4.5 turns starting mid-revolution at 1 degree per sample
+    angles = np.arange(180, 180 + 360 * 5) % 360.0
+    t = np.arange(angles.size) * 0.001
+    torque = 50 + 30 * np.sin(np.radians(angles))
+    preload = 200 + 0.5 * angles
+
+    whole = CycleDetector()
+    whole.process(t, angles, torque, preload)
+    chunked = CycleDetector()
+    for piece in np.array_split(np.arange(angles.size), 23):
+        chunked.process(t[piece], angles[piece], torque[piece], preload[piece])
+
+    fed = CycleDetector()
+    for index in range(angles.size):
+        fed.feed({'timestamp': t[index], 'angle': angles[index], 'torque': torque[index],
+                  'preload': preload[index]})
+    fed.flush()
+
+    rows = whole.table.view()
+    assert np.allclose(fed.table.view()['work'], rows['work'])
+    # The partial first turn and the unfinished last one are not reported
+    assert list(rows['cycle']) == [1, 2, 3, 4]
+    assert np.array_equal(rows, chunked.table.view())
+    assert np.all(rows['samples'] == 360)
+    assert np.allclose(rows['angle_at_peak'], 90.0)
+    assert np.allclose(rows['peak_torque'], 80.0)
+    # ∫ (50 + 30 sin θ) dθ over a whole turn, the interval across each wrap included
+    assert rows['work'] == pytest.approx(2 * np.pi * 50, rel=1e-9)
+
+    # A NaN torque sample drops out of the statistics instead of poisoning them
+    torque[1000] = np.nan
+    gappy = CycleDetector()
+    gappy.process(t, angles, torque, preload)
+    assert np.all(np.isfinite(gappy.table.view()[['work', 'mean_torque', 'peak_torque']].tolist()))
+    # A revolution longer than max_pending is dropped, the next ones are kept
+    capped = CycleDetector(max_pending=400)
+    capped.process(t[:900], np.full(900, 10.0), torque[:900], preload[:900])
+    capped.process(t, angles, torque, preload)
+    assert capped.cycles_dropped == 1 and capped.pending.shape[1] < 400
+    assert list(capped.table.view()['cycle']) == [1, 2, 3, 4]
+
+
+@pytest.mark.parametrize("method", ["boxcar", "polyphase", "minmax", "pick"])
+def test_decimation_is_independent_of_chunking(method):
+    rng = np.random.default_rng(3)
+    columns = {'timestamp': np.arange(1000) * 0.001, 'torque': rng.normal(50, 5, 1000)}
+
+    whole = DecimationStage(8, method).process_batch(columns)
+    stage = DecimationStage(8, method)
+    pieces = [stage.process_batch({k: v[piece] for k, v in columns.items()})
+              for piece in np.array_split(np.arange(1000), 29)]
+
+    for name in columns:
+        assert np.array_equal(whole[name], np.concatenate([p[name] for p in pieces]))
+    assert whole['torque'].size >= (1000 // 8 - 6) * (2 if method == "minmax" else 1)
+
+
+def test_decimation_modes_keep_peaks_and_reject_aliases():
+    t = np.arange(4000) * 0.001
+    torque = 50 + np.sin(2 * np.pi * 450.0 * t)  # above the decimated Nyquist
+    torque[2001] = 90.0
+    columns = {'timestamp': t, 'torque': torque}
+
+    minmax = DecimationStage(10, "minmax").process_batch(columns)
+    polyphase = DecimationStage(10, "polyphase").process_batch(columns)
+    steady = polyphase['torque'][10:-10]
+
+    assert minmax['torque'].max() == 90.0
+    assert minmax['timestamp'].size == minmax['torque'].size
+    # The spike is smeared, the 450 Hz tone is filtered out instead of aliased
+    assert np.abs(steady[np.abs(polyphase['timestamp'][10:-10] - 2.0) > 0.05] - 50).max() < 0.05
+
+
+def test_log_codec_round_trips_each_channel_encoding(tmp_path):
+    rng = np.random.default_rng(5)
+    columns = {
+        'timestamp': np.round(100.0 + np.arange(3000) * 0.001 + rng.normal(0, 1e-5, 3000), 6),
+        'torque': rng.normal(50, 5, 3000),
+        'preload': rng.normal(200, 1, 3000),
+    }
+    codecs = {
+        'timestamp': ChannelCodec("fixed", 1e-6, order=2),
+        'torque': ChannelCodec("float32"),
+        'preload': ChannelCodec("fixed", 0.01),
+    }
+
+    path = tmp_path / "run.svlog"
+    with DataLogger(path, columns, codecs, chunk_size=1024, compressor="lzma") as logger:
+        logger.log_batch({name: values[:1500] for name, values in columns.items()})
+        for index in range(1500, 3000):
+            logger.log_frame({name: values[index] for name, values in columns.items()})
+    restored = read_log(path)
+
+    assert np.allclose(restored['timestamp'], columns['timestamp'], rtol=0, atol=1e-9)
+    assert np.array_equal(restored['torque'], columns['torque'].astype(np.float32))
+    assert np.abs(restored['preload'] - columns['preload']).max() <= 0.005 + 1e-9
+    lossless = decode_chunk(encode_chunk({'torque': columns['torque']}, {}))
+    assert np.array_equal(lossless['torque'], columns['torque'])
+
+
+def test_channel_schema_drives_packing_stats_and_logging(tmp_path):
+    assert ChannelSchema.load("config/channels.json") == DEFAULT_SCHEMA
+    assert DEFAULT_SCHEMA.record_dtype() == SAMPLE_DTYPE
+    schema = ChannelSchema.from_config([
+        {'name': 'angle', 'unit': 'degrees'},
+        {'name': 'torque', 'unit': 'Nm', 'dtype': 'f8'},
+        {'name': 'strain', 'unit': 'ue'},
+    ])
+    frames = [{'timestamp': i * 0.001, 'angle': float(i), 'torque': 10.0 * i,
+               'strain': float("nan") if i % 2 else float(-i)} for i in range(6)]
+
+    records = schema.pack(frames)
+    stats = ChannelStats(schema)
+    stats.update(records[:4])
+    stats.update(records[4:])
+    path = tmp_path / "wide.svlog"
+    with DataLogger(path, schema=schema) as logger:
+        for frame in frames:
+            logger.log_frame(frame)
+        logger.log_frame({'timestamp': 0.006, 'angle': 6.0, 'torque': 60.0})
+    restored = read_log(path)
+
+    assert schema_codecs(schema)['strain'].kind == "float64"
+    assert schema_codecs(schema, float32=True)['strain'].kind == "float32"
+    assert np.isnan(restored['strain'][-1]) and restored['torque'][-1] == 60.0
+    assert records.dtype['torque'] == np.float64 and records.dtype['strain'] == np.float32
+    assert schema.valid_masks(records).tolist() == [7, 3, 7, 3, 7, 3]
+    assert schema.valid_masks({'angle': [1.0, np.nan], 'strain': [2.0, 3.0]}).tolist() == [5, 4]
+    # Frames lacking channels pack them as NaN, wherever they appear in the batch
+    mixed = schema.pack([frames[0], {'timestamp': 1.0, 'angle': 2.0}, frames[2]])
+    assert np.array_equal(mixed[[0, 2]], records[[0, 2]])
+    assert mixed[1]['timestamp'] == 1.0 and np.isnan(mixed[1]['torque'])
+    summary = stats.summary()
+    assert summary['strain'] == {'count': 3, 'min': -4.0, 'max': 0.0, 'mean': -2.0}
+    assert summary['torque']['max'] == 50.0
+    assert list(restored) == ['timestamp', 'angle', 'torque', 'strain']
+    assert np.array_equal(restored['torque'][:-1], records['torque'])
+    assert np.array_equal(np.isnan(restored['strain'][:-1]), np.isnan(records['strain']))
+
+
+def test_calibration_lookup_table_matches_curve_and_tares_on_a_window():
+    coefficients = (3e-19, 1.2e-5, -0.35)
+    stage = CalibrationStage.from_config({
+        'torque': {'type': 'polynomial', 'coefficients': coefficients,
+                   'raw_range': [-8388608, 8388607]},
+        'preload': {'type': 'piecewise', 'points': [[1000, 10.0], [0, 0.0], [3000, 20.0]]},
+    })
+    raw = np.random.default_rng(2).uniform(-8e6, 8e6, 5000)
+    raw[7] = np.nan
+
+    torque = stage.process_batch({'torque': raw})['torque']
+    preload = stage.process_batch({'preload': np.array([-5.0, 500.0, 2000.0, 9000.0])})['preload']
+    frames = [Sample(None, 0.0, 0.0, value, 1500.0) for value in (4e6, 4e6 + 10, 4e6 - 10, 1e9)]
+    stage.capture_tare(samples=3)
+    # Every rig gets a copy of the stage and is tared on its own frames
+    rigs = DataSource(queue.Queue(), mode="hardware", num_rigs=2, calibration=stage).sensor_manager
+    rig_stage = rigs.get_rig(1).calibration
+    assert rig_stage is not stage and rig_stage is not rigs.get_rig(0).calibration
+    rig_stage.process_batch({'torque': np.full(3, 4e6), 'preload': np.full(3, 1000.0)})
+    tared = [stage.process_frame(frame) for frame in frames]
+
+    exact = np.polyval(coefficients, raw)
+    assert np.isnan(torque[7]) and np.abs(torque - exact)[np.isfinite(raw)].max() < 1e-6
+    assert preload.tolist() == [0.0, 5.0, 15.0, 20.0]
+    assert not stage.tare_pending and stage.tare_offsets['preload'] == 12.5
+    assert rig_stage.tare_offsets['preload'] == 10.0 and rigs.get_rig(0).calibration.tare_pending
+    assert stage.tare_offsets['torque'] == pytest.approx(np.polyval(coefficients, 4e6))
+    assert tared[2]['torque'] == pytest.approx(-1.2e-4) and tared[2]['preload'] == 0.0
+    # Beyond the ADC range the reading saturates
+    assert tared[3]['torque'] == pytest.approx(
+        np.polyval(coefficients, 8388607) - stage.tare_offsets['torque'])
+
+
+def test_trigger_captures_are_independent_of_batching_and_bounded(tmp_path):
+    t = np.arange(3000) / 1000.0
+    columns = {'timestamp': t, 'angle': np.zeros_like(t),
+               'torque': 50 + 40 * np.sin(2 * np.pi * 2 * t), 'preload': np.full_like(t, 200.0)}
+    columns['preload'][2500] = 400.0
+
+    runs = []
+    for sizes in ([3000], [7, 500, 1, 64] * 200):
+        engine = TriggerEngine([EdgeTrigger('torque', 80.0), parse_trigger("preload:window:100:300")],
+                               pre_ms=50, post_ms=50, sample_rate=1000.0,
+                               store=CaptureStore(max_captures=4))
+        start = 0
+        for size in sizes:
+            engine.process_batch({name: values[start:start + size] for name, values in columns.items()})
+            start += size
+        runs.append(engine.store.list())
+
+    assert [(c.number, c.trigger) for c in runs[0]] == [
+        (4, "torque rising 80"), (5, "torque rising 80"),
+        (6, "preload leaves [100, 300]"), (7, "torque rising 80")]
+    for first, second in zip(*runs):
+        assert first.time == second.time
+        assert all(np.array_equal(first.columns[n], second.columns[n]) for n in first.columns)
+    window = runs[0][2].columns['timestamp']
+    assert window[0] == pytest.approx(2.45) and window[-1] == pytest.approx(2.55)
+    assert runs[0][2].columns['preload'].max() == 400.0
+    assert all(capture.complete for capture in runs[0])
+
+    # A ring sized for 100 Hz cannot hold 50 ms of 1 kHz frames back
+    undersized = TriggerEngine([EdgeTrigger('torque', 80.0)], pre_ms=50, post_ms=0,
+                               sample_rate=100.0, batch_size=1)
+    undersized.process_batch(columns)
+    assert undersized.store.list() and not any(c.complete for c in undersized.store.list())
+    assert TriggerEngine([], pre_ms=1000, post_ms=1000).ring.capacity >= 200
+
+    CaptureStore.export_csv(runs[0][2], tmp_path / "capture.csv")
+    exported = np.loadtxt(tmp_path / "capture.csv", delimiter=",", skiprows=1)
+    assert exported.shape == (101, 5) and exported[50, 0] == pytest.approx(0.0)
+
+
+def test_derived_channels_are_lazy_cached_and_independent_of_chunking():
+    t = np.arange(2000) / 1000.0
+    columns = {'timestamp': t, 'angle': np.mod(90.0 * t ** 2, 360.0),
+               'torque': 10 + 5 * np.sin(2 * np.pi * t), 'preload': np.full_like(t, 200.0)}
+    columns['angle'][500] = np.nan
+
+    # Another engine on the same standard definitions, fed other data in between
+    other = DerivedEngine()
+    other.subscribe('angular_acceleration')
+    results = []
+    for sizes in ([2000], [1, 7, 300, 64] * 5 + [140]):
+        engine = DerivedEngine()
+        engine.subscribe('power')
+        engine.subscribe('angular_acceleration')
+        start = 0
+        power, acceleration = [], []
+        for size in sizes:
+            batch = engine.process({name: values[start:start + size] for name, values in columns.items()})
+            other.process({name: values[::-1][start:start + size] for name, values in columns.items()})
+            start += size
+            power.append(batch['power'])
+            acceleration.append(batch['angular_acceleration'])
+            # A second consumer gets the cached column
+            assert batch['power'] is power[-1]
+            with pytest.raises(KeyError):
+                batch['torque_preload_ratio']
+        results.append((np.concatenate(power), np.concatenate(acceleration)))
+        # Velocity, acceleration and power are evaluated once per batch
+        assert engine.evaluations == 3 * len(sizes)
+
+    assert np.array_equal(results[0][0], results[1][0], equal_nan=True)
+    assert np.allclose(results[0][1], results[1][1], equal_nan=True)
+    # Angular velocity is 2 * 90 * t degrees/s, unwrapped across the 360 degree wraps
+    omega = results[0][0] / columns['torque']
+    expected = np.radians(90.0 * (t[1:] + t[:-1]))
+    assert np.isnan(omega[0]) and np.isnan(omega[500])
+    assert np.allclose(np.delete(omega[1:], [499, 500]), np.delete(expected, [499, 500]))
+    assert omega[501] == pytest.approx(np.radians(90.0 * (t[501] + t[499])))
+    assert np.nanmedian(results[0][1]) == pytest.approx(np.pi, rel=1e-3)
+
+
+def test_batch_reports_render_in_parallel_and_rerender_only_changed_sessions(tmp_path):
+    t = np.arange(4000) * 0.001
+    angle = (t * 720.0) % 360.0
+    (tmp_path / "rigB").mkdir()
+    # rigB/run0 shares its name with run0 but must get reports of its own
+    for index, path in enumerate(("run0.svlog", "run1.svlog", "rigB/run0.svlog")):
+        with DataLogger(tmp_path / path) as logger:
+            logger.log_batch({'timestamp': t, 'angle': angle,
+                              'torque': 50 + 30 * np.sin(np.radians(angle)) + index,
+                              'preload': 200 + 0.1 * angle})
+    (tmp_path / "empty.svlog").write_bytes(b"")
+    out = tmp_path / "reports"
+    sessions = [str(tmp_path), str(tmp_path / "rigB")]
+
+    first = generate_reports(sessions, str(out), workers=2)
+    os.utime(tmp_path / "run1.svlog", ns=(1, 1))
+    second = generate_reports(sessions, str(out), workers=2)
+
+    run0, run1, other = (str(tmp_path / path)
+                         for path in ("run0.svlog", "run1.svlog", "rigB/run0.svlog"))
+    prefix = output_prefix(run0)
+    assert prefix.startswith("run0-") and prefix != output_prefix(other)
+    assert first[run0]['outputs'] == [f"{prefix}_torque_preload.png", f"{prefix}_polar.png",
+                                      f"{prefix}_cycles.png"]
+    assert first[run1]['peak_torque'] == pytest.approx(81.0, abs=0.01)
+    assert second[other]['cached'] and second[other]['peak_torque'] == pytest.approx(82.0, abs=0.01)
+    assert 'error' in first[str(tmp_path / "empty.svlog")]
+    assert second[run0]['cached'] and not second[run1]['cached']
+    assert (out / f"{output_prefix(run1)}_polar.png").read_bytes().startswith(b"\x89PNG")
+
+
+def test_session_analysis_is_memoized_by_content_and_evicts_least_recently_used(tmp_path):
+    t = np.arange(5000) * 0.001
+    angle = (t * 720.0) % 360.0
+    sessions = tmp_path / "sessions"
+    sessions.mkdir()
+    for index in range(3):
+        with DataLogger(sessions / f"run{index}.svlog", chunk_size=1024) as logger:
+            logger.log_batch({'timestamp': t, 'angle': angle,
+                              'torque': 50 + 30 * np.sin(np.radians(angle)) + 5 * index,
+                              'preload': 200 + 0.1 * angle})
+    cache = tmp_path / "cache"
+
+    first = analyze_sessions([str(sessions)], torque_limit=80.0, cache_dir=str(cache), workers=2)
+    columns = cache / f"columns-{content_hash(sessions / 'run0.svlog')}.npy"
+    chunked = compute_metrics(np.load(columns, mmap_mode='r'),
+                              torque_limit=80.0, chunk_rows=333)
+    # The log is decoded chunk by chunk straight into the cached columns
+    assert np.array_equal(np.load(columns)[2], read_log(sessions / "run0.svlog")['torque'])
+    # Touching a file does not change its content hash; new limits reuse the decoded columns
+    os.utime(sessions / "run1.svlog", ns=(1, 1))
+    second = analyze_sessions([str(sessions)], torque_limit=80.0, cache_dir=str(cache), workers=2)
+    third = analyze_sessions([str(sessions)], torque_limit=90.0, cache_dir=str(cache),
+                             max_cache_bytes=1, workers=1)
+
+    table = first.sessions
+    assert not first.errors and not table['cached'].any() and second.sessions['cached'].all()
+    assert table['cycles'].tolist() == [8, 8, 8] and len(first.cycles) == 24
+    assert table['peak_torque'] == pytest.approx([80.0, 85.0, 90.0], abs=0.01)
+    # ∫ (50 + 30 sin θ) dθ over a turn is 100π
+    assert first.cycles['work'][first.cycles['session'] == 0] == pytest.approx(100 * np.pi, rel=1e-4)
+    assert table['torque_exceed_samples'][0] == 0 and table['torque_exceed_events'].tolist()[1:] == [10, 10]
+    assert np.array_equal(first.cycles['torque_exceed'][first.cycles['session'] == 2],
+                          np.full(8, first.sessions['torque_exceed_samples'][2] // 10))
+    assert all(chunked[0][name] == pytest.approx(table[name][0]) for name in METRICS_DTYPE.names)
+    assert np.array_equal(chunked[1]['work'], first.cycles['work'][:8])
+    assert third.sessions['torque_exceed_samples'][2] < table['torque_exceed_samples'][2]
+    assert not any(cache.iterdir())
+
+
+def test_spc_flags_revolutions_abnormal_for_their_angle_independent_of_batching(tmp_path):
+    class RecordingAlerts:
+        def __init__(self):
+            self.raised = []
+
+        def alert(self, alert_type, message, sound=True, popup=True):
+            self.raised.append(alert_type)
+
+        def dismiss_alert(self, alert_type):
+            self.raised.append("dismissed")
+
+    t = np.arange(15000) * 0.001
+    angle = (t * 720.0 + 10.0) % 360.0
+    torque = 50 + 30 * np.sin(np.radians(angle)) + np.random.default_rng(4).normal(0, 0.5, t.size)
+    # Revolution 25 has a bump at 180-200 degrees that a fixed 80 Nm limit would never see
+    bump = (np.floor((t * 720.0 + 10.0) / 360.0) == 25) & (angle >= 180) & (angle < 200)
+    torque[bump] += 5.0
+    columns = {'timestamp': t, 'angle': angle, 'torque': torque}
+
+    runs = []
+    for sizes in ([15000], [1, 64, 999, 7] * 14 + [856]):
+        monitor = SPCMonitor(baseline_revolutions=20, sigma=5.0, min_violations=3,
+                             alert_manager=RecordingAlerts())
+        start = 0
+        cycles = []
+        for size in sizes:
+            cycles += monitor.process_batch({name: values[start:start + size]
+                                             for name, values in columns.items()})[1]
+            start += size
+        runs.append((monitor, cycles))
+
+    (monitor, cycles), (chunked, chunked_cycles) = runs
+    assert [c[:5] for c in cycles] == [c[:5] for c in chunked_cycles]
+    assert [c.max_score for c in cycles] == pytest.approx([c.max_score for c in chunked_cycles])
+    assert np.array_equal(monitor.model.count, chunked.model.count)
+    assert np.allclose(monitor.model.mean, chunked.model.mean)
+    assert np.allclose(monitor.model.variance, chunked.model.variance)
+    # 20 baseline revolutions of 500 samples each
+    assert monitor.model.count.sum() == 10000 and not monitor.learning
+    reference = 50 + 30 * np.sin(np.radians(np.arange(360) + 0.5))
+    assert np.abs(monitor.model.mean - reference).max() < 0.5
+    assert np.nanmedian(monitor.model.std) == pytest.approx(0.5, rel=0.1)
+
+    assert [c.revolution for c in cycles] == list(range(21, 30))
+    flagged = [c.revolution for c in cycles if c.violations >= 3]
+    assert flagged == [25] and cycles[4].max_score > 8.0
+    assert monitor.alert_manager.raised == ["dismissed"] * 4 + ["spc_torque"] + ["dismissed"] * 4
+
+    monitor.model.save(tmp_path / "baseline")
+    loaded = AngleBinModel.load(tmp_path / "baseline")
+    assert np.array_equal(loaded.m2, monitor.model.m2)
+    lower, upper = loaded.limits(sigma=3.0)
+    assert (upper - lower)[np.isfinite(upper)] == pytest.approx(6 * loaded.std[np.isfinite(upper)])
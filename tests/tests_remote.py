@@ -0,0 +1,89 @@
+# tests/tests_remote.py
+import queue
+import time
+
+import numpy as np
+
+from src.remote.client import FrameClient
+from src.remote.protocol import (
+    MSG_FRAMES, MessageReader, decode_frames, encode_frames, frames_from_records,
+    records_from_frames,
+)
+from src.remote.server import FrameServer
+from src.sensors.channels import Channel, ChannelSchema
+from src.sensors.sample import Sample
+
+
+def _frames(count, rig_id=None):
+    return [Sample(rig_id, i * 0.01, float(i % 360), 50.0 + i, 200.0) for i in range(count)]
+
+
+def test_frame_messages_round_trip_in_pieces():
+    message = encode_frames(records_from_frames(_frames(100, rig_id=3)))
+    reader = MessageReader()
+
+    messages = []
+    for start in range(0, len(message), 7):
+        messages += reader.feed(message[start:start + 7])
+
+    assert [kind for kind, _ in messages] == [MSG_FRAMES]
+    frames = frames_from_records(decode_frames(messages[0][1]))
+    assert frames == _frames(100, rig_id=3)
+
+
+def test_client_receives_frames_decimated_by_the_daemon():
+    server = FrameServer(("127.0.0.1", 0), send_interval=0.01)
+    server.start()
+    data_queue = queue.Queue()
+    client = FrameClient(data_queue, server.bound_address, decimation=4, method="boxcar",
+                         reconnect_interval=0.1)
+    client.start()
+    try:
+        deadline = time.monotonic() + 5.0
+        while not any(c.subscribed for c in server.clients.values()):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        for frame in _frames(40):
+            server.publish(frame)
+        while data_queue.qsize() < 10:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        client.stop()
+        server.stop()
+
+    received = [data_queue.get_nowait() for _ in range(10)]
+    assert data_queue.empty()
+    assert np.allclose([f['torque'] for f in received], 50.0 + 1.5 + 4 * np.arange(10))
+
+
+def test_client_adopts_the_daemon_schema():
+    schema = ChannelSchema([Channel('angle', 'degrees')]
+                           + [Channel(f"strain_{i}", 'ue') for i in range(31)])
+    server = FrameServer(("127.0.0.1", 0), send_interval=0.01, schema=schema)
+    server.start()
+    data_queue = queue.Queue()
+    client = FrameClient(data_queue, server.bound_address, reconnect_interval=0.1)
+    client.start()
+    try:
+        deadline = time.monotonic() + 5.0
+        while not any(c.subscribed for c in server.clients.values()):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        for i in range(5):
+            frame = {name: float(i + index) for index, name in enumerate(schema.names)}
+            frame.update(rig_id=None, timestamp=i * 0.001)
+            frame['strain_7'] = float("nan")
+            server.publish(frame)
+        while data_queue.qsize() < 5:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        client.stop()
+        server.stop()
+
+    received = [data_queue.get_nowait() for _ in range(5)]
+    assert client.schema == schema
+    assert [f['strain_30'] for f in received] == [31.0 + i for i in range(5)]
+    assert all(np.isnan(f['strain_7']) for f in received)
+    assert received[0]['valid'] == schema.all_valid & ~schema.flag('strain_7')
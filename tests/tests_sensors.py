@@ -0,0 +1,283 @@
+# tests/tests_sensors.py
+import os
+import queue
+import time
+
+import numpy as np
+import pytest
+
+from src.sensors.sensor_manager import SensorManager
+from src.sensors.rig_registry import RigRegistry
+from src.sensors.timing import ClockOffsetEstimator
+from src.sensors.serial_protocol import (
+    CHANNEL_ENCODER, CHANNEL_STRAIN_GAUGE, FrameParser, encode_frame,
+)
+from src.sensors.device_emulator import DeviceEmulator
+from src.sensors.encoder import EncoderSensor
+from src.sensors.load_cell import LoadCellSensor
+from src.sensors.strain_gauge import StrainGaugeSensor
+from src.sensors.async_engine import AsyncSensorManager
+from src.sensors.replay import ReplayDriver, SensorRecording, VirtualClock
+from src.sensors.sample import VALID_PRELOAD, VALID_TORQUE, Reading
+from src.data.decimation import DecimationStage
+
+
+def _prime(manager, timestamp):
+    """Give every sensor of a manager a reading at the same timestamp"""
+    for value, sensor in enumerate(manager.sensors):
+        sensor.latest = Reading(float(value), timestamp)
+
+
+def test_synchronized_frame_is_tagged_with_rig_id():
+    manager = SensorManager(queue.Queue(), rig_id="A")
+    _prime(manager, time.time())
+
+    frame = manager._get_synchronized_data()
+
+    assert frame['rig_id'] == "A"
+    assert (frame['angle'], frame['torque'], frame['preload']) == (0.0, 1.0, 2.0)
+
+
+def test_poll_publishes_and_counts_frames():
+    data_queue = queue.Queue()
+    manager = SensorManager(data_queue)
+    _prime(manager, time.time())
+
+    assert manager.poll() is True
+    assert manager.frames_published == 1
+    assert data_queue.get_nowait()['rig_id'] is None
+
+
+def test_decimated_manager_queues_display_stream_and_records_full_rate():
+    data_queue = queue.Queue()
+    manager = SensorManager(data_queue, rig_id="A", decimation=DecimationStage(4, "boxcar"),
+                            clock=VirtualClock())
+    recorded = []
+    manager.add_frame_listener(recorded.append)
+
+    for index in range(10):
+        _prime(manager, float(index))
+        manager.last_sync_time = float("-inf")
+        manager.poll()
+
+    assert len(recorded) == 10
+    assert manager.frames_published == data_queue.qsize() == 2
+    frame = data_queue.get_nowait()
+    assert frame['rig_id'] == "A" and frame['timestamp'] == 1.5
+
+
+def test_stale_sensor_is_left_out_of_partial_frames():
+    clock = VirtualClock(10.0)
+    manager = SensorManager(queue.Queue(), clock=clock)
+    manager.encoder.latest = Reading(90.0, 8.0)
+    manager.strain_gauge.latest = Reading(55.0, 9.95)
+    manager.load_cell.latest = Reading(210.0, 9.97)
+
+    frame = manager._get_synchronized_data()
+
+    assert np.isnan(frame['angle']) and (frame['torque'], frame['preload']) == (55.0, 210.0)
+    assert frame['valid'] == VALID_TORQUE | VALID_PRELOAD and not frame.complete
+    assert frame['timestamp'] == pytest.approx(9.96)
+    assert manager.excluded == {"Encoder"}
+
+
+def test_async_manager_publishes_the_same_partial_frames():
+    clock = VirtualClock(10.0)
+    manager = AsyncSensorManager(queue.Queue(), clock=clock)
+    for key, reading in zip(('angle', 'torque', 'preload'),
+                            (Reading(90.0, 8.0), Reading(55.0, 9.95), Reading(210.0, 9.97))):
+        manager.channels[key].latest = reading
+    serial = AsyncSensorManager(queue.Queue(), default_sensors=False)
+    serial.add_sensor('angle', EncoderSensor(port="/dev/ttyUSB7", baudrate=57600))
+
+    frame = manager._get_synchronized_data()
+
+    assert np.isnan(frame['angle']) and (frame['torque'], frame['preload']) == (55.0, 210.0)
+    assert frame['valid'] == VALID_TORQUE | VALID_PRELOAD and not frame.complete
+    assert manager.excluded == {"Encoder"}
+    assert manager.get_health()["Encoder"]['readings'] == 0
+    assert serial.serial_devices["/dev/ttyUSB7"].baudrate == 57600
+
+
+def test_failing_sensor_reconnects_with_backoff():
+    class FlakySensor(EncoderSensor):
+        failures = 4
+        reconnects = 0
+
+        def _read_sensor(self):
+            if self.failures:
+                self.failures -= 1
+                raise OSError("device unplugged")
+            return super()._read_sensor()
+
+        def _reconnect(self):
+            self.reconnects += 1
+            if self.reconnects < 2:
+                raise OSError("still unplugged")
+
+    sensor = FlakySensor(update_rate=0.005)
+    sensor.max_errors = 1
+    sensor.error_delay = 0.005
+    sensor.reconnect_delay = 0.01
+    sensor.start()
+    try:
+        deadline = time.monotonic() + 5.0
+        while sensor.health.readings < 3 and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        sensor.stop()
+
+    assert sensor.health.readings >= 3
+    assert sensor.reconnects >= 2 and sensor.health.reconnects >= 1
+    assert sensor.health.errors == 4 and sensor.health.max_burst == 4
+
+
+def test_rig_registry_rejects_duplicate_rig():
+    registry = RigRegistry(queue.Queue())
+    registry.add_rig(0)
+
+    with pytest.raises(ValueError):
+        registry.add_rig(0)
+    assert registry.rig_ids == [0]
+
+
+def test_clock_offset_estimator_recovers_offset_and_drift():
+    estimator = ClockOffsetEstimator(window=200)
+    rng = np.random.default_rng(1)
+    device_times = 5000.0 + np.arange(200) * 1.0
+    # Device clock runs 50 ppm fast; arrivals lag by 0-3 ms of transport latency
+    true_times = 2.0 + (device_times - 5000.0) / (1 + 50e-6)
+    for device_time, true_time, latency in zip(device_times, true_times, rng.uniform(0, 0.003, 200)):
+        estimator.add(device_time, true_time + latency)
+
+    assert estimator.ready
+    assert estimator.drift_ppm == pytest.approx(50.0, abs=5.0)
+    assert estimator.to_session(device_times[-1]) == pytest.approx(true_times[-1], abs=0.0005)
+
+
+def test_frame_parser_resyncs_after_garbage_and_bad_crc():
+    good_a = encode_frame(CHANNEL_STRAIN_GAUGE, [1, 2], [10.0, 20.0])
+    bad = bytearray(encode_frame(CHANNEL_STRAIN_GAUGE, [3], [30.0]))
+    bad[-4] ^= 0xFF
+    good_b = encode_frame(CHANNEL_ENCODER, [4, 5, 6], [1.0, 2.0, 3.0])
+    stream = b"\x00\xa5junk" + good_a + bytes(bad) + b"\xa5" + good_b
+
+    parser = FrameParser(capacity=256)
+    frames = []
+    # Feed in awkward pieces so frames straddle reads
+    for start in range(0, len(stream), 7):
+        parser.feed(stream[start:start + 7])
+        frames.extend(parser.parse())
+
+    assert [f[0] for f in frames] == [CHANNEL_STRAIN_GAUGE, CHANNEL_ENCODER]
+    assert list(frames[0][2]) == [10.0, 20.0]
+    assert list(frames[1][1]) == pytest.approx([4e-6, 5e-6, 6e-6])
+    assert parser.crc_errors == 1
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="needs a pty")
+def test_encoder_reads_from_pty_emulator():
+    emulator = DeviceEmulator(channels={CHANNEL_ENCODER: lambda angles: angles})
+    emulator.start()
+    encoder = EncoderSensor(port=emulator.port)
+    try:
+        deadline = time.time() + 2.0
+        value = None
+        while value is None and time.time() < deadline:
+            value, device_time = encoder._read_sample()
+    finally:
+        encoder.link.close()
+        emulator.close()
+
+    assert value is not None
+    assert 0.0 <= value < 360.0
+    assert device_time >= 0.0
+
+
+@pytest.mark.skipif(not hasattr(os, "openpty"), reason="needs a pty")
+def test_sensors_on_one_board_share_the_port_without_losing_frames():
+    emulator = DeviceEmulator()
+    sensors = [EncoderSensor(port=emulator.port), StrainGaugeSensor(port=emulator.port),
+               LoadCellSensor(port=emulator.port)]
+    for sensor in sensors:
+        sensor.link.open()
+    emulator.start()
+    try:
+        deadline = time.time() + 0.5
+        while time.time() < deadline:
+            for sensor in sensors:
+                sensor.link.read_batch()
+        emulator.stop()
+        # Drain until a whole round over the sensors brings nothing new
+        while any([sensor.link.read_batch()[1].size for sensor in sensors]):
+            pass
+    finally:
+        for sensor in sensors:
+            sensor.link.close()
+        emulator.close()
+
+    assert sensors[0].link.device is None
+    sent = emulator.frames_sent // 3 * emulator.samples_per_frame
+    assert [sensor.link.samples_received for sensor in sensors] == [sent] * 3
+
+
+class _ConstantReader:
+    def __init__(self, value):
+        self.value = value
+
+    async def read_sample(self):
+        import asyncio
+        await asyncio.sleep(0.005)
+        return self.value, None
+
+    def close(self):
+        pass
+
+
+def test_async_manager_publishes_frames_for_custom_channels():
+    data_queue = queue.Queue()
+    manager = AsyncSensorManager(data_queue, default_sensors=False, sync_interval=0.01)
+    for index in range(12):
+        manager.add_sensor(f"ch{index}", _ConstantReader(float(index)))
+
+    manager.start()
+    try:
+        frame = data_queue.get(timeout=3.0)
+    finally:
+        manager.stop()
+
+    assert [frame[f"ch{index}"] for index in range(12)] == [float(i) for i in range(12)]
+    assert manager.thread is None
+
+
+def test_replay_is_bit_for_bit_reproducible(tmp_path):
+    rng = np.random.default_rng(3)
+    timestamps = [np.sort(rng.uniform(0, 5, 50)) for _ in range(3)]
+    values = [rng.normal(size=50) for _ in range(3)]
+    SensorRecording(["Encoder", "Strain Gauge", "Load Cell"], timestamps, values).save(
+        tmp_path / "capture.npz")
+    recording = SensorRecording.load(tmp_path / "capture.npz")
+
+    runs = [ReplayDriver(SensorManager(queue.Queue()), recording).run() for _ in range(2)]
+
+    assert runs[0] and runs[0] == runs[1]
+    # Each frame only uses readings taken before its poll
+    assert all(frame['angle'] in values[0] for frame in runs[0])
+
+
+def test_manager_publishes_dict_frames_for_a_custom_schema():
+    clock = VirtualClock(10.0)
+    sensors = {'angle': EncoderSensor(), 'torque': StrainGaugeSensor(),
+               'torque_2': StrainGaugeSensor(), 'preload': LoadCellSensor()}
+    manager = SensorManager(queue.Queue(), clock=clock, sensors=sensors)
+    for index, sensor in enumerate(manager.sensors):
+        sensor.latest = Reading(float(index), 9.95)
+    sensors['torque_2'].latest = Reading(7.0, 8.0)
+
+    frame = manager._get_synchronized_data()
+
+    assert manager.schema.names == ('angle', 'torque', 'torque_2', 'preload')
+    assert isinstance(frame, dict)
+    assert (frame['angle'], frame['torque'], frame['preload']) == (0.0, 1.0, 3.0)
+    assert np.isnan(frame['torque_2'])
+    assert frame['valid'] == manager.schema.all_valid & ~manager.schema.flag('torque_2')